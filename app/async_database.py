@@ -0,0 +1,366 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
+
+from app.config import settings
+from app.database import PoolTimeoutError, SQLiteConnection, mysql_creator
+
+try:
+    import aiomysql
+except ImportError:  # optional; connections fall back to one thread each
+    aiomysql = None
+
+
+# =====================================================
+# CONNECTIONS
+# =====================================================
+# Both kinds expose the same coroutine API, one call per statement:
+# execute / executemany / fetchone / fetchall / commit / rollback / ping / close,
+# plus iterate(), batches off an unbuffered server-side cursor. A stream
+# abandoned half-way leaves unread rows on the wire: the connection is
+# closed and marked broken, and rollback() then fails so the pool drops it.
+
+class AioMySQLConnection:
+    """Native asyncio MySQL connection: the event loop does the socket I/O."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._broken = False
+
+    async def execute(self, query: str, params=()):
+        async with self._conn.cursor() as cursor:
+            await cursor.execute(query, params or None)
+            return cursor.rowcount
+
+    async def executemany(self, query: str, seq_params):
+        async with self._conn.cursor() as cursor:
+            # rewritten into one multi-row INSERT, like mysql-connector does
+            await cursor.executemany(query, seq_params)
+            return cursor.rowcount
+
+    async def fetchone(self, query: str, params=(), dictionary: bool = False):
+        async with self._conn.cursor(aiomysql.DictCursor if dictionary else aiomysql.Cursor) as cursor:
+            await cursor.execute(query, params or None)
+            return await cursor.fetchone()
+
+    async def fetchall(self, query: str, params=(), dictionary: bool = False):
+        async with self._conn.cursor(aiomysql.DictCursor if dictionary else aiomysql.Cursor) as cursor:
+            await cursor.execute(query, params or None)
+            return await cursor.fetchall()
+
+    async def iterate(self, query: str, params=(), batch_size: int = 1000) -> AsyncIterator[List[tuple]]:
+        cursor = await self._conn.cursor(aiomysql.SSCursor)
+        finished = False
+        try:
+            await cursor.execute(query, params or None)
+            while True:
+                rows = await cursor.fetchmany(batch_size)
+                if not rows:
+                    finished = True
+                    return
+                yield rows
+        finally:
+            if finished:
+                await cursor.close()
+            else:
+                # draining the rest of a big result could take minutes
+                self._broken = True
+                self._conn.close()
+
+    async def commit(self):
+        await self._conn.commit()
+
+    async def rollback(self):
+        if self._broken:
+            raise RuntimeError("Connection closed during a stream")
+        await self._conn.rollback()
+
+    async def ping(self):
+        await self._conn.ping(reconnect=False)
+
+    async def close(self):
+        self._conn.close()
+
+
+class ThreadedConnection:
+    """
+    A blocking DB-API connection (mysql-connector, the SQLite stand-in)
+    driven from its own single thread, the way aiosqlite works. Each call
+    is one hop to that thread, so the event loop never blocks, and the
+    connection never moves between threads.
+    """
+
+    def __init__(self, conn, thread: ThreadPoolExecutor):
+        self._conn = conn
+        self._thread = thread
+        self._broken = False
+
+    def _run(self, fn: Callable, *args) -> Awaitable:
+        return asyncio.get_running_loop().run_in_executor(self._thread, fn, *args)
+
+    def _execute(self, query, params, fetch, dictionary=False, many=False):
+        cursor = self._conn.cursor(dictionary=dictionary)
+        try:
+            if many:
+                cursor.executemany(query, params)
+            else:
+                cursor.execute(query, params)
+            if fetch == "one":
+                return cursor.fetchone()
+            if fetch == "all":
+                return cursor.fetchall()
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+    async def execute(self, query: str, params=()):
+        return await self._run(self._execute, query, params, None)
+
+    async def executemany(self, query: str, seq_params):
+        return await self._run(self._execute, query, seq_params, None, False, True)
+
+    async def fetchone(self, query: str, params=(), dictionary: bool = False):
+        return await self._run(self._execute, query, params, "one", dictionary)
+
+    async def fetchall(self, query: str, params=(), dictionary: bool = False):
+        return await self._run(self._execute, query, params, "all", dictionary)
+
+    def _open_cursor(self, query, params):
+        # mysql-connector cursors are unbuffered unless asked otherwise;
+        # sqlite3 steps through the result as it is fetched
+        cursor = self._conn.cursor()
+        cursor.execute(query, params)
+        return cursor
+
+    async def iterate(self, query: str, params=(), batch_size: int = 1000) -> AsyncIterator[List[tuple]]:
+        cursor = await self._run(self._open_cursor, query, params)
+        finished = False
+        try:
+            while True:
+                rows = await self._run(cursor.fetchmany, batch_size)
+                if not rows:
+                    finished = True
+                    return
+                yield rows
+        finally:
+            if finished:
+                await self._run(cursor.close)
+            else:
+                self._broken = True
+                await self._run(self._conn.close)
+
+    async def commit(self):
+        await self._run(self._conn.commit)
+
+    async def rollback(self):
+        if self._broken:
+            raise RuntimeError("Connection closed during a stream")
+        # checked here: a plain read leaves nothing to roll back, skip the hop
+        if self._conn.in_transaction:
+            await self._run(self._conn.rollback)
+
+    async def ping(self):
+        await self._run(self._execute, "SELECT 1", (), "all")
+
+    async def close(self):
+        try:
+            await self._run(self._conn.close)
+        finally:
+            self._thread.shutdown(wait=False)
+
+
+# =====================================================
+# POOL
+# =====================================================
+class AsyncConnectionPool:
+    """
+    asyncio counterpart of database.ConnectionPool, same knobs and stats.
+
+    A semaphore caps open connections at `size + max_overflow`; waiting
+    for one is an await, not a blocked thread. Connections belong to the
+    event loop that opened them (one per process under uvicorn).
+    """
+
+    def __init__(self, creator: Callable[[], Awaitable[Any]], size: int = 10, max_overflow: int = 10,
+                 timeout: float = 30, recycle: float = 3600, pre_ping: bool = True,
+                 dialect: str = "mysql", driver: str = "thread"):
+        self.creator = creator
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.dialect = dialect
+        self.driver = driver
+
+        self._slots = asyncio.Semaphore(size + max_overflow)
+        self._idle: List = []  # LIFO: the warmest connection is reused first
+        self._born: Dict[int, float] = {}
+        self._in_use = 0
+        self._metrics = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    # =====================================================
+    # CHECKOUT / CHECKIN
+    # =====================================================
+    async def acquire(self):
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self._metrics["timeouts"] += 1
+            raise PoolTimeoutError(f"No DB connection available after {self.timeout}s")
+
+        try:
+            conn = await self._validate(self._idle.pop()) if self._idle else await self._create()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        waited = time.perf_counter() - start
+        self._in_use += 1
+        self._metrics["checkouts"] += 1
+        self._metrics["wait_seconds_total"] += waited
+        self._metrics["wait_seconds_max"] = max(self._metrics["wait_seconds_max"], waited)
+        return conn
+
+    async def release(self, conn):
+        self._in_use -= 1
+        try:
+            # never hand a half-finished transaction to the next request
+            await conn.rollback()
+        except Exception:
+            await self._close(conn)
+        else:
+            if len(self._idle) >= self.size:
+                await self._close(conn)
+            else:
+                self._idle.append(conn)
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        conn = await self.acquire()
+        try:
+            yield conn
+        finally:
+            await self.release(conn)
+
+    async def close_all(self):
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await self._close(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        checkouts = self._metrics["checkouts"]
+        return {
+            **self._metrics,
+            "wait_seconds_avg": self._metrics["wait_seconds_total"] / checkouts if checkouts else 0.0,
+            "driver": self.driver,
+            "size": self.size,
+            "max_overflow": self.max_overflow,
+            "open": len(self._born),
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+        }
+
+    # =====================================================
+    # INTERNALS
+    # =====================================================
+    async def _create(self):
+        try:
+            conn = await self.creator()
+        except Exception as e:
+            raise RuntimeError(f"DB Connection Failed: {e}")
+        self._born[id(conn)] = time.monotonic()
+        return conn
+
+    async def _validate(self, conn):
+        born = self._born.get(id(conn), 0.0)
+        if self.recycle and time.monotonic() - born > self.recycle:
+            self._metrics["recycled"] += 1
+            await self._close(conn)
+            return await self._create()
+
+        if self.pre_ping:
+            try:
+                await conn.ping()
+            except Exception:
+                self._metrics["ping_failures"] += 1
+                await self._close(conn)
+                return await self._create()
+
+        return conn
+
+    async def _close(self, conn):
+        self._born.pop(id(conn), None)
+        try:
+            await conn.close()
+        except Exception:
+            pass
+
+
+# =====================================================
+# CONNECTION FACTORIES
+# =====================================================
+async def aiomysql_creator():
+    conn = await aiomysql.connect(
+        host=settings.MYSQL_HOST,
+        port=settings.MYSQL_PORT,
+        user=settings.MYSQL_USER,
+        password=settings.MYSQL_PASSWORD or "",
+        db=settings.MYSQL_DATABASE,
+        autocommit=False,
+    )
+    return AioMySQLConnection(conn)
+
+
+def threaded_creator(blocking_creator: Callable[[], Any]) -> Callable[[], Awaitable[ThreadedConnection]]:
+    async def create():
+        thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-conn")
+        try:
+            conn = await asyncio.get_running_loop().run_in_executor(thread, blocking_creator)
+        except BaseException:
+            thread.shutdown(wait=False)
+            raise
+        return ThreadedConnection(conn, thread)
+    return create
+
+
+def make_async_pool() -> AsyncConnectionPool:
+    if settings.DB_BACKEND == "sqlite":
+        driver, dialect = "thread", "sqlite"
+        creator = threaded_creator(lambda: SQLiteConnection(settings.SQLITE_PATH))
+    else:
+        dialect = "mysql"
+        driver = settings.DB_ASYNC_DRIVER
+        if driver == "auto":
+            driver = "aiomysql" if aiomysql is not None else "thread"
+        if driver == "aiomysql" and aiomysql is None:
+            raise RuntimeError("DB_ASYNC_DRIVER=aiomysql but aiomysql is not installed")
+        creator = aiomysql_creator if driver == "aiomysql" else threaded_creator(mysql_creator)
+
+    return AsyncConnectionPool(
+        creator,
+        size=settings.DB_ASYNC_POOL_SIZE,
+        max_overflow=settings.DB_ASYNC_POOL_MAX_OVERFLOW,
+        timeout=settings.DB_POOL_TIMEOUT,
+        recycle=settings.DB_POOL_RECYCLE,
+        pre_ping=settings.DB_POOL_PRE_PING,
+        dialect=dialect,
+        driver=driver,
+    )
+
+
+# Request handlers await this pool; scripts, the worker and the
+# write-behind thread keep the blocking `database.db` pool.
+async_db = make_async_pool()
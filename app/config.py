@@ -11,6 +11,137 @@ class Settings:
     MYSQL_USER = os.getenv("MYSQL_USER")
     MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD")
     MYSQL_DATABASE = os.getenv("MYSQL_DATABASE")
+    MYSQL_USE_PURE = os.getenv("MYSQL_USE_PURE", "false").lower() == "true"
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
 
+    # ---- Connection pool ----
+    DB_BACKEND = os.getenv("DB_BACKEND", "mysql")  # mysql | sqlite (local stand-in)
+    SQLITE_PATH = os.getenv("SQLITE_PATH", "ocr.sqlite3")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "5"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = float(os.getenv("DB_POOL_RECYCLE", "3600"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # ---- Async DB pool (request handlers) ----
+    DB_ASYNC_DRIVER = os.getenv("DB_ASYNC_DRIVER", "auto")  # auto | aiomysql | thread
+    DB_ASYNC_POOL_SIZE = int(os.getenv("DB_ASYNC_POOL_SIZE", "10"))
+    DB_ASYNC_POOL_MAX_OVERFLOW = int(os.getenv("DB_ASYNC_POOL_MAX_OVERFLOW", "10"))
+
+    # ---- OCR engine ----
+    OCR_BACKEND = os.getenv("OCR_BACKEND", "easyocr")  # easyocr | paddleocr | tesseract
+    OCR_MODE = os.getenv("OCR_MODE", "single")  # single | cascade | template
+
+    # ---- Template mode ----
+    OCR_TEMPLATES_PATH = os.getenv("OCR_TEMPLATES_PATH", "")  # extra JSON file / folder, merged over the built-ins
+    OCR_TEMPLATE_BACKEND = os.getenv("OCR_TEMPLATE_BACKEND", "")  # empty = OCR_BACKEND
+    OCR_TEMPLATE_THUMB_WIDTH = int(os.getenv("OCR_TEMPLATE_THUMB_WIDTH", "480"))  # header read for classification
+
+    # ---- EasyOCR runtime ----
+    OCR_RUNTIME = os.getenv("OCR_RUNTIME", "torch")  # torch | onnx | onnx_int8
+    OCR_ONNX_DIR = os.getenv("OCR_ONNX_DIR", "onnx_models")  # exported models are cached here
+    OCR_ONNX_INTRA_THREADS = int(os.getenv("OCR_ONNX_INTRA_THREADS", "0"))  # 0 = cores / workers
+    OCR_ONNX_INTER_THREADS = int(os.getenv("OCR_ONNX_INTER_THREADS", "1"))
+
+    # ---- Preprocessing ----
+    OCR_PREPROCESS = os.getenv("OCR_PREPROCESS", "true").lower() == "true"  # false = fixed 1200px resize
+    OCR_DECODE_MAX_WIDTH = int(os.getenv("OCR_DECODE_MAX_WIDTH", "2000"))
+    OCR_TARGET_CHAR_HEIGHT = int(os.getenv("OCR_TARGET_CHAR_HEIGHT", "16"))  # px after resize
+    OCR_MIN_WIDTH = int(os.getenv("OCR_MIN_WIDTH", "640"))
+    OCR_MAX_WIDTH = int(os.getenv("OCR_MAX_WIDTH", "2000"))
+    OCR_MAX_SKEW_DEGREES = float(os.getenv("OCR_MAX_SKEW_DEGREES", "15"))
+    OCR_CROP_TO_DOCUMENT = os.getenv("OCR_CROP_TO_DOCUMENT", "true").lower() == "true"
+    OCR_GRAYSCALE = os.getenv("OCR_GRAYSCALE", "true").lower() == "true"
+
+    # ---- Cascade mode ----
+    OCR_CASCADE_FAST_BACKEND = os.getenv("OCR_CASCADE_FAST_BACKEND", "tesseract")
+    OCR_CASCADE_DEEP_BACKEND = os.getenv("OCR_CASCADE_DEEP_BACKEND", "easyocr")
+    OCR_CASCADE_MIN_CONFIDENCE = float(os.getenv("OCR_CASCADE_MIN_CONFIDENCE", "0.75"))
+    OCR_CASCADE_ESCALATE_GENERIC = os.getenv("OCR_CASCADE_ESCALATE_GENERIC", "true").lower() == "true"
+
+    # ---- Uploads ----
+    MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+    BATCH_MAX_UPLOAD_BYTES = int(os.getenv("BATCH_MAX_UPLOAD_BYTES", str(200 * 1024 * 1024)))  # per file
+    BATCH_MAX_REQUEST_BYTES = int(os.getenv("BATCH_MAX_REQUEST_BYTES", str(400 * 1024 * 1024)))  # all files together
+    BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "100"))
+
+    # ---- Executors ----
+    OCR_EXECUTOR = os.getenv("OCR_EXECUTOR", "thread")  # thread | process
+    OCR_WORKERS = int(os.getenv("OCR_WORKERS", "2"))
+    OCR_QUEUE_SIZE = int(os.getenv("OCR_QUEUE_SIZE", "16"))
+    OCR_TORCH_THREADS = int(os.getenv("OCR_TORCH_THREADS", "0"))  # 0 = cores / workers
+    OCR_PRELOAD = os.getenv("OCR_PRELOAD", "true").lower() == "true"  # fork after model load
+
+    DB_WORKERS = int(os.getenv("DB_WORKERS", "4"))
+    DB_QUEUE_SIZE = int(os.getenv("DB_QUEUE_SIZE", "64"))
+
+    # ---- Recognizer micro-batching ----
+    OCR_BATCH_ENABLED = os.getenv("OCR_BATCH_ENABLED", "false").lower() == "true"
+    OCR_BATCH_MAX_SIZE = int(os.getenv("OCR_BATCH_MAX_SIZE", "32"))  # crops per batch
+    OCR_BATCH_MAX_WAIT_MS = float(os.getenv("OCR_BATCH_MAX_WAIT_MS", "10"))
+    OCR_BATCH_LATENCY_BUDGET_MS = float(os.getenv("OCR_BATCH_LATENCY_BUDGET_MS", "0"))  # 0 = off
+
+    # ---- Result cache ----
+    OCR_CACHE_ENABLED = os.getenv("OCR_CACHE_ENABLED", "true").lower() == "true"
+    OCR_CACHE_MAX_ENTRIES = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "1024"))
+    OCR_CACHE_TTL_SECONDS = float(os.getenv("OCR_CACHE_TTL_SECONDS", "86400"))
+    OCR_CACHE_DISK_PATH = os.getenv("OCR_CACHE_DISK_PATH", "")  # sqlite file, empty = memory only
+    OCR_CACHE_DISK_MAX_ENTRIES = int(os.getenv("OCR_CACHE_DISK_MAX_ENTRIES", "100000"))
+    OCR_CACHE_INSERT_ON_HIT = os.getenv("OCR_CACHE_INSERT_ON_HIT", "true").lower() == "true"
+
+    # ---- Write-behind inserts ----
+    WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "true").lower() == "true"
+    WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "200"))
+    WRITE_BEHIND_FLUSH_MS = float(os.getenv("WRITE_BEHIND_FLUSH_MS", "200"))
+    WRITE_BEHIND_MAX_QUEUE = int(os.getenv("WRITE_BEHIND_MAX_QUEUE", "10000"))
+    WRITE_BEHIND_SPOOL_PATH = os.getenv("WRITE_BEHIND_SPOOL_PATH", "extractions.spool.jsonl")  # empty = no spool
+    WRITE_BEHIND_DEAD_LETTER_PATH = os.getenv("WRITE_BEHIND_DEAD_LETTER_PATH", "extractions.dead.jsonl")  # rows the DB rejects; empty = log only
+
+    # ---- Batch extraction ----
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))  # images in flight per batch
+    BATCH_DB_CHUNK = int(os.getenv("BATCH_DB_CHUNK", "100"))  # rows per bulk insert
+    BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+    BATCH_MAX_MEMBER_BYTES = int(os.getenv("BATCH_MAX_MEMBER_BYTES", str(25 * 1024 * 1024)))
+    BATCH_MAX_EXPANDED_BYTES = int(os.getenv("BATCH_MAX_EXPANDED_BYTES", str(500 * 1024 * 1024)))  # unpacked ZIP bytes per upload
+
+    # ---- History API ----
+    HISTORY_DEFAULT_LIMIT = int(os.getenv("HISTORY_DEFAULT_LIMIT", "50"))
+    HISTORY_MAX_LIMIT = int(os.getenv("HISTORY_MAX_LIMIT", "500"))
+
+    # ---- Bulk export ----
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))  # rows per server-side cursor fetch
+    EXPORT_PARQUET_ROW_GROUP = int(os.getenv("EXPORT_PARQUET_ROW_GROUP", "100000"))
+    EXPORT_MAX_CONCURRENT = int(os.getenv("EXPORT_MAX_CONCURRENT", "2"))  # each holds a DB connection
+
+    # ---- Search ----
+    SEARCH_ENABLED = os.getenv("SEARCH_ENABLED", "true").lower() == "true"
+    SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "search.sqlite3")  # local FTS5 index
+    SEARCH_FUZZY_MAX_EXPANSIONS = int(os.getenv("SEARCH_FUZZY_MAX_EXPANSIONS", "16"))  # variants per term
+    SEARCH_DEFAULT_LIMIT = int(os.getenv("SEARCH_DEFAULT_LIMIT", "20"))
+    SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
+    SEARCH_MAX_OFFSET = int(os.getenv("SEARCH_MAX_OFFSET", "1000"))
+
+    # ---- Async jobs ----
+    JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "jobs.sqlite3")
+    JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "0.5"))
+    JOBS_CALLBACK_TIMEOUT = float(os.getenv("JOBS_CALLBACK_TIMEOUT", "10"))
+    JOBS_STALE_SECONDS = float(os.getenv("JOBS_STALE_SECONDS", "600"))  # since the last heartbeat, not the start
+    JOBS_HEARTBEAT_SECONDS = float(os.getenv("JOBS_HEARTBEAT_SECONDS", "30"))  # lease renewal while a job runs
+    JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "3"))  # runs before a job that kills its worker fails
+    # callback hosts accepted at submit; empty = any host resolving to a public address
+    JOBS_CALLBACK_ALLOWED_HOSTS = [h.strip().lower() for h in os.getenv("JOBS_CALLBACK_ALLOWED_HOSTS", "").split(",") if h.strip()]
+
+    # ---- Metrics ----
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"  # /metrics + stage timings
+
+    # ---- Slow-request profiler ----
+    PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "false").lower() == "true"
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0.01"))  # share of requests traced
+    PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))  # stack sampling period
+    PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))  # slowest traced requests retained
+    ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")  # required as X-Admin-Token; empty = /admin disabled
+
+    # ---- Startup / readiness ----
+    OCR_WARM_UP = os.getenv("OCR_WARM_UP", "true").lower() == "true"  # dummy inference before ready
+
 settings = Settings()
\ No newline at end of file
@@ -1,24 +1,303 @@
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+
 import mysql.connector
 from mysql.connector import Error
 from app.config import settings
 
-class MySQLConnection:
-    def __init__(self):
-        self.connection = None
 
-    def get_connection(self):
+class PoolTimeoutError(RuntimeError):
+    """No connection became free within the pool timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe DB-API connection pool.
+
+    - `size` connections are kept idle, up to `max_overflow` extra ones
+      are opened under load and closed again when returned
+    - connections older than `recycle` seconds are replaced on checkout
+    - `pre_ping` runs `SELECT 1` on checkout and reconnects if it fails
+    """
+
+    def __init__(self, creator: Callable[[], Any], size: int = 5, max_overflow: int = 5,
+                 timeout: float = 30, recycle: float = 3600, pre_ping: bool = True,
+                 dialect: str = "mysql"):
+        self.creator = creator
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.dialect = dialect
+
+        self._idle = queue.LifoQueue()
+        self._born: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._open = 0
+        self._in_use = 0
+        self._metrics = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    # =====================================================
+    # CHECKOUT / CHECKIN
+    # =====================================================
+    def acquire(self):
+        start = time.perf_counter()
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._create_or_wait()
+
+        conn = self._validate(conn)
+        waited = time.perf_counter() - start
+
+        with self._lock:
+            self._in_use += 1
+            self._metrics["checkouts"] += 1
+            self._metrics["wait_seconds_total"] += waited
+            self._metrics["wait_seconds_max"] = max(self._metrics["wait_seconds_max"], waited)
+        return conn
+
+    def release(self, conn):
+        with self._lock:
+            self._in_use -= 1
+            overflow = self._idle.qsize() >= self.size
+
+        try:
+            # never hand a half-finished transaction to the next request
+            conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+
+        if overflow:
+            self._discard(conn)
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self.acquire()
         try:
-            if not self.connection or not self.connection.is_connected():
-                self.connection = mysql.connector.connect(
-                host=settings.MYSQL_HOST,
-                port=settings.MYSQL_PORT,   # 👈 IMPORTANT
-                user=settings.MYSQL_USER,
-                password=settings.MYSQL_PASSWORD,
-                database=settings.MYSQL_DATABASE,
-                use_pure=True               # 👈 force TCP, avoid named pipe
-            )
-            return self.connection
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            checkouts = self._metrics["checkouts"]
+            return {
+                **self._metrics,
+                "wait_seconds_avg": self._metrics["wait_seconds_total"] / checkouts if checkouts else 0.0,
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+            }
+
+    # =====================================================
+    # INTERNALS
+    # =====================================================
+    def _create_or_wait(self):
+        with self._lock:
+            can_open = self._open < self.size + self.max_overflow
+            if can_open:
+                self._open += 1
+
+        if can_open:
+            try:
+                return self._create()
+            except Exception:
+                with self._lock:
+                    self._open -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self._metrics["timeouts"] += 1
+            raise PoolTimeoutError(f"No DB connection available after {self.timeout}s")
+
+    def _create(self):
+        try:
+            conn = self.creator()
         except Error as e:
             raise RuntimeError(f"DB Connection Failed: {e}")
+        self._born[id(conn)] = time.monotonic()
+        return conn
+
+    def _validate(self, conn):
+        born = self._born.get(id(conn), 0.0)
+        if self.recycle and time.monotonic() - born > self.recycle:
+            with self._lock:
+                self._metrics["recycled"] += 1
+            return self._replace(conn)
+
+        if self.pre_ping:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+                cursor.close()
+            except Exception:
+                with self._lock:
+                    self._metrics["ping_failures"] += 1
+                return self._replace(conn)
+
+        return conn
+
+    def _replace(self, conn):
+        self._close(conn)
+        try:
+            return self._create()
+        except Exception:
+            # the old connection's slot is gone too; don't leak it
+            with self._lock:
+                self._open -= 1
+            raise
+
+    def _discard(self, conn):
+        self._close(conn)
+        with self._lock:
+            self._open -= 1
+
+    def _close(self, conn):
+        self._born.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+# =====================================================
+# CONNECTION FACTORIES
+# =====================================================
+def mysql_creator():
+    # use_pure=False picks the C extension when it is installed
+    return mysql.connector.connect(
+        host=settings.MYSQL_HOST,
+        port=settings.MYSQL_PORT,
+        user=settings.MYSQL_USER,
+        password=settings.MYSQL_PASSWORD,
+        database=settings.MYSQL_DATABASE,
+        use_pure=settings.MYSQL_USE_PURE,
+    )
+
+
+class SQLiteCursor:
+    """mysql-connector style cursor over sqlite3 (`%s` params, dictionary rows)."""
+
+    def __init__(self, conn: sqlite3.Connection, dictionary: bool = False):
+        self._cursor = conn.cursor()
+        self._dictionary = dictionary
+
+    def execute(self, query: str, params=()):
+        self._cursor.execute(query.replace("%s", "?"), params)
+        return self
+
+    def executemany(self, query: str, seq_params):
+        self._cursor.executemany(query.replace("%s", "?"), seq_params)
+        return self
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {d[0]: v for d, v in zip(self._cursor.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size: int = 1):
+        return [self._row(r) for r in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(r) for r in self._cursor.fetchall()]
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """Local stand-in for MySQL in tests and benchmarks."""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+
+    def cursor(self, dictionary: bool = False, **_kwargs):
+        return SQLiteCursor(self._conn, dictionary=dictionary)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._conn.in_transaction
+
+    def is_connected(self) -> bool:
+        return True
+
+    def close(self):
+        self._conn.close()
+
+
+def make_pool() -> ConnectionPool:
+    if settings.DB_BACKEND == "sqlite":
+        creator, dialect = (lambda: SQLiteConnection(settings.SQLITE_PATH)), "sqlite"
+    else:
+        creator, dialect = mysql_creator, "mysql"
+
+    return ConnectionPool(
+        creator,
+        size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+        timeout=settings.DB_POOL_TIMEOUT,
+        recycle=settings.DB_POOL_RECYCLE,
+        pre_ping=settings.DB_POOL_PRE_PING,
+        dialect=dialect,
+    )
+
+
+db = make_pool()
+
 
-db = MySQLConnection()
\ No newline at end of file
+def get_db():
+    """FastAPI dependency: one pooled connection per request."""
+    with db.connection() as conn:
+        yield conn
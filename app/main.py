@@ -1,10 +1,24 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from starlette.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.routers.ocr import router as ocr_router
+from app.routers.admin import router as admin_router
 from app.database import db
-from app.models.ocr_extraction import create_ocr_table
+from app.async_database import async_db
+from app.services.ocr_service import ocr_service
+from app.services.ocr_backends import loaded_backends
+from app.services.executor import executor_stats, shutdown_executors
+from app.services.write_behind import extraction_writer
+from app.services.job_queue import job_queue
+from app.services.warm_up import warm_up
+from app.services.search_index import search_index
+from app.services.metrics import metrics
+from app.services.profiler import profiler
+from app.models.ocr_extraction import create_ocr_table, migrate_ocr_table
+from app.services.uuid_backfill import start_uuid_backfill
+from app.utils.upload import FORM_OVERHEAD_BYTES, install_body_size_limit
 from app.logger import logger
 
 app = FastAPI(title="OCR API")
@@ -17,8 +31,58 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# -------------------- REQUEST SIZE --------------------
+# refused while the body arrives; read_upload still caps each file
+install_body_size_limit(
+    app,
+    max_bytes=settings.MAX_UPLOAD_BYTES + FORM_OVERHEAD_BYTES,
+    limits={"/api/ocr/extract/batch": settings.BATCH_MAX_REQUEST_BYTES + FORM_OVERHEAD_BYTES},
+)
+
 # -------------------- ROUTERS --------------------
 app.include_router(ocr_router)
+app.include_router(admin_router)
+
+# -------------------- PROFILER --------------------
+if profiler.enabled:
+    @app.middleware("http")
+    async def profile_requests(request: Request, call_next):
+        if not profiler.should_sample():
+            return await call_next(request)
+        with profiler.request(request.method, request.url.path) as profile:
+            response = await call_next(request)
+            profile.status = response.status_code
+        return response
+
+# -------------------- METRICS --------------------
+if metrics.enabled:
+    app.middleware("http")(metrics.time_requests)
+
+    def _executor_series(key):
+        return lambda: {(name,): values[key] for name, values in executor_stats().items()}
+
+    def _inference_split():
+        values = executor_stats()["inference"]
+        running = min(values["pending"], values["workers"])
+        return {("running",): running, ("queued",): values["pending"] - running}
+
+    metrics.callback("ocr_executor_pending", "Tasks running or queued per executor.",
+                     _executor_series("pending"), ("executor",))
+    metrics.callback("ocr_executor_rejected_total", "Tasks rejected because the executor was full.",
+                     _executor_series("rejected"), ("executor",), kind="counter")
+    metrics.callback("ocr_inferences", "Inference tasks by state.", _inference_split, ("state",))
+    metrics.callback("ocr_db_pool_connections", "DB pool connections by state.",
+                     lambda: {(state,): db.stats()[state] for state in ("in_use", "idle", "open")}, ("state",))
+    metrics.callback("ocr_async_db_pool_connections", "Async (request handler) DB pool connections by state.",
+                     lambda: {(state,): async_db.stats()[state] for state in ("in_use", "idle", "open")},
+                     ("state",))
+    metrics.callback("ocr_job_queue_depth", "Queued async jobs per lane.",
+                     lambda: {(lane,): depth for lane, depth in job_queue.depth().items()}, ("lane",))
+    if extraction_writer is not None:
+        metrics.callback("ocr_write_behind_queued", "Extraction rows waiting to be inserted.",
+                         lambda: {(): extraction_writer.stats()["queued"]})
+    metrics.callback("ocr_ready", "1 once models are loaded and warmed up.",
+                     lambda: {(): int(warm_up.stats()["ready"])})
 
 # -------------------- STARTUP --------------------
 @app.on_event("startup")
@@ -26,19 +90,78 @@ def startup_event():
     try:
         logger.info("Starting OCR API...")
 
-        conn = db.get_connection()
-        cursor = conn.cursor()
-
-        create_ocr_table(cursor)
-        conn.commit()
-        cursor.close()
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            create_ocr_table(cursor, db.dialect)
+            migrate_ocr_table(cursor, db.dialect, backfill=False)
+            conn.commit()
+            cursor.close()
 
         logger.info("Database table verified/created successfully")
 
     except Exception as e:
         logger.exception("Startup failed: Unable to initialize database")
+    else:
+        start_uuid_backfill(db)
+
+    if extraction_writer is not None:
+        extraction_writer.start()
+
+    # models load in the background; /health/ready reports when they are hot
+    warm_up.start()
+
+    if settings.PROFILE_ENABLED and not settings.ADMIN_TOKEN:
+        logger.warning("PROFILE_ENABLED without ADMIN_TOKEN: /admin/profiles stays disabled")
+
+# -------------------- SHUTDOWN --------------------
+@app.on_event("shutdown")
+async def shutdown_event():
+    await async_db.close_all()
+    shutdown_executors()
+    if extraction_writer is not None:
+        extraction_writer.close()
+    db.close_all()
+    logger.info("Executors and DB pool shut down")
 
 # -------------------- ROOT --------------------
 @app.get("/")
 def root():
     return {"status": "OCR API running"}
+
+# -------------------- HEALTH --------------------
+@app.get("/health/live")
+def health_live():
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+def health_ready():
+    state = warm_up.stats()
+    if not state["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming_up", **state})
+    return {"status": "ready", **state}
+
+# -------------------- METRICS --------------------
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    if not metrics.enabled:
+        return PlainTextResponse("metrics disabled (METRICS_ENABLED=false)\n", status_code=404)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# -------------------- STATS --------------------
+@app.get("/stats")
+def stats():
+    return {
+        "executors": executor_stats(),
+        "db_pool": db.stats(),
+        "async_db_pool": async_db.stats(),
+        "write_behind": extraction_writer.stats() if extraction_writer else None,
+        "job_queue": job_queue.depth(),
+        "backends": {name: backend.stats() for name, backend in loaded_backends().items()},
+        "cache": ocr_service.cache.stats() if ocr_service.cache else None,
+        "cascade": ocr_service.cascade_stats.stats(),
+        "templates": ocr_service.templates.stats(),
+        "preprocess": ocr_service.preprocess_stats.stats(),
+        "warm_up": warm_up.stats(),
+        "search": search_index.stats() if search_index else None,
+        "profiler": profiler.stats(),
+    }
@@ -0,0 +1,50 @@
+"""
+Move inline raw_text of existing rows into ocr_extraction_texts.
+
+    python -m app.migrate_raw_text [--batch 1000]
+
+New rows already store their text in the side table; this drains the
+old ones in small committed batches so it can run against a live
+database. On MySQL, run OPTIMIZE TABLE ocr_extractions afterwards to
+give the freed space back.
+"""
+import argparse
+import time
+
+from app.database import db
+from app.logger import logger
+from app.models.ocr_extraction import count_missing_uuids, migrate_ocr_table, move_inline_text
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--pause", type=float, default=0.0, help="seconds between batches")
+    args = parser.parse_args()
+
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        migrate_ocr_table(cursor, db.dialect, commit=conn.commit)
+        conn.commit()
+
+        # the side table is keyed by uuid; the migration above backfills it
+        missing = count_missing_uuids(cursor)
+        if missing:
+            raise SystemExit(f"{missing} rows still have no uuid, is an older app version writing?")
+
+        total = 0
+        while True:
+            moved = move_inline_text(cursor, args.batch)
+            conn.commit()
+            if not moved:
+                break
+            total += moved
+            logger.info(f"Moved raw_text of {total} rows")
+            time.sleep(args.pause)
+        cursor.close()
+
+    logger.info(f"Done, {total} rows moved")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from app.async_database import AsyncConnectionPool, async_db
+from app.models.ocr_extraction import (
+    INSERT_EXTRACTION_SQL, INSERT_TEXT_SQL, SELECT_TEXT_SQL, decode_text, export_query, export_row,
+    extraction_query, extractions_query, history_query, inline_text_query, split_extraction_row,
+    text_row,
+)
+
+
+class ExtractionRepository:
+    """
+    Awaitable access to ocr_extractions (+ the text side table) for request
+    handlers. Same SQL as the cursor functions in ocr_extraction.py, which
+    scripts and background threads keep using on the blocking pool.
+    """
+
+    def __init__(self, pool: AsyncConnectionPool):
+        self.pool = pool
+
+    async def insert(self, rows: List[tuple]):
+        """Inserts extraction_row()s in one transaction."""
+        split = [split_extraction_row(row) for row in rows]
+        async with self.pool.connection() as conn:
+            await conn.executemany(INSERT_EXTRACTION_SQL, [values for values, _, _ in split])
+            await conn.executemany(INSERT_TEXT_SQL, [
+                text_row(values[0], text, lines) for values, text, lines in split
+            ])
+            await conn.commit()
+
+    async def get(self, extraction_id, include_text: bool = False,
+                  by_row_id: bool = False) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        (row dict or None, {"text", "lines"} or None). by_row_id looks the
+        row up by its integer primary key instead of the uuid.
+        """
+        column = "id" if by_row_id else "uuid"
+        async with self.pool.connection() as conn:
+            row = await conn.fetchone(extraction_query(column), (extraction_id,), dictionary=True)
+            if row is None or not include_text:
+                return row, None
+            return row, await self._text(conn, row)
+
+    async def get_by_row_id(self, row_id: int) -> Optional[Dict]:
+        """Lookup by the integer primary key (legacy API; rows may have no uuid)."""
+        async with self.pool.connection() as conn:
+            return await conn.fetchone(extraction_query("id"), (row_id,), dictionary=True)
+
+    async def get_many(self, extraction_uuids: Iterable[str]) -> Dict[str, Dict]:
+        """Row dicts keyed by uuid; unknown uuids are left out."""
+        extraction_uuids = list(extraction_uuids)
+        if not extraction_uuids:
+            return {}
+        async with self.pool.connection() as conn:
+            rows = await conn.fetchall(extractions_query(len(extraction_uuids)), extraction_uuids,
+                                       dictionary=True)
+        return {row["uuid"]: row for row in rows}
+
+    async def list(self, filters: Optional[Dict[str, Any]] = None, after=None,
+                   limit: int = 50) -> Tuple[List[Dict], bool]:
+        """Newest-first keyset page, see history_query(). Returns (rows, has_more)."""
+        sql, params = history_query(filters or {}, after, limit + 1)
+        async with self.pool.connection() as conn:
+            rows = await conn.fetchall(sql, params, dictionary=True)
+        return list(rows[:limit]), len(rows) > limit
+
+    async def stream(self, filters: Optional[Dict[str, Any]] = None, include_text: bool = False,
+                     batch_size: int = 1000) -> AsyncIterator[List[tuple]]:
+        """
+        Batches of EXPORT_COLUMNS tuples (+ raw_text), oldest first, off a
+        server-side cursor: memory stays at one batch whatever the row count.
+        Holds one pool connection until the stream ends or is closed.
+        """
+        sql, params = export_query(filters or {}, include_text)
+        async with self.pool.connection() as conn:
+            batches = conn.iterate(sql, params, batch_size)
+            try:
+                async for rows in batches:
+                    yield [export_row(row, include_text) for row in rows]
+            finally:
+                # runs the cursor cleanup now, not whenever the GC gets to it
+                await batches.aclose()
+
+    async def _text(self, conn, extraction: Dict) -> Optional[Dict]:
+        if extraction["uuid"] is not None:
+            row = await conn.fetchone(SELECT_TEXT_SQL, (extraction["uuid"],))
+            if row is not None:
+                return decode_text(row[0], row[1])
+
+        # rows from before the side table keep their text inline
+        row = await conn.fetchone(inline_text_query("id"), (extraction["id"],))
+        if row is None or row[0] is None:
+            return None
+        return {"text": row[0], "lines": []}
+
+
+extraction_repository = ExtractionRepository(async_db)
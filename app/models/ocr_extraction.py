@@ -1,7 +1,20 @@
-def create_ocr_table(cursor):
-    cursor.execute("""
+import json
+import uuid
+
+from app.utils.compression import compress, decompress
+
+
+def create_ocr_table(cursor, dialect="mysql"):
+    # sqlite is only used as a local stand-in for tests/benchmarks
+    if dialect == "sqlite":
+        id_column = "id INTEGER PRIMARY KEY AUTOINCREMENT"
+    else:
+        id_column = "id INT AUTO_INCREMENT PRIMARY KEY"
+
+    cursor.execute(f"""
         CREATE TABLE IF NOT EXISTS ocr_extractions (
-            id INT AUTO_INCREMENT PRIMARY KEY,
+            {id_column},
+            uuid CHAR(36) NOT NULL,
             filename VARCHAR(255),
             document_type VARCHAR(50),
             name VARCHAR(255),
@@ -9,6 +22,7 @@ def create_ocr_table(cursor):
             phone VARCHAR(50),
             aadhaar VARCHAR(20),
             pan VARCHAR(20),
+            dob VARCHAR(20),
             address TEXT,
             state VARCHAR(100),
             country VARCHAR(100),
@@ -16,4 +30,457 @@ def create_ocr_table(cursor):
             confidence_score FLOAT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
-    """)
\ No newline at end of file
+    """)
+    create_text_table(cursor, dialect)
+
+
+def create_text_table(cursor, dialect="mysql"):
+    # Raw OCR output + per-line boxes/confidences, compressed, one row per
+    # extraction. Kept out of ocr_extractions so history and lookup queries
+    # never drag it through the buffer pool; read only by the detail endpoint.
+    blob = "BLOB" if dialect == "sqlite" else "LONGBLOB"
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS ocr_extraction_texts (
+            extraction_uuid CHAR(36) PRIMARY KEY,
+            codec VARCHAR(8) NOT NULL,
+            raw_size INT NOT NULL,
+            payload {blob} NOT NULL
+        )
+    """)
+
+
+# =====================================================
+# MIGRATIONS (idempotent, run at startup)
+# =====================================================
+# column -> definition, added to tables created by older versions
+# (uuid is filled in for existing rows and made NOT NULL afterwards)
+ADDED_COLUMNS = {
+    "dob": "VARCHAR(20)",
+    "uuid": "CHAR(36)",
+}
+
+# index name -> (unique, columns)
+# History pages are ordered by (created_at, id); every filter index ends
+# with those columns so a filtered page is one index range scan.
+INDEXES = {
+    "uq_ocr_uuid": (True, "uuid"),
+    "ix_ocr_created": (False, "created_at, id"),
+    "ix_ocr_type_created": (False, "document_type, created_at, id"),
+    "ix_ocr_pan_created": (False, "pan, created_at, id"),
+    "ix_ocr_aadhaar_created": (False, "aadhaar, created_at, id"),
+    "ix_ocr_phone_created": (False, "phone, created_at, id"),
+}
+
+
+def existing_columns(cursor, dialect="mysql"):
+    if dialect == "sqlite":
+        cursor.execute("PRAGMA table_info(ocr_extractions)")
+        return {row[1] for row in cursor.fetchall()}
+
+    cursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'ocr_extractions'
+    """)
+    return {row[0] for row in cursor.fetchall()}
+
+
+def existing_indexes(cursor, dialect="mysql"):
+    if dialect == "sqlite":
+        cursor.execute("PRAGMA index_list(ocr_extractions)")
+        return {row[1] for row in cursor.fetchall()}
+
+    cursor.execute("""
+        SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'ocr_extractions'
+    """)
+    return {row[0] for row in cursor.fetchall()}
+
+
+def uuid_nullable(cursor, dialect="mysql"):
+    if dialect == "sqlite":
+        cursor.execute("PRAGMA table_info(ocr_extractions)")
+        return any(row[1] == "uuid" and not row[3] for row in cursor.fetchall())
+
+    cursor.execute("""
+        SELECT IS_NULLABLE FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'ocr_extractions' AND COLUMN_NAME = 'uuid'
+    """)
+    row = cursor.fetchone()
+    return row is not None and row[0] == "YES"
+
+
+def count_missing_uuids(cursor):
+    cursor.execute("SELECT COUNT(*) FROM ocr_extractions WHERE uuid IS NULL")
+    return cursor.fetchone()[0]
+
+
+def backfill_uuids(cursor, after_id=0, batch_size=1000):
+    """
+    Gives the next batch of rows written before the uuid column (id >
+    after_id) a uuid. Returns (last id looked at or None once done,
+    rows updated). Rows another process filled meanwhile are left alone.
+    """
+    cursor.execute(
+        "SELECT id, uuid FROM ocr_extractions WHERE id > %s ORDER BY id LIMIT %s",
+        (after_id, batch_size)
+    )
+    rows = cursor.fetchall()
+    if not rows:
+        return None, 0
+
+    missing = [(str(uuid.uuid4()), row_id) for row_id, value in rows if value is None]
+    if missing:
+        cursor.executemany("UPDATE ocr_extractions SET uuid = %s WHERE id = %s AND uuid IS NULL", missing)
+    return rows[-1][0], len(missing)
+
+
+# MySQL online DDL, so a large table keeps taking inserts meanwhile.
+# ALTER TABLE separates its options with commas, CREATE INDEX does not.
+ONLINE_ALTER = ", ALGORITHM=INPLACE, LOCK=NONE"
+ONLINE_INDEX = " ALGORITHM=INPLACE LOCK=NONE"
+
+
+def create_index_sql(name, dialect="mysql"):
+    unique, columns = INDEXES[name]
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    online = ONLINE_INDEX if dialect == "mysql" else ""
+    return f"CREATE {kind} {name} ON ocr_extractions ({columns}){online}"
+
+
+def uuid_not_null_sql(dialect="mysql"):
+    # SQLite can't change a column constraint in place; its tables are
+    # created with NOT NULL and the stand-in is never upgraded
+    if dialect != "mysql":
+        return None
+    return f"ALTER TABLE ocr_extractions MODIFY COLUMN uuid CHAR(36) NOT NULL{ONLINE_ALTER}"
+
+
+def migrate_ocr_table(cursor, dialect="mysql", commit=None, batch_size=1000, backfill=True):
+    """
+    Columns and indexes added since the first release. With backfill,
+    also finish_uuid_migration(); the app passes backfill=False at
+    startup and runs that in the background instead.
+    """
+    create_text_table(cursor, dialect)
+
+    columns = existing_columns(cursor, dialect)
+    for column, definition in ADDED_COLUMNS.items():
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE ocr_extractions ADD COLUMN {column} {definition}")
+
+    # before the uuid step: NULL uuids don't clash in a unique index
+    indexes = existing_indexes(cursor, dialect)
+    for name in INDEXES:
+        if name not in indexes:
+            cursor.execute(create_index_sql(name, dialect))
+
+    if backfill:
+        finish_uuid_migration(cursor, dialect, commit, batch_size)
+
+
+def finish_uuid_migration(cursor, dialect="mysql", commit=None, batch_size=1000):
+    """
+    Gives rows written before the uuid column one, then makes the column
+    NOT NULL. `commit` (the connection's) is called between batches so a
+    large table isn't rewritten in one transaction. Returns the number
+    of rows backfilled.
+    """
+    if not uuid_nullable(cursor, dialect):
+        return 0
+
+    filled = 0
+    last_id = 0 if count_missing_uuids(cursor) else None
+    while last_id is not None:
+        last_id, count = backfill_uuids(cursor, last_id, batch_size)
+        filled += count
+        if commit is not None:
+            commit()
+
+    sql = uuid_not_null_sql(dialect)
+    if sql is not None:
+        cursor.execute(sql)
+    return filled
+
+
+# =====================================================
+# INSERTS
+# =====================================================
+# raw_text stays in the table for rows written before the side table
+# existed, but new rows leave it NULL.
+EXTRACTION_COLUMNS = (
+    "uuid", "filename", "document_type", "name", "email", "phone", "aadhaar",
+    "pan", "dob", "address", "state", "country", "confidence_score",
+)
+
+INSERT_EXTRACTION_SQL = (
+    f"INSERT INTO ocr_extractions ({', '.join(EXTRACTION_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * len(EXTRACTION_COLUMNS))})"
+)
+
+INSERT_TEXT_SQL = (
+    "INSERT INTO ocr_extraction_texts (extraction_uuid, codec, raw_size, payload) "
+    "VALUES (%s, %s, %s, %s)"
+)
+
+
+# VARCHAR widths from create_ocr_table. extraction_row() cuts longer
+# values (a client's filename, say) instead of letting MySQL strict mode
+# reject the whole insert batch.
+COLUMN_LIMITS = {
+    "filename": 255, "document_type": 50, "name": 255, "email": 255, "phone": 50,
+    "aadhaar": 20, "pan": 20, "dob": 20, "state": 100, "country": 100,
+}
+
+
+def _fit(column, value):
+    limit = COLUMN_LIMITS.get(column)
+    if limit and isinstance(value, str) and len(value) > limit:
+        return value[:limit]
+    return value
+
+
+def extraction_row(extraction_uuid, filename, document_type, fields, text, confidence, lines=None):
+    """
+    One pending insert: the ocr_extractions values followed by the raw
+    text and lines, which go to ocr_extraction_texts. Plain JSON-able
+    values so rows can be spooled by the write-behind queue.
+    """
+    values = (
+        extraction_uuid,
+        filename,
+        document_type,
+        fields.get("name"),
+        fields.get("email"),
+        fields.get("phone"),
+        fields.get("aadhaar"),
+        fields.get("pan"),
+        fields.get("dob"),
+        fields.get("address"),
+        fields.get("state"),
+        fields.get("country"),
+        confidence,
+    )
+    return (
+        *(_fit(column, value) for column, value in zip(EXTRACTION_COLUMNS, values)),
+        text,
+        lines or [],
+    )
+
+
+def split_extraction_row(row):
+    """(ocr_extractions values, text, lines) of an extraction_row."""
+    if len(row) == len(EXTRACTION_COLUMNS) + 1:
+        # spooled before the side table: raw_text sat before confidence_score
+        row = (*row[:12], row[13], row[12], [])
+    return row[:-2], row[-2], row[-1]
+
+
+def text_row(extraction_uuid, text, lines):
+    raw = json.dumps({"text": text, "lines": lines}, separators=(",", ":")).encode()
+    codec, payload = compress(raw)
+    return extraction_uuid, codec, len(raw), payload
+
+
+def insert_extractions(cursor, rows):
+    split = [split_extraction_row(row) for row in rows]
+    # mysql-connector rewrites executemany INSERTs into one multi-row statement
+    cursor.executemany(INSERT_EXTRACTION_SQL, [values for values, _, _ in split])
+    cursor.executemany(INSERT_TEXT_SQL, [
+        text_row(values[0], text, lines) for values, text, lines in split
+    ])
+
+
+# =====================================================
+# DETAIL (text fetched on demand)
+# =====================================================
+# shared with the async repository (extraction_repository.py)
+SELECT_TEXT_SQL = "SELECT codec, payload FROM ocr_extraction_texts WHERE extraction_uuid = %s"
+
+
+def extraction_query(column="uuid"):
+    return f"SELECT {', '.join(HISTORY_COLUMNS)} FROM ocr_extractions WHERE {column} = %s"
+
+
+def inline_text_query(column="uuid"):
+    return f"SELECT raw_text FROM ocr_extractions WHERE {column} = %s"
+
+
+def extractions_query(count):
+    return (
+        f"SELECT {', '.join(HISTORY_COLUMNS)} FROM ocr_extractions "
+        f"WHERE uuid IN ({', '.join(['%s'] * count)})"
+    )
+
+
+def decode_text(codec, payload):
+    return json.loads(decompress(codec, bytes(payload)))
+
+
+def fetch_extraction(cursor, extraction_uuid):
+    cursor.execute(extraction_query(), (extraction_uuid,))
+    return cursor.fetchone()
+
+
+def fetch_extractions(cursor, extraction_uuids):
+    """Hot rows (dicts) of several extractions, keyed by uuid."""
+    if not extraction_uuids:
+        return {}
+    cursor.execute(extractions_query(len(extraction_uuids)), list(extraction_uuids))
+    return {row["uuid"]: row for row in cursor.fetchall()}
+
+
+def fetch_text(cursor, extraction_uuid):
+    """{"text", "lines"} for one extraction, None if nothing was stored."""
+    cursor.execute(SELECT_TEXT_SQL, (extraction_uuid,))
+    row = cursor.fetchone()
+    if row is not None:
+        return decode_text(row[0], row[1])
+
+    # rows from before the side table keep their text inline
+    cursor.execute(inline_text_query(), (extraction_uuid,))
+    row = cursor.fetchone()
+    if row is None or row[0] is None:
+        return None
+    return {"text": row[0], "lines": []}
+
+
+def scan_texts(cursor, after_id=0, limit=1000):
+    """
+    Next batch of (id, uuid, document_type, name, address, text) in id
+    order, for rebuilding derived indexes; text is None if none was stored.
+    """
+    cursor.execute(
+        "SELECT e.id, e.uuid, e.document_type, e.name, e.address, e.raw_text, t.codec, t.payload "
+        "FROM ocr_extractions e LEFT JOIN ocr_extraction_texts t ON t.extraction_uuid = e.uuid "
+        "WHERE e.id > %s ORDER BY e.id LIMIT %s",
+        (after_id, limit)
+    )
+    rows = []
+    for row_id, uuid, document_type, name, address, raw_text, codec, payload in cursor.fetchall():
+        if payload is not None:
+            raw_text = decode_text(codec, payload)["text"]
+        rows.append((row_id, uuid, document_type, name, address, raw_text))
+    return rows
+
+
+# =====================================================
+# BACKFILL (inline raw_text -> side table)
+# =====================================================
+def move_inline_text(cursor, batch_size=1000):
+    """
+    Moves one batch of legacy inline raw_text into ocr_extraction_texts;
+    returns rows moved. Needs every row to have a uuid (migrate_ocr_table).
+    """
+    cursor.execute(
+        "SELECT uuid, raw_text FROM ocr_extractions WHERE raw_text IS NOT NULL LIMIT %s",
+        (batch_size,)
+    )
+    rows = cursor.fetchall()
+    if not rows:
+        return 0
+
+    cursor.executemany(INSERT_TEXT_SQL, [text_row(uuid, text, []) for uuid, text in rows])
+    cursor.executemany(
+        "UPDATE ocr_extractions SET raw_text = NULL WHERE uuid = %s",
+        [(uuid,) for uuid, _ in rows]
+    )
+    return len(rows)
+
+
+# =====================================================
+# HISTORY (keyset pagination)
+# =====================================================
+HISTORY_COLUMNS = (
+    "id", "uuid", "filename", "document_type", "name", "email", "phone", "aadhaar",
+    "pan", "dob", "address", "state", "country", "confidence_score", "created_at",
+)
+
+# filter -> SQL condition
+HISTORY_FILTERS = {
+    "document_type": "document_type = %s",
+    "pan": "pan = %s",
+    "aadhaar": "aadhaar = %s",
+    "phone": "phone = %s",
+    "created_from": "created_at >= %s",
+    "created_to": "created_at < %s",
+}
+
+
+def history_query(filters, after=None, limit=50):
+    """
+    Newest-first page of extractions. `after` is the (created_at, id) of
+    the last row of the previous page; the next page starts strictly
+    below it, so page N costs the same as page 1.
+    """
+    conditions = []
+    params = []
+    for key, condition in HISTORY_FILTERS.items():
+        if filters.get(key) is not None:
+            conditions.append(condition)
+            params.append(filters[key])
+
+    if after is not None:
+        # (created_at, id) < (%s, %s), spelled out; the leading
+        # created_at <= %s gives both MySQL and SQLite an index seek
+        # instead of a scan from the newest row
+        conditions.append("created_at <= %s AND (created_at < %s OR (created_at = %s AND id < %s))")
+        params.extend([after[0], after[0], after[0], after[1]])
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = (
+        f"SELECT {', '.join(HISTORY_COLUMNS)} FROM ocr_extractions {where} "
+        f"ORDER BY created_at DESC, id DESC LIMIT %s"
+    )
+    return sql, params + [limit]
+
+
+def fetch_history(cursor, filters, after=None, limit=50):
+    """Returns (rows as dicts, has_more)."""
+    sql, params = history_query(filters, after, limit + 1)
+    cursor.execute(sql, params)
+    rows = cursor.fetchall()
+    return rows[:limit], len(rows) > limit
+
+
+# =====================================================
+# EXPORT (streamed, oldest first)
+# =====================================================
+EXPORT_COLUMNS = (
+    "uuid", "filename", "document_type", "name", "email", "phone", "aadhaar",
+    "pan", "dob", "address", "state", "country", "confidence_score", "created_at",
+)
+
+
+def export_query(filters, include_text=False):
+    """
+    All matching rows in (created_at, id) order, the order of the history
+    indexes, so MySQL streams them off an index without a filesort. With
+    include_text the row ends with (raw_text, codec, payload) for
+    export_row() to decode.
+    """
+    conditions = []
+    params = []
+    for key, condition in HISTORY_FILTERS.items():
+        if filters.get(key) is not None:
+            conditions.append(f"e.{condition}")
+            params.append(filters[key])
+
+    columns = ", ".join(f"e.{column}" for column in EXPORT_COLUMNS)
+    join = ""
+    if include_text:
+        columns += ", e.raw_text, t.codec, t.payload"
+        join = " LEFT JOIN ocr_extraction_texts t ON t.extraction_uuid = e.uuid"
+
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = f"SELECT {columns} FROM ocr_extractions e{join}{where} ORDER BY e.created_at, e.id"
+    return sql, params
+
+
+def export_row(row, include_text=False):
+    """EXPORT_COLUMNS values (+ raw_text) of an export_query() row."""
+    if not include_text:
+        return row
+    raw_text, codec, payload = row[-3:]
+    if payload is not None:
+        raw_text = decode_text(codec, payload)["text"]
+    return (*row[:-3], raw_text)
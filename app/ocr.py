@@ -1,37 +1,21 @@
-import pytesseract
+import numpy as np
 from PIL import Image
-import re
+
+from app.services.field_extractor import extract_document
+from app.services.ocr_backends import get_backend
+
 
 def extract_text(image_path: str) -> dict:
-    text = pytesseract.image_to_string(Image.open(image_path))
+    # Tesseract via the shared backend registry and field extraction layer
+    image_np = np.asarray(Image.open(image_path).convert("RGB"))
+    text = "\n".join(region[1] for region in get_backend("tesseract").read(image_np))
+    fields, _ = extract_document(text)
 
     return {
-        "name": extract_name(text),
-        "mobile": extract_mobile(text),
-        "aadhaar": extract_aadhaar(text),
-        "pan": extract_pan(text),
-        "address": extract_address(text),
+        "name": fields["name"],
+        "mobile": fields["phone"],
+        "aadhaar": fields["aadhaar"],
+        "pan": fields["pan"],
+        "address": fields["address"] or text[:300],  # simple fallback
         "raw_text": text
     }
-
-def extract_mobile(text):
-    match = re.search(r'[6-9]\d{9}', text)
-    return match.group() if match else None
-
-def extract_aadhaar(text):
-    match = re.search(r'\d{4}\s\d{4}\s\d{4}', text)
-    return match.group() if match else None
-
-def extract_pan(text):
-    match = re.search(r'[A-Z]{5}[0-9]{4}[A-Z]', text)
-    return match.group() if match else None
-
-def extract_name(text):
-    lines = text.split('\n')
-    for line in lines:
-        if line.isalpha() and len(line) > 3:
-            return line
-    return None
-
-def extract_address(text):
-    return text[:300]  # simple fallback
@@ -0,0 +1,50 @@
+"""
+(Re)build the local search index from the database.
+
+    python -m app.rebuild_search_index [--batch 1000] [--from-id 0]
+
+New extractions are indexed as they are persisted; this backfills rows
+written before the index existed, or while indexing was failing.
+Already indexed extractions are skipped, so it can be stopped and
+re-run (pass the last logged id as --from-id to skip ahead).
+"""
+import argparse
+import time
+
+from app.config import settings
+from app.database import db
+from app.logger import logger
+from app.models.ocr_extraction import scan_texts
+from app.services.search_index import SearchIndex
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--from-id", type=int, default=0)
+    args = parser.parse_args()
+
+    index = SearchIndex(settings.SEARCH_INDEX_PATH, settings.SEARCH_FUZZY_MAX_EXPANSIONS)
+    last_id = args.from_id
+    scanned = added = 0
+    start = time.perf_counter()
+
+    while True:
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            rows = scan_texts(cursor, last_id, args.batch)
+            cursor.close()
+        if not rows:
+            break
+
+        added += index.add(row[1:] for row in rows)
+        scanned += len(rows)
+        last_id = rows[-1][0]
+        logger.info(f"Scanned {scanned} rows up to id {last_id}, {added} newly indexed "
+                    f"({scanned / (time.perf_counter() - start):.0f} rows/s)")
+
+    logger.info(f"Done, {added} of {scanned} rows newly indexed")
+
+
+if __name__ == "__main__":
+    main()
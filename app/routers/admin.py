@@ -0,0 +1,56 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
+from app.services.profiler import profiler
+from app.utils.response import success_response
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    # fail closed: without a configured token /admin does not exist
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), settings.ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+# =====================================================
+# SLOW-REQUEST PROFILES
+# =====================================================
+@router.get("/profiles")
+def list_profiles():
+    """Slowest sampled requests, slowest first."""
+    return success_response(
+        message="Slow request profiles",
+        data={"profiler": profiler.stats(), "items": profiler.profiles()}
+    )
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(
+    profile_id: str,
+    format: str = Query("json", description="json | folded (flamegraph.pl / speedscope input)")
+):
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    if format == "folded":
+        return PlainTextResponse(profile.folded())
+
+    return success_response(
+        message="Slow request profile",
+        data={**profile.summary(), "traces": profile.traces}
+    )
+
+
+@router.delete("/profiles")
+def clear_profiles():
+    profiler.clear()
+    return success_response(message="Profiles cleared")
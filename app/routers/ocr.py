@@ -1,75 +1,523 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import asyncio
+import json
+import time
+import uuid
+from fastapi import APIRouter, UploadFile, File, Form, Query, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from datetime import datetime
+from typing import List, Optional
 
-from app.database import db
-from app.services.ocr_service import ocr_service
-from app.models.ocr_extraction import create_ocr_table
+from app.config import settings
+from app.database import PoolTimeoutError
+from app.services.ocr_service import ocr_service, run_extract_text
+from app.services.ocr_backends import BACKENDS
+from app.services.executor import inference_executor, db_executor, ExecutorBusyError
+from app.services.write_behind import extraction_writer
+from app.services.job_queue import job_queue
+from app.services.search_index import search_index
+from app.services.metrics import metrics
+from app.services.profiler import profiler
+from app.models.ocr_extraction import extraction_row, EXPORT_COLUMNS
+from app.models.extraction_repository import extraction_repository
+from app.services.field_extractor import FIELD_NAMES
+from app.utils.batch_input import expand_upload
+from app.utils.pagination import encode_cursor, decode_cursor, format_timestamp
+from app.utils.upload import read_upload, UploadTooLargeError
+from app.utils.export import make_encoder
 from app.utils.response import success_response, error_response
 from app.logger import logger
 
 router = APIRouter(prefix="/api/ocr", tags=["OCR"])
 
 
+def busy_response(e):
+    return JSONResponse(
+        status_code=429,
+        content=error_response("Server busy, please retry", error=str(e)),
+        headers={"Retry-After": "1"}
+    )
+
+
+async def persist_extractions(rows):
+    """Queue rows for write-behind, or insert them on the async pool if it is disabled."""
+    if extraction_writer is not None:
+        extraction_writer.submit_many(rows)
+        return
+
+    with metrics.stage("db_insert"):
+        await extraction_repository.insert(rows)
+
+    if search_index is not None:
+        # rows are committed: wait for a slot rather than fail the request
+        await db_executor.run(search_index.index_rows, rows, wait=True)
+
+
+async def run_extraction(filename, image_bytes, wait=False, backend=None, mode=None):
+    """
+    OCR + field extraction for one image.
+    Returns (response data, db row or None), or (None, None) if no text was found.
+    """
+    start = time.perf_counter()
+    result, timings, trace = await inference_executor.run(
+        run_extract_text, image_bytes, backend, mode, profiler.requested(), wait=wait
+    )
+    text, confidence, lines, cached, engine, analysis = result
+
+    # stages ran in the pool (maybe another process); the rest of the
+    # round trip is queueing + transfer
+    metrics.observe_stages(timings)
+    if "inference" in timings:
+        metrics.record("inference_queue", max(0.0, time.perf_counter() - start - timings["inference"]))
+    profiler.attach(
+        trace, engine=engine, cached=cached, regions=len(lines),
+        stage_ms={stage: round(seconds * 1000, 2) for stage, seconds in timings.items()},
+    )
+
+    if not text.strip():
+        return None, None
+
+    # template mode maps regions to fields itself
+    with metrics.stage("fields"):
+        fields, document_type = analysis or ocr_service.analyze(text)
+    metrics.count_document(document_type, engine)
+    profiler.attach(document_type=document_type)
+
+    extraction_id = None
+    row = None
+    if not cached or settings.OCR_CACHE_INSERT_ON_HIT:
+        extraction_id = str(uuid.uuid4())
+        row = extraction_row(extraction_id, filename, document_type, fields, text, confidence, lines)
+
+    data = {
+        "id": extraction_id,
+        "document_type": document_type,
+        "extracted_data": fields,
+        "confidence_score": round(confidence, 4),
+        "cached": cached,
+        "engine": engine
+    }
+    return data, row
+
+
+OCR_MODES = ("single", "cascade", "template")
+
+
+def _invalid_engine(backend, mode=None):
+    if backend and backend not in BACKENDS:
+        return error_response(f"Unknown OCR backend '{backend}'", error=f"Available: {sorted(BACKENDS)}")
+    if mode and mode not in OCR_MODES:
+        return error_response(f"Unknown OCR mode '{mode}'", error=f"Available: {list(OCR_MODES)}")
+    return None
+
+
 @router.post("/extract")
-async def extract_ocr(file: UploadFile = File(...)):
+async def extract_ocr(
+    file: UploadFile = File(...),
+    backend: Optional[str] = Query(None, description="OCR engine, defaults to OCR_BACKEND"),
+    mode: Optional[str] = Query(None, description="single | cascade | template, defaults to OCR_MODE")
+):
     try:
         if not file.content_type.startswith("image/"):
             return error_response("Only image files are allowed")
 
-        image_bytes = await file.read()
+        invalid = _invalid_engine(backend, mode)
+        if invalid:
+            return invalid
 
-        # ---------- OCR ----------
-        text, confidence = ocr_service.extract_text(image_bytes)
+        with metrics.stage("upload"):
+            image_bytes = await read_upload(file, settings.MAX_UPLOAD_BYTES)
 
-        if not text.strip():
-            return error_response("No readable text found in image")
+        # ---------- OCR + FIELDS (inference pool) ----------
+        data, row = await run_extraction(file.filename, image_bytes, backend=backend, mode=mode)
 
-        # ---------- FIELD EXTRACTION ----------
-        fields = ocr_service.extract_fields(text)
-        document_type = ocr_service.categorize_document(fields, text)
-
-        # ---------- SAVE TO DB ----------
-        conn = db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO ocr_extractions
-            (filename, document_type, name, email, phone, aadhaar, pan, dob,
-             address, state, country, raw_text, confidence_score)
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        """, (
-            file.filename,
-            document_type,
-            fields.get("name"),
-            fields.get("email"),
-            fields.get("phone"),
-            fields.get("aadhaar"),
-            fields.get("pan"),
-            fields.get("dob"),
-            fields.get("address"),
-            fields.get("state"),
-            fields.get("country"),
-            text,
-            confidence
-        ))
+        if data is None:
+            return error_response("No readable text found in image")
 
-        conn.commit()
-        extraction_id = cursor.lastrowid
-        cursor.close()
+        # ---------- SAVE TO DB (write-behind) ----------
+        if row is not None:
+            with metrics.stage("persist"):
+                await persist_extractions([row])
 
         return success_response(
             message="OCR extraction successful",
-            data={
-                "id": extraction_id,
-                "document_type": document_type,
-                "extracted_data": fields,
-                "confidence_score": round(confidence, 4)
-            }
+            data=data
         )
 
+    except UploadTooLargeError as e:
+        return JSONResponse(status_code=413, content=error_response("File too large", error=str(e)))
+
+    except (ExecutorBusyError, PoolTimeoutError) as e:
+        logger.warning(f"Rejected OCR request: {e}")
+        return busy_response(e)
+
     except Exception as e:
         logger.exception("OCR extraction failed")
         return error_response(
             message="OCR extraction failed",
             error=str(e)
         )
+
+
+# =====================================================
+# BATCH EXTRACTION (NDJSON STREAM)
+# =====================================================
+def _batch_items(uploads):
+    count = 0
+    for filename, content_type, data in uploads:
+        try:
+            for item in expand_upload(filename, content_type, data, settings.BATCH_MAX_MEMBER_BYTES,
+                                      settings.BATCH_MAX_EXPANDED_BYTES):
+                count += 1
+                if count > settings.BATCH_MAX_ITEMS:
+                    yield item[0], None, f"Batch limit of {settings.BATCH_MAX_ITEMS} items reached"
+                    return
+                yield item
+        except Exception as e:
+            # one bad upload is one error line, the rest of the batch still runs
+            logger.exception(f"Could not expand batch upload {filename}")
+            count += 1
+            yield filename, None, f"Could not read file: {e}"
+
+
+async def _batch_item_result(index, name, image_bytes, error, backend=None, mode=None):
+    if error is not None:
+        return {"index": index, "filename": name, **error_response(error)}, None
+
+    try:
+        data, row = await run_extraction(name, image_bytes, wait=True, backend=backend, mode=mode)
+    except Exception as e:
+        logger.exception(f"Batch item {name} failed")
+        return {"index": index, "filename": name, **error_response("OCR extraction failed", str(e))}, None
+
+    if data is None:
+        return {"index": index, "filename": name, **error_response("No readable text found in image")}, None
+
+    return {"index": index, "filename": name, **success_response("OCR extraction successful", data)}, row
+
+
+async def _persist_batch_rows(rows):
+    try:
+        await persist_extractions(rows)
+    except Exception:
+        # results were already streamed; don't abort the rest of the batch
+        logger.exception(f"Failed to persist {len(rows)} batch rows")
+
+
+async def _stream_batch(uploads, backend=None, mode=None):
+    loop = asyncio.get_running_loop()
+    items = _batch_items(uploads)
+    pending = set()
+    rows = []
+    total = succeeded = 0
+    exhausted = False
+
+    while pending or not exhausted:
+        # keep a bounded window of items in flight
+        while not exhausted and len(pending) < settings.BATCH_CONCURRENCY:
+            # archive/PDF expansion can be slow, keep it off the event loop
+            item = await loop.run_in_executor(None, next, items, None)
+            if item is None:
+                exhausted = True
+                break
+            pending.add(asyncio.ensure_future(_batch_item_result(total, *item, backend=backend, mode=mode)))
+            total += 1
+
+        if not pending:
+            break
+
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            result, row = task.result()
+            succeeded += result["status"]
+            if row is not None:
+                rows.append(row)
+            yield json.dumps(result, default=str) + "\n"
+
+        if len(rows) >= settings.BATCH_DB_CHUNK:
+            await _persist_batch_rows(rows)
+            rows = []
+
+    if rows:
+        await _persist_batch_rows(rows)
+
+    yield json.dumps({"summary": {"total": total, "succeeded": succeeded, "failed": total - succeeded}}) + "\n"
+
+
+@router.post("/extract/batch")
+async def extract_ocr_batch(
+    files: List[UploadFile] = File(...),
+    backend: Optional[str] = Query(None, description="OCR engine, defaults to OCR_BACKEND"),
+    mode: Optional[str] = Query(None, description="single | cascade | template, defaults to OCR_MODE")
+):
+    """
+    Accepts many images, ZIP archives, multipage TIFFs or PDFs and streams
+    one NDJSON line per image as soon as it finishes (in completion order),
+    followed by a summary line.
+    """
+    invalid = _invalid_engine(backend, mode)
+    if invalid:
+        return invalid
+
+    if len(files) > settings.BATCH_MAX_FILES:
+        return JSONResponse(status_code=413, content=error_response(
+            "Too many files", error=f"At most {settings.BATCH_MAX_FILES} files per batch"
+        ))
+
+    # every file is held in memory until the batch is done, so the
+    # request as a whole has a budget besides the per-file cap
+    too_large = JSONResponse(status_code=413, content=error_response(
+        "Batch too large", error=f"Files exceed {settings.BATCH_MAX_REQUEST_BYTES} bytes together"
+    ))
+    if sum(f.size or 0 for f in files) > settings.BATCH_MAX_REQUEST_BYTES:
+        return too_large
+
+    uploads = []
+    total = 0
+    try:
+        for f in files:
+            data = await read_upload(f, settings.BATCH_MAX_UPLOAD_BYTES)
+            total += len(data)
+            if total > settings.BATCH_MAX_REQUEST_BYTES:  # sizes the client did not declare
+                return too_large
+            uploads.append((f.filename, f.content_type, data))
+    except UploadTooLargeError as e:
+        return JSONResponse(status_code=413, content=error_response("File too large", error=str(e)))
+
+    return StreamingResponse(_stream_batch(uploads, backend, mode), media_type="application/x-ndjson")
+
+
+# =====================================================
+# ASYNC JOBS (processed by `python -m app.worker`)
+# =====================================================
+@router.post("/jobs")
+async def submit_ocr_job(
+    file: UploadFile = File(...),
+    lane: str = Form("interactive"),
+    callback_url: Optional[str] = Form(None)
+):
+    try:
+        if not file.content_type.startswith("image/"):
+            return error_response("Only image files are allowed")
+
+        image_bytes = await read_upload(file, settings.MAX_UPLOAD_BYTES)
+        job_id = await db_executor.run(job_queue.submit, file.filename, image_bytes, lane, callback_url)
+
+        return success_response(
+            message="OCR job queued",
+            data={"job_id": job_id, "status": "queued", "lane": lane}
+        )
+
+    except UploadTooLargeError as e:
+        return JSONResponse(status_code=413, content=error_response("File too large", error=str(e)))
+
+    except ValueError as e:
+        return error_response("Invalid job", error=str(e))
+
+    except ExecutorBusyError as e:
+        return busy_response(e)
+
+    except Exception as e:
+        logger.exception("Job submission failed")
+        return error_response(message="Job submission failed", error=str(e))
+
+
+@router.get("/jobs/{job_id}")
+async def get_ocr_job(job_id: str):
+    job = await db_executor.run(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return success_response(message="Job status", data=job)
+
+
+# =====================================================
+# HISTORY (keyset pagination)
+# =====================================================
+def _history_item(row):
+    return {
+        # rows a pre-uuid schema left without one (until finish_uuid_migration
+        # backfills them) are listed, and looked up, by row id
+        "id": row["uuid"] or str(row["id"]),
+        "filename": row["filename"],
+        "document_type": row["document_type"],
+        "extracted_data": {field: row[field] for field in FIELD_NAMES},
+        "confidence_score": round(row["confidence_score"] or 0.0, 4),
+        "created_at": format_timestamp(row["created_at"]),
+    }
+
+
+@router.get("/history")
+async def get_ocr_history(
+    document_type: Optional[str] = Query(None),
+    created_from: Optional[datetime] = Query(None, description="inclusive"),
+    created_to: Optional[datetime] = Query(None, description="exclusive"),
+    pan: Optional[str] = Query(None),
+    aadhaar: Optional[str] = Query(None),
+    phone: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(settings.HISTORY_DEFAULT_LIMIT, ge=1, le=settings.HISTORY_MAX_LIMIT)
+):
+    try:
+        after = decode_cursor(cursor) if cursor else None
+
+        filters = {
+            "document_type": document_type,
+            "pan": pan.strip().upper() if pan else None,
+            "aadhaar": aadhaar.replace(" ", "") if aadhaar else None,
+            "phone": phone.strip() if phone else None,
+            "created_from": format_timestamp(created_from) if created_from else None,
+            "created_to": format_timestamp(created_to) if created_to else None,
+        }
+
+        rows, has_more = await extraction_repository.list(filters, after, limit)
+
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+        return success_response(
+            message="OCR history",
+            data={"items": [_history_item(row) for row in rows], "next_cursor": next_cursor}
+        )
+
+    except ValueError as e:
+        return error_response("Invalid history query", error=str(e))
+
+    except PoolTimeoutError as e:
+        return busy_response(e)
+
+    except Exception as e:
+        logger.exception("History retrieval failed")
+        return error_response(message="Failed to retrieve history", error=str(e))
+
+
+@router.get("/history/{extraction_id}")
+async def get_ocr_extraction(
+    extraction_id: str,
+    include_text: bool = Query(True, description="raw OCR text and per-line boxes/confidences")
+):
+    try:
+        row, text = await extraction_repository.get(extraction_id, include_text,
+                                                     by_row_id=extraction_id.isdigit())
+    except PoolTimeoutError as e:
+        return busy_response(e)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Extraction not found")
+
+    data = _history_item(row)
+    if include_text:
+        data["raw_text"] = text["text"] if text else None
+        data["lines"] = text["lines"] if text else []
+    return success_response(message="OCR extraction", data=data)
+
+
+# =====================================================
+# FULL-TEXT SEARCH (local FTS5 index)
+# =====================================================
+async def run_search(q, field, document_type, prefix, fuzzy, limit, offset):
+    # the index is a local SQLite file: blocking, so on the db pool
+    hits, expanded = await db_executor.run(
+        search_index.search, q, field, document_type, prefix, fuzzy, limit, offset
+    )
+    rows = await extraction_repository.get_many(uuid for uuid, _, _ in hits)
+
+    # ranked order; an uuid missing from MySQL (rolled back, deleted) is skipped
+    items = [
+        {**_history_item(rows[uuid]), "score": score, "fuzzy_match": not exact}
+        for uuid, score, exact in hits if uuid in rows
+    ]
+    return items, expanded, len(hits) == limit
+
+
+@router.get("/search")
+async def search_ocr(
+    q: str = Query(..., min_length=1, description="words to find; end a word with * for a prefix match"),
+    field: Optional[str] = Query(None, description="name | address | text, defaults to all"),
+    document_type: Optional[str] = Query(None),
+    prefix: bool = Query(False, description="treat the last word as a prefix (search-as-you-type)"),
+    fuzzy: bool = Query(True, description="also match OCR misreads within one edit"),
+    limit: int = Query(settings.SEARCH_DEFAULT_LIMIT, ge=1, le=settings.SEARCH_MAX_LIMIT),
+    offset: int = Query(0, ge=0, le=settings.SEARCH_MAX_OFFSET)
+):
+    if search_index is None:
+        return error_response("Search is disabled", error="Set SEARCH_ENABLED=true")
+
+    try:
+        items, expanded, has_more = await run_search(q, field, document_type, prefix, fuzzy, limit, offset)
+        return success_response(
+            message="OCR search",
+            data={
+                "items": items,
+                "expanded_terms": expanded,
+                "next_offset": offset + limit if has_more else None,
+            }
+        )
+
+    except ValueError as e:
+        return error_response("Invalid search query", error=str(e))
+
+    except (ExecutorBusyError, PoolTimeoutError) as e:
+        return busy_response(e)
+
+    except Exception as e:
+        logger.exception("Search failed")
+        return error_response(message="Search failed", error=str(e))
+
+
+# =====================================================
+# BULK EXPORT (streamed)
+# =====================================================
+# each running export holds a DB connection for its whole duration
+export_slots = asyncio.Semaphore(settings.EXPORT_MAX_CONCURRENT)
+
+
+async def _stream_export(encoder, filters, include_text):
+    loop = asyncio.get_running_loop()
+    sent = 0
+    # a request that slipped past the locked() check waits here for a slot
+    async with export_slots:
+        batches = extraction_repository.stream(filters, include_text, settings.EXPORT_BATCH_SIZE)
+        try:
+            yield encoder.header()
+            async for rows in batches:
+                # encoding a batch (a parquet row group) is CPU work: off the event loop
+                chunk = await loop.run_in_executor(None, encoder.encode, rows)
+                sent += len(rows)
+                if chunk:
+                    yield chunk
+            yield await loop.run_in_executor(None, encoder.finish)
+        except Exception:
+            # the status line is long gone: abort the body so the client sees a truncated transfer
+            logger.exception(f"Export failed after {sent} rows")
+            raise
+        finally:
+            await batches.aclose()
+
+
+@router.get("/export")
+async def export_ocr(
+    format: str = Query("csv", description="csv | ndjson | parquet (needs pyarrow)"),
+    document_type: Optional[str] = Query(None),
+    created_from: Optional[datetime] = Query(None, description="inclusive"),
+    created_to: Optional[datetime] = Query(None, description="exclusive"),
+    include_text: bool = Query(False, description="add the raw OCR text column")
+):
+    columns = EXPORT_COLUMNS + ("raw_text",) if include_text else EXPORT_COLUMNS
+    try:
+        encoder = make_encoder(format, columns, settings.EXPORT_PARQUET_ROW_GROUP)
+    except ValueError as e:
+        return error_response("Invalid export request", error=str(e))
+
+    if export_slots.locked():
+        return busy_response(f"{settings.EXPORT_MAX_CONCURRENT} exports already running")
+
+    filters = {
+        "document_type": document_type,
+        "created_from": format_timestamp(created_from) if created_from else None,
+        "created_to": format_timestamp(created_to) if created_to else None,
+    }
+    filename = f"ocr_extractions_{datetime.now().strftime('%Y%m%d-%H%M%S')}.{encoder.extension}"
+    return StreamingResponse(
+        _stream_export(encoder, filters, include_text),
+        media_type=encoder.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
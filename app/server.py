@@ -4,16 +4,19 @@ from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 import os
 import logging
+import uuid
 from pathlib import Path
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-import mysql.connector
-from mysql.connector import Error
-import re
-import io
-from PIL import Image
-import tempfile
+from app.database import db
+from app.async_database import async_db
+from app.models.ocr_extraction import create_ocr_table, migrate_ocr_table, extraction_row
+from app.models.extraction_repository import extraction_repository
+from app.services.field_extractor import extract_document, classify
+from app.services.executor import ExecutorBusyError, inference_executor, shutdown_executors
+from app.services.ocr_service import ocr_service, run_extract_text
+from app.services.uuid_backfill import start_uuid_backfill
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -27,171 +30,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class MySQLConnection:
-    def __init__(self):
-        self.host = os.environ.get('MYSQL_HOST')
-        self.user = os.environ.get('MYSQL_USER')
-        self.password = os.environ.get('MYSQL_PASSWORD')
-        self.database = os.environ.get('MYSQL_DATABASE')
-        self.connection = None
-        self.init_database()
-    
-    def get_connection(self):
-        try:
-            if self.connection is None or not self.connection.is_connected():
-                self.connection = mysql.connector.connect(
-                    host=self.host,
-                    user=self.user,
-                    password=self.password,
-                    database=self.database
-                )
-            return self.connection
-        except Error as e:
-            logger.error(f"MySQL connection error: {e}")
-            raise HTTPException(status_code=500, detail="Database connection failed")
-    
-    def init_database(self):
-        try:
-            conn = self.get_connection()
+def init_database():
+    try:
+        with db.connection() as conn:
             cursor = conn.cursor()
-            
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS ocr_extractions (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                filename VARCHAR(255) NOT NULL,
-                document_type VARCHAR(50) NOT NULL,
-                name VARCHAR(255),
-                email VARCHAR(255),
-                phone VARCHAR(50),
-                aadhaar VARCHAR(20),
-                pan VARCHAR(20),
-                address TEXT,
-                raw_text TEXT,
-                confidence_score FLOAT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                INDEX idx_document_type (document_type),
-                INDEX idx_created_at (created_at)
-            )
-            """
-            cursor.execute(create_table_query)
+            # same schema as the main app; the repository writes uuid + side-table text
+            create_ocr_table(cursor, db.dialect)
+            migrate_ocr_table(cursor, db.dialect, backfill=False)
             conn.commit()
             cursor.close()
             logger.info("Database initialized successfully")
-        except Error as e:
-            logger.error(f"Database initialization error: {e}")
-
-db = MySQLConnection()
+    except Exception as e:
+        logger.error(f"Database initialization error: {e}")
+    else:
+        start_uuid_backfill(db)
 
 class OCRExtractor:
-    def __init__(self):
-        from paddleocr import PaddleOCR
-        self.ocr = PaddleOCR(use_angle_cls=True, lang='en')
+    # PaddleOCR from the shared backend registry, built on first use
+    backend = 'paddleocr'
     
     def extract_text_from_image(self, image_bytes: bytes) -> tuple:
-        try:
-            image = Image.open(io.BytesIO(image_bytes))
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
-                image.save(tmp_file.name)
-                tmp_path = tmp_file.name
-            
-            result = self.ocr.ocr(tmp_path)
-            
-            os.unlink(tmp_path)
-            
-            if result and result[0]:
-                text_lines = [line[1][0] for line in result[0]]
-                full_text = ' '.join(text_lines)
-                avg_confidence = sum([line[1][1] for line in result[0]]) / len(result[0])
-                return full_text, avg_confidence
-            else:
-                return "", 0.0
-        except Exception as e:
-            logger.error(f"OCR extraction error: {e}")
-            return "", 0.0
+        """
+        Blocking; request handlers go through extract_text_async.
+        Same preprocessing (crop, deskew, grayscale, resize by text size)
+        and result cache as the main service, lines joined with '\n'.
+        """
+        return ocr_service.extract_text(image_bytes, self.backend)
+    
+    async def extract_text_async(self, image_bytes: bytes) -> tuple:
+        # on the bounded inference executor, off the event loop
+        result, _, _ = await inference_executor.run(run_extract_text, image_bytes, self.backend)
+        return result[:2]
     
     def extract_fields(self, text: str) -> Dict[str, Optional[str]]:
-        fields = {
-            'name': None,
-            'email': None,
-            'phone': None,
-            'aadhaar': None,
-            'pan': None,
-            'address': None
-        }
-        
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            fields['email'] = emails[0]
-        
-        phone_patterns = [
-            r'\+?\d{1,3}[-\s]?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}',
-            r'\b\d{10}\b',
-            r'\b\d{3}[-\s]\d{3}[-\s]\d{4}\b'
-        ]
-        for pattern in phone_patterns:
-            phones = re.findall(pattern, text)
-            if phones:
-                fields['phone'] = phones[0]
-                break
-        
-        aadhaar_pattern = r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'
-        aadhaars = re.findall(aadhaar_pattern, text)
-        if aadhaars:
-            fields['aadhaar'] = aadhaars[0].replace('-', '').replace(' ', '')
-        
-        pan_pattern = r'\b[A-Z]{5}\d{4}[A-Z]\b'
-        pans = re.findall(pan_pattern, text)
-        if pans:
-            fields['pan'] = pans[0]
-        
-        name_keywords = ['name', 'Name', 'NAME']
-        lines = text.split('\n')
-        for i, line in enumerate(lines):
-            for keyword in name_keywords:
-                if keyword in line:
-                    name_match = re.search(rf'{keyword}[:\s]+([A-Za-z\s]+)', line)
-                    if name_match:
-                        fields['name'] = name_match.group(1).strip()
-                        break
-            if fields['name']:
-                break
-        
-        if not fields['name']:
-            words = text.split()
-            for i, word in enumerate(words):
-                if word.lower() in ['name', 'name:']:
-                    if i + 1 < len(words):
-                        potential_name = ' '.join(words[i+1:i+4])
-                        if re.match(r'^[A-Z][a-z]+(\s[A-Z][a-z]+)*$', potential_name.strip()):
-                            fields['name'] = potential_name.strip()
-                            break
-        
-        address_keywords = ['address', 'Address', 'ADDRESS']
-        for i, line in enumerate(lines):
-            for keyword in address_keywords:
-                if keyword in line:
-                    address_lines = []
-                    start_idx = i
-                    for j in range(start_idx, min(start_idx + 3, len(lines))):
-                        address_lines.append(lines[j])
-                    fields['address'] = ' '.join(address_lines).strip()
-                    break
-            if fields['address']:
-                break
-        
-        return fields
+        return extract_document(text)[0]
     
     def categorize_document(self, fields: Dict[str, Optional[str]]) -> str:
-        if fields.get('aadhaar') or fields.get('pan'):
+        # this API reports coarse categories on top of the shared classifier
+        document_type = classify(fields, set())
+        if document_type in ('AADHAAR', 'PAN'):
             return 'ID_CARD'
-        elif fields.get('email') and fields.get('phone') and fields.get('name'):
-            if fields.get('address'):
-                return 'BUSINESS_CARD'
-            return 'GENERAL_DOCUMENT'
-        else:
-            return 'GENERAL_DOCUMENT'
+        if document_type == 'BUSINESS_CARD' and fields.get('name') and fields.get('address'):
+            return 'BUSINESS_CARD'
+        return 'GENERAL_DOCUMENT'
 
 ocr_extractor = OCRExtractor()
 
@@ -208,7 +89,13 @@ async def extract_text(file: UploadFile = File(...)):
     try:
         contents = await file.read()
         
-        full_text, confidence = ocr_extractor.extract_text_from_image(contents)
+        try:
+            full_text, confidence = await ocr_extractor.extract_text_async(contents)
+        except ExecutorBusyError as e:
+            raise HTTPException(status_code=429, detail=f"Server busy, please retry: {e}")
+        except Exception as e:
+            logger.error(f"OCR extraction error: {e}")
+            full_text, confidence = "", 0.0
         
         if not full_text:
             raise HTTPException(status_code=400, detail="No text could be extracted from the image")
@@ -216,41 +103,23 @@ async def extract_text(file: UploadFile = File(...)):
         fields = ocr_extractor.extract_fields(full_text)
         document_type = ocr_extractor.categorize_document(fields)
         
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        insert_query = """
-        INSERT INTO ocr_extractions 
-        (filename, document_type, name, email, phone, aadhaar, pan, address, raw_text, confidence_score)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        cursor.execute(insert_query, (
-            file.filename,
-            document_type,
-            fields.get('name'),
-            fields.get('email'),
-            fields.get('phone'),
-            fields.get('aadhaar'),
-            fields.get('pan'),
-            fields.get('address'),
-            full_text,
-            confidence
-        ))
-        
-        conn.commit()
-        extraction_id = cursor.lastrowid
-        cursor.close()
+        extraction_uuid = str(uuid.uuid4())
+        await extraction_repository.insert([
+            extraction_row(extraction_uuid, file.filename, document_type, fields, full_text, confidence)
+        ])
+        saved, _ = await extraction_repository.get(extraction_uuid)
         
         return ExtractionResponse(
-            id=extraction_id,
+            id=saved['id'],
             filename=file.filename,
             document_type=document_type,
             extracted_data=fields,
             confidence_score=round(confidence, 4),
-            created_at=datetime.now()
+            created_at=saved['created_at']
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Extraction error: {e}")
         raise HTTPException(status_code=500, detail=f"Extraction failed: {str(e)}")
@@ -258,20 +127,7 @@ async def extract_text(file: UploadFile = File(...)):
 @api_router.get("/ocr/history", response_model=List[ExtractionResponse])
 async def get_extraction_history():
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        query = """
-        SELECT id, filename, document_type, name, email, phone, aadhaar, pan, 
-               address, confidence_score, created_at
-        FROM ocr_extractions
-        ORDER BY created_at DESC
-        LIMIT 100
-        """
-        
-        cursor.execute(query)
-        results = cursor.fetchall()
-        cursor.close()
+        results, _ = await extraction_repository.list(limit=100)
         
         response = []
         for row in results:
@@ -301,19 +157,7 @@ async def get_extraction_history():
 @api_router.get("/ocr/extract/{extraction_id}", response_model=ExtractionResponse)
 async def get_extraction_by_id(extraction_id: int):
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        query = """
-        SELECT id, filename, document_type, name, email, phone, aadhaar, pan, 
-               address, confidence_score, created_at
-        FROM ocr_extractions
-        WHERE id = %s
-        """
-        
-        cursor.execute(query, (extraction_id,))
-        row = cursor.fetchone()
-        cursor.close()
+        row = await extraction_repository.get_by_row_id(extraction_id)
         
         if not row:
             raise HTTPException(status_code=404, detail="Extraction not found")
@@ -356,8 +200,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def startup_event():
+    init_database()
+
 @app.on_event("shutdown")
 async def shutdown_event():
-    if db.connection and db.connection.is_connected():
-        db.connection.close()
-        logger.info("MySQL connection closed")
\ No newline at end of file
+    await async_db.close_all()
+    shutdown_executors()
+    db.close_all()
+    logger.info("Executors and MySQL connection pools closed")
\ No newline at end of file
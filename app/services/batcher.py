@@ -0,0 +1,188 @@
+import math
+import os
+import queue
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, List
+
+# EasyOCR recognizer defaults (see easyocr.Reader.recognize)
+MODEL_HEIGHT = 64
+
+
+class RecognitionBatcher:
+    """
+    Gathers detected text crops from concurrent requests and runs them
+    through the EasyOCR recognizer as one batch, then hands each caller
+    back its own slice of the results.
+
+    A batch is flushed when it holds `max_batch` crops or when the first
+    queued request has waited `max_wait_ms`. If `latency_budget_ms` is
+    set, the wait is shortened so that wait + recent p95 batch time
+    stays inside the budget.
+
+    The batch thread starts on the first recognize() call, and again in a
+    forked child (the process pool forks after the models are loaded; the
+    parent's thread does not exist there).
+    """
+
+    def __init__(self, reader, max_batch: int = 32, max_wait_ms: float = 10,
+                 latency_budget_ms: float = 0):
+        self.reader = reader
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.latency_budget = latency_budget_ms / 1000
+
+        self._reset()
+        ref = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: ref() and ref()._reset())
+
+    def _reset(self):
+        self._queue = queue.Queue()
+        self._durations = deque(maxlen=100)
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._batches = 0
+        self._crops = 0
+        self._requests = 0
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._loop, name="ocr-batcher", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    # =====================================================
+    # CALLER SIDE
+    # =====================================================
+    def recognize(self, image_list: List) -> List:
+        """Blocks until the crops of one image (get_image_list() entries) have been recognized."""
+        if not image_list:
+            return []
+        self._ensure_thread()
+        future = Future()
+        self._queue.put((image_list, future))
+        return future.result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "requests": self._requests,
+                "crops": self._crops,
+                "avg_batch_crops": round(self._crops / self._batches, 2) if self._batches else 0,
+                "current_wait_ms": round(self._wait_time() * 1000, 2),
+            }
+
+    def close(self):
+        self._queue.put(None)
+
+    # =====================================================
+    # BATCH LOOP
+    # =====================================================
+    def _wait_time(self) -> float:
+        if not self.latency_budget or not self._durations:
+            return self.max_wait
+        ordered = sorted(self._durations)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return max(0.0, min(self.max_wait, self.latency_budget - p95))
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            pending = [first]
+            crops = len(first[0])
+            deadline = time.monotonic() + self._wait_time()
+
+            while crops < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                pending.append(item)
+                crops += len(item[0])
+
+            self._run(pending)
+
+    def _run(self, pending):
+        image_list = [crop for item in pending for crop in item[0]]
+
+        start = time.perf_counter()
+        try:
+            results = self._recognize(image_list)
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._durations.append(elapsed)
+            self._batches += 1
+            self._requests += len(pending)
+            self._crops += len(image_list)
+
+        offset = 0
+        for crops, future in pending:
+            future.set_result(results[offset:offset + len(crops)])
+            offset += len(crops)
+
+    def _recognize(self, image_list: List) -> List:
+        # get_text pads every crop to the width it is given. Sorting the
+        # pooled crops by width and sizing each max_batch chunk to its own
+        # widest crop keeps a short line from being padded out to another
+        # request's longest one.
+        order = sorted(range(len(image_list)), key=lambda i: crop_width(image_list[i]))
+        results = [None] * len(image_list)
+        for start in range(0, len(order), self.max_batch):
+            chunk = order[start:start + self.max_batch]
+            width = padded_width(max(crop_width(image_list[i]) for i in chunk))
+            lines = recognize_lines(self.reader, [image_list[i] for i in chunk], width, self.max_batch)
+            for i, line in zip(chunk, lines):
+                results[i] = line
+        return results
+
+
+def crop_width(item) -> int:
+    """Width of a get_image_list() entry, (box, crop resized to MODEL_HEIGHT)."""
+    return item[1].shape[1]
+
+
+def padded_width(width: int) -> int:
+    # same rounding as the max_width easyocr.utils.get_image_list returns
+    return max(1, math.ceil(width / MODEL_HEIGHT)) * MODEL_HEIGHT
+
+
+def recognize_lines(reader, image_list: List, max_width: int, batch_size: int) -> List:
+    """EasyOCR recognizer over already-cropped line images, results in input order."""
+    from easyocr.recognition import get_text
+
+    ignore_char = "".join(set(reader.character) - set(reader.lang_char))
+
+    return get_text(
+        reader.character,
+        MODEL_HEIGHT,
+        int(max_width),
+        reader.recognizer,
+        reader.converter,
+        image_list,
+        ignore_char=ignore_char,
+        batch_size=batch_size,
+        workers=0,
+        device=reader.device,
+    )
@@ -0,0 +1,57 @@
+import threading
+from typing import Dict, Optional
+
+from app.services.field_extractor import extract_document, missing_fields
+
+
+class CascadeStats:
+    """Escalation rate and per-stage latency of cascade mode (per process)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents = 0
+        self._escalations: Dict[str, int] = {}
+        self._stage_ms: Dict[str, float] = {}
+        self._stage_count: Dict[str, int] = {}
+
+    def record_stage(self, stage: str, seconds: float):
+        with self._lock:
+            self._stage_ms[stage] = self._stage_ms.get(stage, 0.0) + seconds * 1000
+            self._stage_count[stage] = self._stage_count.get(stage, 0) + 1
+
+    def record_document(self, escalation_reason: Optional[str]):
+        with self._lock:
+            self._documents += 1
+            if escalation_reason:
+                self._escalations[escalation_reason] = self._escalations.get(escalation_reason, 0) + 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            escalated = sum(self._escalations.values())
+            return {
+                "documents": self._documents,
+                "escalated": escalated,
+                "escalation_rate": round(escalated / self._documents, 4) if self._documents else 0.0,
+                "escalation_reasons": dict(self._escalations),
+                "stage_avg_ms": {
+                    stage: round(total / self._stage_count[stage], 2)
+                    for stage, total in self._stage_ms.items()
+                },
+            }
+
+
+def escalation_reason(text: str, confidence: float, min_confidence: float,
+                      escalate_generic: bool) -> Optional[str]:
+    """Why the fast engine's result is not good enough, or None to accept it."""
+    if not text.strip():
+        return "no_text"
+    if confidence < min_confidence:
+        return "low_confidence"
+
+    fields, document_type = extract_document(text)
+    missing = missing_fields(fields, document_type)
+    if missing is None:
+        return "generic_document" if escalate_generic else None
+    if missing:
+        return "missing_fields"
+    return None
@@ -0,0 +1,156 @@
+import asyncio
+import gc
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from app.config import settings
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when a bounded executor has no free slot left."""
+
+
+class BoundedExecutor:
+    """
+    Wraps a thread/process pool with a fixed number of slots
+    (running + queued). When every slot is taken new work is
+    rejected instead of piling up behind the pool.
+    """
+
+    def __init__(self, name: str, executor_factory: Callable[[], Executor],
+                 workers: int, queue_size: int):
+        self.name = name
+        self.workers = workers
+        self.max_pending = workers + queue_size
+        self._factory = executor_factory
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._rejected = 0
+
+    def start(self) -> Executor:
+        """Create the underlying pool (otherwise done on first submit)."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._factory()
+            return self._executor
+
+    def submit(self, fn: Callable, *args: Any) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise ExecutorBusyError(f"{self.name} executor is saturated")
+        return self._submit_acquired(fn, *args)
+
+    async def run(self, fn: Callable, *args: Any, wait: bool = False) -> Any:
+        """
+        Run `fn(*args)` on the pool and await the result.
+        With wait=True the caller waits for a free slot instead of
+        getting ExecutorBusyError (used for bulk work).
+        """
+        if wait:
+            while not self._slots.acquire(blocking=False):
+                await asyncio.sleep(0.01)
+            future = self._submit_acquired(fn, *args)
+        else:
+            future = self.submit(fn, *args)
+        return await asyncio.wrap_future(future)
+
+    def _submit_acquired(self, fn: Callable, *args: Any) -> Future:
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self.start().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Future = None):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+
+def make_inference_process_pool(workers: int, torch_threads: int = 0) -> ProcessPoolExecutor:
+    """
+    N-process EasyOCR pool. With fork available the models are loaded
+    once in the parent and inherited copy-on-write, so the weights are
+    not duplicated per worker; otherwise every worker loads its own.
+    """
+    from app.services.ocr_service import init_worker, preload_models
+
+    torch_threads = (
+        torch_threads
+        or settings.OCR_TORCH_THREADS
+        or max(1, (os.cpu_count() or 1) // workers)
+    )
+
+    if settings.OCR_PRELOAD and "fork" in multiprocessing.get_all_start_methods():
+        preload_models()
+        # keep the GC from touching (and un-sharing) the model objects
+        gc.freeze()
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context("spawn")
+
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=init_worker,
+        initargs=(torch_threads,),
+    )
+
+
+def _make_pool(kind: str, workers: int, prefix: str) -> Executor:
+    if kind == "process":
+        return make_inference_process_pool(workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix=prefix)
+
+
+# OCR inference (CPU heavy); pools are created lazily so importing this
+# module never loads models or forks workers
+inference_executor = BoundedExecutor(
+    "inference",
+    lambda: _make_pool(settings.OCR_EXECUTOR, settings.OCR_WORKERS, "ocr"),
+    settings.OCR_WORKERS,
+    settings.OCR_QUEUE_SIZE,
+)
+
+# Blocking MySQL calls
+db_executor = BoundedExecutor(
+    "db",
+    lambda: _make_pool("thread", settings.DB_WORKERS, "db"),
+    settings.DB_WORKERS,
+    settings.DB_QUEUE_SIZE,
+)
+
+
+def executor_stats() -> Dict[str, Dict[str, int]]:
+    return {
+        "inference": inference_executor.stats(),
+        "db": db_executor.stats(),
+    }
+
+
+def shutdown_executors():
+    inference_executor.shutdown()
+    db_executor.shutdown()
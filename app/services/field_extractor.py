@@ -0,0 +1,209 @@
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+Fields = Dict[str, Optional[str]]
+
+FIELD_NAMES = (
+    "name", "email", "phone", "aadhaar", "pan",
+    "dob", "address", "state", "country",
+)
+
+# =====================================================
+# PATTERNS (compiled once at import)
+# =====================================================
+AADHAAR_RE = re.compile(r'\b\d{4}\s?\d{4}\s?\d{4}\b')
+DOB_RE = re.compile(r'(dob|date of birth|birth)[^\d]*(\d{2}[/-]\d{2}[/-]\d{4})')  # lowercased text
+PAN_RE = re.compile(r'\b[A-Z]{5}[0-9]{4}[A-Z]\b')
+EMAIL_RE = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+PHONE_RE = re.compile(r'(\+91[\s-]?)?[6-9]\d{9}')
+DIGIT_RE = re.compile(r'\d')
+
+BLOCKLIST = [
+    "government", "india", "department",
+    "authority", "republic", "unique",
+    "identification", "income", "tax"
+]
+
+ADDRESS_KEYWORDS = ["address", "resident", "s/o", "c/o", "w/o"]
+
+STATES = [
+    "delhi", "maharashtra", "karnataka",
+    "tamil nadu", "uttar pradesh",
+    "gujarat", "rajasthan"
+]
+
+# keyword -> kinds it signals; all are substring matches on lowercased text
+KEYWORDS: Dict[str, set] = {}
+for _kind, _words in (
+    ("blocklist", BLOCKLIST),
+    ("address", ADDRESS_KEYWORDS),
+    ("state", STATES),
+    ("country", ["india"]),
+    ("voter", ["voter"]),
+    ("driving", ["driving", "dl no"]),
+    ("dob", ["dob", "birth"]),
+):
+    for _word in _words:
+        KEYWORDS.setdefault(_word, set()).add(_kind)
+
+# One alternation over every keyword so the lowercased text is scanned
+# once instead of once per keyword list. It sits in a lookahead: the match
+# is zero-width, so keywords sharing letters ("delhindia") are all found,
+# as separate `in` checks would. No keyword is a prefix of another, so one
+# capture per position is enough.
+KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(KEYWORDS, key=len, reverse=True)) + "))"
+)
+
+STATE_RANK = {state: i for i, state in enumerate(STATES)}
+
+
+# =====================================================
+# SINGLE-PASS EXTRACTION
+# =====================================================
+def _scan(text: str):
+    """
+    Tokenize once: non-empty stripped lines with their offsets in the
+    lowercased text, plus every keyword hit as (offset, keyword).
+    """
+    text_lower = text.lower()
+
+    # lower() only changes lengths outside ASCII; otherwise offsets line up
+    raw_lines = text.split("\n")
+    lower_lines = raw_lines if text.isascii() else text_lower.split("\n")
+
+    lines: List[Tuple[str, int]] = []
+    offset = 0
+    for raw, raw_lower in zip(raw_lines, lower_lines):
+        stripped = raw.strip()
+        if stripped:
+            lines.append((stripped, offset))
+        offset += len(raw_lower) + 1
+
+    hits = [(m.start(), m.group(1)) for m in KEYWORD_RE.finditer(text_lower)]
+    return text_lower, lines, hits
+
+
+def extract_document(text: str) -> Tuple[Fields, str]:
+    """Field extraction and document classification from one scan of the text."""
+    text_lower, lines, hits = _scan(text)
+    fields: Fields = dict.fromkeys(FIELD_NAMES)
+
+    # ---------------- AADHAAR (PRIORITY) ----------------
+    match = AADHAAR_RE.search(text)
+    if match:
+        fields["aadhaar"] = match.group().replace(" ", "")
+
+    # ---------------- PAN / EMAIL / PHONE ----------------
+    match = PAN_RE.search(text)
+    if match:
+        fields["pan"] = match.group()
+
+    # plain substring checks are far cheaper than a failed regex scan
+    if "@" in text:
+        match = EMAIL_RE.search(text)
+        if match:
+            fields["email"] = match.group()
+
+    match = PHONE_RE.search(text)
+    if match:
+        fields["phone"] = match.group()
+
+    # ---------------- KEYWORD HITS -> LINES ----------------
+    kinds = set()
+    states = set()
+    blocked_lines = set()
+    address_line = None
+    line_starts = [start for _, start in lines]
+
+    for position, keyword in hits:
+        keyword_kinds = KEYWORDS[keyword]
+        kinds |= keyword_kinds
+        if "state" in keyword_kinds:
+            states.add(keyword)
+
+        line_index = bisect_right(line_starts, position) - 1
+        if line_index < 0:
+            continue
+        if "blocklist" in keyword_kinds:
+            blocked_lines.add(line_index)
+        if "address" in keyword_kinds and (address_line is None or line_index < address_line):
+            address_line = line_index
+
+    # ---------------- DOB (LABEL-AWARE) ----------------
+    # the pattern needs a "dob"/"birth" label, which the keyword scan already found
+    if "dob" in kinds:
+        match = DOB_RE.search(text_lower)
+        if match:
+            fields["dob"] = match.group(2)
+
+    # ---------------- NAME (STRICT & SAFE) ----------------
+    for i, (line, _) in enumerate(lines):
+        if (
+            line.isupper()
+            and 1 < len(line.split()) <= 3
+            and i not in blocked_lines
+            and not DIGIT_RE.search(line)
+        ):
+            fields["name"] = line.title()
+            break
+
+    # ---------------- ADDRESS ----------------
+    if address_line is not None:
+        fields["address"] = " ".join(line for line, _ in lines[address_line:address_line + 3])
+
+    # ---------------- COUNTRY / STATE ----------------
+    if "country" in kinds:
+        fields["country"] = "India"
+    if states:
+        fields["state"] = min(states, key=STATE_RANK.__getitem__).title()
+
+    return fields, classify(fields, kinds)
+
+
+# =====================================================
+# DOCUMENT TYPE CLASSIFICATION (ID-FIRST)
+# =====================================================
+def classify(fields: Fields, kinds: set) -> str:
+    if fields.get("aadhaar"):
+        return "AADHAAR"
+    if fields.get("pan"):
+        return "PAN"
+    if "voter" in kinds:
+        return "VOTER_ID"
+    if "driving" in kinds:
+        return "DRIVING_LICENCE"
+    if fields.get("email") and fields.get("phone"):
+        return "BUSINESS_CARD"
+
+    return "GENERIC_DOCUMENT"
+
+
+def keyword_kinds(text: str) -> set:
+    kinds = set()
+    for match in KEYWORD_RE.finditer(text.lower()):
+        kinds |= KEYWORDS[match.group(1)]
+    return kinds
+
+
+# =====================================================
+# EXPECTED FIELDS PER DOCUMENT TYPE
+# =====================================================
+# What a complete read of each document type should contain;
+# None means there is no expectation (generic documents).
+EXPECTED_FIELDS = {
+    "AADHAAR": ("aadhaar", "name", "dob"),
+    "PAN": ("pan", "name", "dob"),
+    "VOTER_ID": ("name",),
+    "DRIVING_LICENCE": ("name",),
+    "BUSINESS_CARD": ("name", "email", "phone"),
+    "GENERIC_DOCUMENT": None,
+}
+
+
+def missing_fields(fields: Fields, document_type: str) -> Optional[List[str]]:
+    expected = EXPECTED_FIELDS.get(document_type)
+    if expected is None:
+        return None
+    return [field for field in expected if not fields.get(field)]
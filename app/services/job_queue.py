@@ -0,0 +1,206 @@
+import ipaddress
+import json
+import socket
+import sqlite3
+import threading
+import time
+import urllib.parse
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+
+# lower number = served first
+LANES = {
+    "interactive": 0,
+    "bulk": 1,
+}
+
+
+def check_callback_url(url: str) -> str:
+    """
+    Returns `url` if the worker may POST to it, else raises ValueError.
+    Only http(s). With JOBS_CALLBACK_ALLOWED_HOSTS set, only those hosts;
+    otherwise any host whose addresses are all public, so loopback,
+    private ranges and link-local (cloud metadata) are refused.
+    """
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError("callback_url must be an http(s) URL")
+
+    host = parsed.hostname.lower()
+    if settings.JOBS_CALLBACK_ALLOWED_HOSTS:
+        if host not in settings.JOBS_CALLBACK_ALLOWED_HOSTS:
+            raise ValueError(f"callback host '{host}' is not allowed")
+        return url
+
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)}
+    except socket.gaierror:
+        raise ValueError(f"callback host '{host}' does not resolve")
+    for address in addresses:
+        if not ipaddress.ip_address(address.split("%")[0]).is_global:
+            raise ValueError(f"callback host '{host}' is not a public address")
+    return url
+
+
+class JobQueue:
+    """
+    Local, broker-less OCR job queue stored in SQLite.
+
+    The API process submits jobs; one or more `python -m app.worker`
+    processes claim them in priority order (interactive before bulk,
+    then oldest first). A running job holds a lease: the worker renews
+    `heartbeat_at` while it works, and requeue_stale() takes back jobs
+    whose lease ran out, i.e. whose worker died or hung.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS ocr_jobs (
+                id TEXT PRIMARY KEY,
+                lane TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                filename TEXT,
+                image BLOB,
+                callback_url TEXT,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                heartbeat_at REAL,
+                finished_at REAL
+            )
+        """)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(ocr_jobs)")}
+        if "heartbeat_at" not in columns:  # queue files created before leases
+            conn.execute("ALTER TABLE ocr_jobs ADD COLUMN heartbeat_at REAL")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ocr_jobs_claim ON ocr_jobs (status, priority, created_at)"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    # =====================================================
+    # API SIDE
+    # =====================================================
+    def submit(self, filename: str, image_bytes: bytes, lane: str = "interactive",
+               callback_url: Optional[str] = None) -> str:
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane '{lane}', expected one of {sorted(LANES)}")
+        if callback_url:
+            check_callback_url(callback_url)
+
+        job_id = str(uuid.uuid4())
+        self._conn().execute(
+            "INSERT INTO ocr_jobs (id, lane, priority, status, filename, image, callback_url, created_at) "
+            "VALUES (?, ?, ?, 'queued', ?, ?, ?, ?)",
+            (job_id, lane, LANES[lane], filename, image_bytes, callback_url, time.time()),
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT id, lane, status, filename, result, error, attempts, created_at, started_at, finished_at "
+            "FROM ocr_jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def depth(self) -> Dict[str, int]:
+        rows = self._conn().execute(
+            "SELECT lane, COUNT(*) FROM ocr_jobs WHERE status = 'queued' GROUP BY lane"
+        ).fetchall()
+        return {lane: 0 for lane in LANES} | {row[0]: row[1] for row in rows}
+
+    # =====================================================
+    # WORKER SIDE
+    # =====================================================
+    def claim(self) -> Optional[Dict[str, Any]]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id, filename, image, callback_url FROM ocr_jobs "
+                "WHERE status = 'queued' ORDER BY priority, created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            now = time.time()
+            conn.execute(
+                "UPDATE ocr_jobs SET status = 'running', started_at = ?, heartbeat_at = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (now, now, row["id"]),
+            )
+            conn.execute("COMMIT")
+            return dict(row)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def heartbeat(self, job_id: str) -> bool:
+        """Renews a running job's lease; False if it is no longer running."""
+        return self._conn().execute(
+            "UPDATE ocr_jobs SET heartbeat_at = ? WHERE id = ? AND status = 'running'",
+            (time.time(), job_id),
+        ).rowcount == 1
+
+    def complete(self, job_id: str, result: Dict[str, Any]):
+        # the image is no longer needed once the job has a result
+        self._conn().execute(
+            "UPDATE ocr_jobs SET status = 'done', result = ?, image = NULL, finished_at = ? WHERE id = ?",
+            (json.dumps(result, default=str), time.time(), job_id),
+        )
+
+    def fail(self, job_id: str, error: str):
+        self._conn().execute(
+            "UPDATE ocr_jobs SET status = 'failed', error = ?, image = NULL, finished_at = ? WHERE id = ?",
+            (error, time.time(), job_id),
+        )
+
+    def requeue_stale(self, older_than: float, max_attempts: int = 3) -> Tuple[int, int]:
+        """
+        Puts jobs with no heartbeat for `older_than` seconds (their worker
+        died or hung) back in the queue; a job that already ran
+        `max_attempts` times is failed instead, so an image that crashes
+        the worker is not retried forever. Returns (requeued, failed).
+        """
+        now = time.time()
+        # rows claimed before leases existed only have started_at
+        expired = "status = 'running' AND COALESCE(heartbeat_at, started_at) < ?"
+        conn = self._conn()
+        failed = conn.execute(
+            "UPDATE ocr_jobs SET status = 'failed', error = ?, image = NULL, finished_at = ? "
+            f"WHERE {expired} AND attempts >= ?",
+            (f"Worker stopped during each of {max_attempts} attempts", now, now - older_than, max_attempts),
+        ).rowcount
+        requeued = conn.execute(
+            f"UPDATE ocr_jobs SET status = 'queued' WHERE {expired}",
+            (now - older_than,),
+        ).rowcount
+        return requeued, failed
+
+
+job_queue = JobQueue(settings.JOBS_DB_PATH)
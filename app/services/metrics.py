@@ -0,0 +1,249 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.config import settings
+
+# seconds; covers a cache hit (~1 ms) up to a slow full-page deep OCR
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# =====================================================
+# METRIC TYPES (Prometheus text exposition format)
+# =====================================================
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+
+        for labels, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), values):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {values[-1]}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Callback:
+    """Gauge (or counter owned elsewhere) read at scrape time: fn() -> {label values: value}."""
+
+    def __init__(self, name: str, help: str, kind: str, labelnames: Sequence[str],
+                 fn: Callable[[], Dict[LabelValues, float]]):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in sorted(self.fn().items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+# =====================================================
+# STAGE TIMING
+# =====================================================
+class _Stage:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Metrics:
+    """
+    In-process metrics registry with a /metrics renderer.
+
+    Pipeline stages are timed with `with metrics.stage("decode"):`.
+    Inside `collect()` (the inference executor entry point) timings are
+    gathered into a dict instead, which is returned to the API process
+    and observed there, so a process pool reports the same series as
+    threads. When disabled, stage() hands back a shared no-op context
+    manager, every recording call returns immediately, callbacks are not
+    registered and render() is empty.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._local = threading.local()
+        self._metrics: Dict[str, object] = {}
+
+        self.stages = self.add(Histogram(
+            "ocr_stage_duration_seconds", "Time spent per pipeline stage.", ("stage",)
+        ))
+        self.requests = self.add(Histogram(
+            "http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status")
+        ))
+        self.documents = self.add(Counter(
+            "ocr_documents_total", "Extracted documents by type and engine.", ("document_type", "engine")
+        ))
+
+    def add(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def callback(self, name: str, help: str, fn: Callable[[], Dict[LabelValues, float]],
+                 labelnames: Sequence[str] = (), kind: str = "gauge"):
+        if not self.enabled:
+            return
+        self.add(Callback(name, help, kind, labelnames, fn))
+
+    # ---------------- STAGES ----------------
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def record(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        timings = getattr(self._local, "timings", None)
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + seconds
+        else:
+            self.stages.observe(seconds, name)
+
+    def record_ms(self, timings_ms: Dict[str, float]):
+        for name, ms in timings_ms.items():
+            self.record(name, ms / 1000)
+
+    @contextmanager
+    def collect(self) -> Iterator[Dict[str, float]]:
+        """Gather this thread's stage timings into a dict instead of the histograms."""
+        timings: Dict[str, float] = {}
+        if not self.enabled:
+            yield timings
+            return
+        previous = getattr(self._local, "timings", None)
+        self._local.timings = timings
+        try:
+            yield timings
+        finally:
+            self._local.timings = previous
+
+    def observe_stages(self, timings: Dict[str, float]):
+        if not self.enabled:
+            return
+        for name, seconds in timings.items():
+            self.stages.observe(seconds, name)
+
+    # ---------------- EVENTS ----------------
+    def count_document(self, document_type: Optional[str], engine: Optional[str]):
+        if self.enabled:
+            self.documents.inc(document_type or "UNKNOWN", engine or "")
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float):
+        if self.enabled:
+            self.requests.observe(seconds, method, route, str(status))
+
+    async def time_requests(self, request, call_next):
+        """HTTP middleware: `app.middleware("http")(metrics.time_requests)`."""
+        start = time.perf_counter()
+        response = await call_next(request)
+        # route template, not the raw path, to keep label cardinality bounded
+        route = request.scope.get("route")
+        self.observe_request(request.method, route.path if route else "unmatched",
+                             response.status_code, time.perf_counter() - start)
+        return response
+
+    # ---------------- EXPOSITION ----------------
+    def render(self) -> str:
+        if not self.enabled:
+            return ""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics(settings.METRICS_ENABLED)
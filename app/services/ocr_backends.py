@@ -0,0 +1,233 @@
+import threading
+from typing import Dict, List, Optional, Tuple, Type
+
+import numpy as np
+
+from app.config import settings
+from app.services.batcher import RecognitionBatcher, MODEL_HEIGHT, recognize_lines
+from app.services import onnx_runtime
+from app.services.metrics import metrics
+
+# One detected text line: (box as 4 [x, y] points, text, confidence 0..1)
+Region = Tuple[list, str, float]
+
+# Pixel rectangle (x0, y0, x1, y1)
+Box = Tuple[int, int, int, int]
+
+
+class BackendUnavailable(RuntimeError):
+    """The engine's Python package (or binary) is not installed."""
+
+
+class OCRBackend:
+    """
+    Common interface for OCR engines: an RGB image array in, text
+    regions out. Field extraction happens on top of this in
+    field_extractor, identically for every backend.
+    """
+
+    name = ""
+    requires = ""  # install hint for BackendUnavailable
+
+    def read(self, image_np: np.ndarray) -> List[Region]:
+        raise NotImplementedError
+
+    def read_regions(self, image_np: np.ndarray, boxes: List[Box]) -> List[Region]:
+        """
+        Text inside each box, one Region per box in the same order.
+        Default: full read() of every crop; engines with a standalone
+        recognizer override this to skip detection.
+        """
+        regions = []
+        for x0, y0, x1, y1 in boxes:
+            lines = self.read(image_np[y0:y1, x0:x1]) if x1 > x0 and y1 > y0 else []
+            text = " ".join(line[1] for line in lines)
+            confidence = sum(line[2] for line in lines) / len(lines) if lines else 0.0
+            regions.append(([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], text, confidence))
+        return regions
+
+    def stats(self) -> Dict:
+        return {}
+
+
+# =====================================================
+# REGISTRY
+# =====================================================
+BACKENDS: Dict[str, Type[OCRBackend]] = {}
+
+_instances: Dict[str, OCRBackend] = {}
+_instances_lock = threading.Lock()
+
+
+def register_backend(cls: Type[OCRBackend]) -> Type[OCRBackend]:
+    """Class decorator; also the hook for adding engines outside this module."""
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+def get_backend(name: Optional[str] = None) -> OCRBackend:
+    """Backend instance by name (default: OCR_BACKEND), built on first use."""
+    name = name or settings.OCR_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown OCR backend '{name}', available: {sorted(BACKENDS)}")
+
+    with _instances_lock:
+        if name not in _instances:
+            try:
+                _instances[name] = BACKENDS[name]()
+            except ImportError as e:
+                raise BackendUnavailable(
+                    f"OCR backend '{name}' is not installed ({e}); needs {BACKENDS[name].requires}"
+                ) from e
+        return _instances[name]
+
+
+def loaded_backends() -> Dict[str, OCRBackend]:
+    with _instances_lock:
+        return dict(_instances)
+
+
+# =====================================================
+# ENGINES
+# =====================================================
+@register_backend
+class EasyOCRBackend(OCRBackend):
+    name = "easyocr"
+    requires = "pip install easyocr"
+
+    def __init__(self):
+        import easyocr
+
+        # EasyOCR reader (CPU, English). ONNX export needs the fp32 networks,
+        # so torch's own dynamic quantization is only used on the torch runtime.
+        runtime = settings.OCR_RUNTIME
+        self.reader = easyocr.Reader(["en"], gpu=False, quantize=runtime == "torch")
+        self.runtime = onnx_runtime.install(self.reader, runtime)
+
+        # Cross-request recognizer batching; only pays off with the thread
+        # executor, a process worker runs one request at a time
+        self.batcher = None
+        if settings.OCR_BATCH_ENABLED:
+            self.batcher = RecognitionBatcher(
+                self.reader,
+                max_batch=settings.OCR_BATCH_MAX_SIZE,
+                max_wait_ms=settings.OCR_BATCH_MAX_WAIT_MS,
+                latency_budget_ms=settings.OCR_BATCH_LATENCY_BUDGET_MS,
+            )
+
+    def read(self, image_np: np.ndarray) -> List[Region]:
+        # readtext() split in two so detection and recognition are timed apart
+        from easyocr.utils import get_image_list, reformat_input
+
+        img, img_cv_grey = reformat_input(image_np)
+        with metrics.stage("detect"):
+            horizontal_list, free_list = self.reader.detect(img)
+        horizontal_list, free_list = horizontal_list[0], free_list[0]
+
+        if self.batcher is None:
+            with metrics.stage("recognize"):
+                return self.reader.recognize(
+                    img_cv_grey, horizontal_list, free_list,
+                    detail=1, paragraph=False, batch_size=8, reformat=False,
+                )
+
+        # ---- Recognize in a shared batch ----
+        if not horizontal_list and not free_list:
+            return []
+
+        image_list, _ = get_image_list(
+            horizontal_list, free_list, img_cv_grey, model_height=MODEL_HEIGHT
+        )
+        with metrics.stage("recognize"):
+            return self.batcher.recognize(image_list)
+
+    def read_regions(self, image_np: np.ndarray, boxes: List[Box]) -> List[Region]:
+        # recognizer only: the boxes stand in for the detector's output
+        from easyocr.utils import get_image_list, reformat_input
+
+        _, img_cv_grey = reformat_input(image_np)
+        image_list, max_width = get_image_list(
+            [[x0, x1, y0, y1] for x0, y0, x1, y1 in boxes], [], img_cv_grey,
+            model_height=MODEL_HEIGHT, sort_output=False,
+        )
+        if self.batcher is not None:
+            return self.batcher.recognize(image_list)
+        return recognize_lines(self.reader, image_list, max_width, batch_size=8)
+
+    def stats(self) -> Dict:
+        return {
+            "runtime": self.runtime,
+            "batcher": self.batcher.stats() if self.batcher else None,
+        }
+
+
+@register_backend
+class PaddleOCRBackend(OCRBackend):
+    name = "paddleocr"
+    requires = "pip install paddleocr paddlepaddle"
+
+    def __init__(self):
+        from paddleocr import PaddleOCR
+
+        self.ocr = PaddleOCR(use_angle_cls=True, lang="en")
+
+    def read(self, image_np: np.ndarray) -> List[Region]:
+        if image_np.ndim == 3:
+            # PaddleOCR expects OpenCV-style BGR
+            image_np = np.ascontiguousarray(image_np[:, :, ::-1])
+
+        result = self.ocr.ocr(image_np)
+        if not result or not result[0]:
+            return []
+
+        return [(line[0], line[1][0], float(line[1][1])) for line in result[0]]
+
+
+@register_backend
+class TesseractBackend(OCRBackend):
+    name = "tesseract"
+    requires = "pip install pytesseract, plus the tesseract binary (apt install tesseract-ocr)"
+
+    def __init__(self):
+        import pytesseract
+
+        # a missing binary would otherwise only show on the first request
+        try:
+            pytesseract.get_tesseract_version()
+        except pytesseract.TesseractNotFoundError as e:
+            raise BackendUnavailable(f"OCR backend 'tesseract' is not installed ({e}); needs {self.requires}") from e
+        self.pytesseract = pytesseract
+
+    def read(self, image_np: np.ndarray) -> List[Region]:
+        data = self.pytesseract.image_to_data(
+            image_np, output_type=self.pytesseract.Output.DICT
+        )
+
+        # words -> lines, keyed by tesseract's block/paragraph/line numbers
+        lines: Dict[tuple, list] = {}
+        for i, word in enumerate(data["text"]):
+            confidence = float(data["conf"][i])
+            if not word.strip() or confidence < 0:
+                continue
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            lines.setdefault(key, []).append((
+                word,
+                confidence / 100,
+                data["left"][i],
+                data["top"][i],
+                data["left"][i] + data["width"][i],
+                data["top"][i] + data["height"][i],
+            ))
+
+        regions = []
+        for words in lines.values():
+            x0 = min(w[2] for w in words)
+            y0 = min(w[3] for w in words)
+            x1 = max(w[4] for w in words)
+            y1 = max(w[5] for w in words)
+            regions.append((
+                [[x0, y0], [x1, y0], [x1, y1], [x0, y1]],
+                " ".join(w[0] for w in words),
+                sum(w[1] for w in words) / len(words),
+            ))
+        return regions
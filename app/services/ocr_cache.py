@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# (text, confidence, lines)
+OCRResult = Tuple[str, float, List]
+
+
+def image_key(image_np: np.ndarray) -> str:
+    """Content hash of the decoded + normalized image (shape is part of the key)."""
+    image_np = np.ascontiguousarray(image_np)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr((image_np.shape, image_np.dtype.str)).encode())
+    digest.update(memoryview(image_np).cast("B"))
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """
+    Two-tier OCR result cache keyed on image content.
+
+    - memory: LRU with TTL, bounded by `max_entries`
+    - disk (optional): sqlite file shared by all worker processes,
+      bounded by `disk_max_entries`, same TTL
+
+    Each process opens its own connection to the disk tier on first use
+    (sqlite handles must not cross a fork). Disk hits only note the
+    access time; those updates, TTL expiry and the size cap are applied
+    together every `disk_maintain_every` disk puts + hits, so the file may
+    run that many entries over `disk_max_entries` in between.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 86400,
+                 disk_path: Optional[str] = None, disk_max_entries: int = 100000,
+                 disk_maintain_every: int = 256):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self.disk_maintain_every = disk_maintain_every
+
+        self._memory: "OrderedDict[str, Tuple[float, OCRResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_conn = None
+        self._disk_accessed: Dict[str, float] = {}
+        self._disk_ops = 0
+        self._counters = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+        }
+
+        ref = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: ref() and ref()._after_fork())
+
+    def _after_fork(self):
+        # the parent's lock may have been held by another thread, and its
+        # sqlite handle is not ours to use
+        self._lock = threading.Lock()
+        self._disk_conn = None
+        self._disk_accessed = {}
+        self._disk_ops = 0
+
+    @property
+    def _disk(self) -> Optional[sqlite3.Connection]:
+        if self.disk_path and self._disk_conn is None:
+            self._disk_conn = self._open_disk()
+        return self._disk_conn
+
+    def _open_disk(self) -> sqlite3.Connection:
+        disk = sqlite3.connect(self.disk_path, timeout=5, check_same_thread=False)
+        disk.execute("PRAGMA journal_mode=WAL")
+        disk.execute("""
+            CREATE TABLE IF NOT EXISTS ocr_cache (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                lines TEXT,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        columns = {row[1] for row in disk.execute("PRAGMA table_info(ocr_cache)")}
+        if "lines" not in columns:
+            disk.execute("ALTER TABLE ocr_cache ADD COLUMN lines TEXT")
+        disk.execute("CREATE INDEX IF NOT EXISTS idx_ocr_cache_accessed ON ocr_cache (accessed_at)")
+        disk.commit()
+        return disk
+
+    # =====================================================
+    # LOOKUP / STORE
+    # =====================================================
+    def get(self, key: str) -> Optional[OCRResult]:
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return value
+                del self._memory[key]
+                self._counters["evictions"] += 1
+
+            value = self._disk_get(key, now)
+            if value is not None:
+                self._counters["hits"] += 1
+                self._counters["disk_hits"] += 1
+                self._memory_put(key, value, now)
+                return value
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, value: OCRResult):
+        now = time.time()
+        with self._lock:
+            self._memory_put(key, value, now)
+            self._disk_put(key, value, now)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "entries": len(self._memory),
+                "hit_ratio": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+    # =====================================================
+    # TIERS (caller holds self._lock)
+    # =====================================================
+    def _memory_put(self, key: str, value: OCRResult, now: float):
+        self._memory[key] = (now + self.ttl, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _disk_get(self, key: str, now: float) -> Optional[OCRResult]:
+        disk = self._disk
+        if disk is None:
+            return None
+
+        row = disk.execute(
+            "SELECT text, confidence, lines, created_at FROM ocr_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[3] + self.ttl <= now:
+            return None  # expired rows go at the next maintenance
+
+        self._disk_accessed[key] = now
+        self._disk_tick(now)
+        return row[0], row[1], json.loads(row[2]) if row[2] else []
+
+    def _disk_put(self, key: str, value: OCRResult, now: float):
+        disk = self._disk
+        if disk is None:
+            return
+
+        disk.execute(
+            "INSERT OR REPLACE INTO ocr_cache (key, text, confidence, lines, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, value[0], value[1], json.dumps(value[2], separators=(",", ":")), now, now),
+        )
+        disk.commit()
+        self._disk_accessed.pop(key, None)
+        self._disk_tick(now)
+
+    def _disk_tick(self, now: float):
+        self._disk_ops += 1
+        if self._disk_ops >= self.disk_maintain_every:
+            self._disk_maintain(now)
+
+    def _disk_maintain(self, now: float):
+        """Access times of recent hits, then TTL, then LRU above the size cap; one commit."""
+        disk = self._disk
+        self._disk_ops = 0
+        if self._disk_accessed:
+            disk.executemany(
+                "UPDATE ocr_cache SET accessed_at = ? WHERE key = ? AND accessed_at < ?",
+                [(at, key, at) for key, at in self._disk_accessed.items()],
+            )
+            self._disk_accessed = {}
+
+        expired = disk.execute(
+            "DELETE FROM ocr_cache WHERE created_at <= ?", (now - self.ttl,)
+        ).rowcount
+        overflow = disk.execute("""
+            DELETE FROM ocr_cache WHERE key IN (
+                SELECT key FROM ocr_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.disk_max_entries,)).rowcount
+        disk.commit()
+
+        self._counters["disk_evictions"] += expired + overflow
@@ -1,42 +1,224 @@
-import re
-import io
+import time
 import numpy as np
-from PIL import Image
-import easyocr
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.logger import logger
+from app.services.ocr_backends import BackendUnavailable, get_backend, Region
+from app.services.ocr_cache import OCRCache, image_key
+from app.services.cascade import CascadeStats, escalation_reason
+from app.services.metrics import metrics
+from app.services.profiler import profiler
+from app.services.field_extractor import Fields, extract_document, classify, keyword_kinds
+from app.services.templates import TemplateMatcher, load_templates
+from app.utils.image import decode_image
+from app.utils.preprocess import Preprocessor, PreprocessStats
+
+# (fields, document type) when the engine produced them directly (template mode)
+Analysis = Optional[Tuple[Fields, str]]
+
+# One recognized line as stored with the extraction: [box points, text, confidence]
+Line = list
+
+
+def to_line(region: Region) -> Line:
+    """Engine region -> plain JSON/pickle-friendly values (engines return numpy ints)."""
+    box, text, confidence = region
+    return [[[int(x), int(y)] for x, y in box], text, round(float(confidence), 4)]
 
 
 class OCRService:
     def __init__(self):
-        # EasyOCR reader (CPU, English)
-        self.reader = easyocr.Reader(["en"], gpu=False)
+        # Engines are built on first use or by warm_up(), not at import
+        # (see ocr_backends for the registry)
+        self.default_backend = settings.OCR_BACKEND
+
+        # Resolution-by-content, crop, deskew, grayscale before detection
+        self.preprocessor = None
+        self.preprocess_stats = PreprocessStats()
+        if settings.OCR_PREPROCESS:
+            self.preprocessor = Preprocessor(
+                target_char_height=settings.OCR_TARGET_CHAR_HEIGHT,
+                min_width=settings.OCR_MIN_WIDTH,
+                max_width=settings.OCR_MAX_WIDTH,
+                max_skew=settings.OCR_MAX_SKEW_DEGREES,
+                crop=settings.OCR_CROP_TO_DOCUMENT,
+                grayscale=settings.OCR_GRAYSCALE,
+            )
+
+        # ROI templates for known ID cards (template mode)
+        self.templates = TemplateMatcher(
+            load_templates(settings.OCR_TEMPLATES_PATH),
+            thumb_width=settings.OCR_TEMPLATE_THUMB_WIDTH,
+        )
+
+        # Escalation counters for cascade mode
+        self.cascade_stats = CascadeStats()
+        self.cascade_fast_missing = False
+
+        # Content-addressed result cache
+        self.cache = None
+        if settings.OCR_CACHE_ENABLED:
+            self.cache = OCRCache(
+                max_entries=settings.OCR_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.OCR_CACHE_TTL_SECONDS,
+                disk_path=settings.OCR_CACHE_DISK_PATH or None,
+                disk_max_entries=settings.OCR_CACHE_DISK_MAX_ENTRIES,
+            )
+
+    # =====================================================
+    # MODEL LOADING / WARM-UP
+    # =====================================================
+    def startup_backends(self) -> List[str]:
+        if settings.OCR_MODE == "cascade":
+            return [b for b in self.cascade_backends() if b]
+        return [self.default_backend]
+
+    def cascade_backends(self) -> Tuple[Optional[str], str]:
+        """
+        (fast, deep) engines for cascade mode. fast is None when its engine
+        is not installed: every document then goes straight to the deep
+        engine, with one warning instead of a failure per request. A missing
+        deep engine still raises BackendUnavailable.
+        """
+        fast, deep = settings.OCR_CASCADE_FAST_BACKEND, settings.OCR_CASCADE_DEEP_BACKEND
+        if self.cascade_fast_missing:
+            return None, deep
+        try:
+            get_backend(fast)
+        except BackendUnavailable as e:
+            logger.warning(f"{e}; cascade mode runs '{deep}' only")
+            self.cascade_fast_missing = True
+            return None, deep
+        return fast, deep
+
+    def load_models(self):
+        """Build the engines used by default (weights only, no inference)."""
+        for backend in self.startup_backends():
+            get_backend(backend)
+
+    def warm_up(self):
+        """Load the engines and run one dummy inference so buffers are allocated."""
+        from PIL import Image, ImageDraw
+
+        image = Image.new("RGB", (480, 120), "white")
+        ImageDraw.Draw(image).text((20, 50), "WARM UP 0123456789", fill="black")
+        image_np = np.asarray(image)
+
+        for backend in self.startup_backends():
+            self.recognize_image(image_np, backend)
 
     # =====================================================
     # OCR TEXT EXTRACTION
     # =====================================================
-    def extract_text(self, image_bytes: bytes) -> Tuple[str, float]:
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-
-        # ---- Resize for performance & stability ----
-        max_width = 1200
-        if image.width > max_width:
-            ratio = max_width / image.width
-            image = image.resize(
-                (max_width, int(image.height * ratio)),
-                Image.LANCZOS
+    def extract_text(self, image_bytes: bytes, backend: Optional[str] = None) -> Tuple[str, float]:
+        text, confidence = self.extract(image_bytes, backend)[:2]
+        return text, confidence
+
+    def extract(self, image_bytes: bytes, backend: Optional[str] = None,
+                mode: Optional[str] = None) -> Tuple[str, float, List[Line], bool, str, Analysis]:
+        """
+        OCR one upload. Returns (text, confidence, lines, served from cache,
+        engine used, analysis); analysis is None unless the engine already
+        mapped the text to fields. An explicit backend always runs single-engine;
+        otherwise `mode` (default OCR_MODE) chooses between "single",
+        "cascade" and "template".
+        """
+        mode = mode or settings.OCR_MODE
+
+        start = time.perf_counter()
+        image_np = self.load_image(image_bytes)
+        decode_seconds = time.perf_counter() - start
+
+        if not backend and mode == "template":
+            result = self._template(image_np)
+            if result is not None:
+                return result
+            # not a known card layout: full page on the default engine
+
+        if backend or mode != "cascade":
+            backend = backend or self.default_backend
+            return (*self._recognize_cached(image_np, backend), backend, None)
+
+        return (*self._cascade(image_np, decode_seconds), None)
+
+    def _template(self, image_np: np.ndarray) -> Optional[Tuple[str, float, List[Line], bool, str, Analysis]]:
+        """Recognizer on the matching template's field regions only."""
+        backend = settings.OCR_TEMPLATE_BACKEND or self.default_backend
+        with metrics.stage("template"):
+            result = self.templates.read(image_np, get_backend(backend))
+        if result is None:
+            return None
+
+        text, confidence, regions, fields, document_type = result
+        lines = [to_line(region) for region in regions]
+        return text, confidence, lines, False, f"template:{backend}", (fields, document_type)
+
+    def _cascade(self, image_np: np.ndarray, decode_seconds: float) -> Tuple[str, float, List[Line], bool, str]:
+        """Cheap engine first, deep engine only if its result looks incomplete."""
+        self.cascade_stats.record_stage("decode", decode_seconds)
+        fast, deep = self.cascade_backends()
+
+        if fast is None:
+            self.cascade_stats.record_document("fast_backend_unavailable")
+        else:
+            start = time.perf_counter()
+            text, confidence, lines, cached = self._recognize_cached(image_np, fast)
+            reason = escalation_reason(
+                text, confidence,
+                settings.OCR_CASCADE_MIN_CONFIDENCE,
+                settings.OCR_CASCADE_ESCALATE_GENERIC,
             )
+            self.cascade_stats.record_stage(fast, time.perf_counter() - start)
+            self.cascade_stats.record_document(reason)
 
-        image_np = np.array(image)
+            if reason is None:
+                return text, confidence, lines, cached, fast
 
-        results = self.reader.readtext(
-            image_np,
-            detail=1,
-            paragraph=False,
-            batch_size=8
-        )
+        start = time.perf_counter()
+        text, confidence, lines, cached = self._recognize_cached(image_np, deep)
+        self.cascade_stats.record_stage(deep, time.perf_counter() - start)
+        return text, confidence, lines, cached, deep
+
+    def _recognize_cached(self, image_np: np.ndarray, backend: str) -> Tuple[str, float, List[Line], bool]:
+        if self.cache is None:
+            return (*self.recognize_image(image_np, backend), False)
+
+        with metrics.stage("cache_lookup"):
+            key = f"{backend}:{image_key(image_np)}"
+            cached = self.cache.get(key)
+        if cached is not None:
+            return (*cached, True)
+
+        result = self.recognize_image(image_np, backend)
+        self.cache.put(key, result)
+        return (*result, False)
+
+    def load_image(self, image_bytes: bytes) -> np.ndarray:
+        if self.preprocessor is None:
+            with metrics.stage("decode"):
+                image_np = decode_image(image_bytes)
+            profiler.annotate("ocr_image_shape", list(image_np.shape[:2]))
+            return image_np
+
+        start = time.perf_counter()
+        image_np = decode_image(image_bytes, settings.OCR_DECODE_MAX_WIDTH, resize=False)
+        decode_ms = (time.perf_counter() - start) * 1000
+        profiler.annotate("decoded_shape", list(image_np.shape[:2]))
+
+        image_np, report = self.preprocessor.run(image_np)
+        profiler.annotate("ocr_image_shape", list(image_np.shape[:2]))
+        report["timings_ms"] = {"decode": decode_ms, **report["timings_ms"]}
+        self.preprocess_stats.record(report)
+        metrics.record_ms(report["timings_ms"])
+        return image_np
+
+    def recognize_image(self, image_np: np.ndarray,
+                        backend: Optional[str] = None) -> Tuple[str, float, List[Line]]:
+        results = self.read(image_np, backend)
 
         if not results:
-            return "", 0.0
+            return "", 0.0, []
 
         texts = [r[1] for r in results]
         confidences = [r[2] for r in results]
@@ -44,121 +226,65 @@ class OCRService:
         full_text = "\n".join(texts)
         avg_confidence = sum(confidences) / len(confidences)
 
-        return full_text, avg_confidence
+        return full_text, avg_confidence, [to_line(r) for r in results]
 
-    # =====================================================
-    # FIELD EXTRACTION (HIGH ACCURACY – INDIA FOCUSED)
-    # =====================================================
-    def extract_fields(self, text: str) -> Dict[str, Optional[str]]:
-        fields = {
-            "name": None,
-            "email": None,
-            "phone": None,
-            "aadhaar": None,
-            "pan": None,
-            "dob": None,
-            "address": None,
-            "state": None,
-            "country": None
-        }
-
-        lines = [l.strip() for l in text.split("\n") if l.strip()]
-        text_lower = text.lower()
-
-        # ---------------- AADHAAR (PRIORITY) ----------------
-        aadhaar_match = re.search(r'\b\d{4}\s?\d{4}\s?\d{4}\b', text)
-        if aadhaar_match:
-            fields["aadhaar"] = aadhaar_match.group().replace(" ", "")
-
-        # ---------------- DOB (LABEL-AWARE) ----------------
-        dob_match = re.search(
-            r'(dob|date of birth|birth)[^\d]*(\d{2}[/-]\d{2}[/-]\d{4})',
-            text_lower
-        )
-        if dob_match:
-            fields["dob"] = dob_match.group(2)
-
-        # ---------------- PAN ----------------
-        pan_match = re.search(r'\b[A-Z]{5}[0-9]{4}[A-Z]\b', text)
-        if pan_match:
-            fields["pan"] = pan_match.group()
-
-        # ---------------- EMAIL ----------------
-        email_match = re.search(
-            r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}',
-            text
-        )
-        if email_match:
-            fields["email"] = email_match.group()
-
-        # ---------------- PHONE ----------------
-        phone_match = re.search(r'(\+91[\s-]?)?[6-9]\d{9}', text)
-        if phone_match:
-            fields["phone"] = phone_match.group()
-
-        # ---------------- NAME (STRICT & SAFE) ----------------
-        BLOCKLIST = [
-            "government", "india", "department",
-            "authority", "republic", "unique",
-            "identification", "income", "tax"
-        ]
-
-        for line in lines:
-            line_lower = line.lower()
-
-            if (
-                line.isupper()
-                and 1 < len(line.split()) <= 3
-                and not any(b in line_lower for b in BLOCKLIST)
-                and not re.search(r'\d', line)
-            ):
-                fields["name"] = line.title()
-                break
-
-        # ---------------- ADDRESS ----------------
-        for i, line in enumerate(lines):
-            if any(k in line.lower() for k in [
-                "address", "resident", "s/o", "c/o", "w/o"
-            ]):
-                fields["address"] = " ".join(lines[i:i+3])
-                break
-
-        # ---------------- COUNTRY / STATE ----------------
-        if "india" in text_lower:
-            fields["country"] = "India"
-
-        STATES = [
-            "delhi", "maharashtra", "karnataka",
-            "tamil nadu", "uttar pradesh",
-            "gujarat", "rajasthan"
-        ]
-
-        for s in STATES:
-            if s in text_lower:
-                fields["state"] = s.title()
-                break
-
-        return fields
+    def read(self, image_np: np.ndarray, backend: Optional[str] = None) -> List[Region]:
+        engine = get_backend(backend or self.default_backend)
+        with metrics.stage("ocr"):
+            regions = engine.read(image_np)
+        profiler.annotate(f"regions:{engine.name}", len(regions))
+        return regions
 
     # =====================================================
-    # DOCUMENT TYPE CLASSIFICATION (ID-FIRST)
+    # FIELD EXTRACTION + CLASSIFICATION (see field_extractor)
     # =====================================================
-    def categorize_document(self, fields: Dict[str, Optional[str]], text: str) -> str:
-        text_lower = text.lower()
+    def analyze(self, text: str) -> Tuple[Dict[str, Optional[str]], str]:
+        """Fields and document type from a single pass over the text."""
+        return extract_document(text)
 
-        if fields.get("aadhaar"):
-            return "AADHAAR"
-        if fields.get("pan"):
-            return "PAN"
-        if "voter" in text_lower:
-            return "VOTER_ID"
-        if "driving" in text_lower or "dl no" in text_lower:
-            return "DRIVING_LICENCE"
-        if fields.get("email") and fields.get("phone"):
-            return "BUSINESS_CARD"
+    def extract_fields(self, text: str) -> Dict[str, Optional[str]]:
+        return extract_document(text)[0]
 
-        return "GENERIC_DOCUMENT"
+    def categorize_document(self, fields: Dict[str, Optional[str]], text: str) -> str:
+        return classify(fields, keyword_kinds(text))
 
 
 # Singleton instance
 ocr_service = OCRService()
+
+
+# =====================================================
+# EXECUTOR ENTRY POINTS
+# =====================================================
+# Module-level so they pickle cleanly into a process pool;
+# each worker process uses its own singleton.
+def run_extract_text(image_bytes: bytes, backend: Optional[str] = None, mode: Optional[str] = None,
+                     profile: bool = False):
+    """
+    extract() plus its stage timings, which the caller records (see
+    metrics.collect), and with profile=True a sampled stack trace of
+    this call: (result, timings, trace or None).
+    """
+    with metrics.collect() as timings, profiler.trace(profile) as trace:
+        with metrics.stage("inference"):
+            result = ocr_service.extract(image_bytes, backend, mode)
+    return result, timings, trace.export() if trace else None
+
+
+def preload_models() -> "OCRService":
+    """Make sure detector + recognizer weights are resident (call before forking)."""
+    ocr_service.load_models()
+    return ocr_service
+
+
+def run_warm_up() -> bool:
+    ocr_service.warm_up()
+    return True
+
+
+def init_worker(torch_threads: int):
+    """Process pool initializer: split cores between workers instead of oversubscribing."""
+    import torch
+
+    torch.set_num_threads(torch_threads)
+    preload_models()
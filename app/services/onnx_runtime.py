@@ -0,0 +1,171 @@
+import os
+from pathlib import Path
+from typing import Tuple
+
+from app.config import settings
+from app.logger import logger
+
+# OCR_RUNTIME values
+RUNTIMES = ("torch", "onnx", "onnx_int8")
+
+
+# =====================================================
+# SESSIONS
+# =====================================================
+def _session(path: Path):
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    # same core split as torch in the process pool
+    options.intra_op_num_threads = (
+        settings.OCR_ONNX_INTRA_THREADS
+        or settings.OCR_TORCH_THREADS
+        or max(1, (os.cpu_count() or 1) // settings.OCR_WORKERS)
+    )
+    options.inter_op_num_threads = settings.OCR_ONNX_INTER_THREADS
+    return ort.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+
+
+class ONNXDetector:
+    """Stands in for the CRAFT module in easyocr.detection.test_net: net(x) -> (y, feature)."""
+
+    def __init__(self, path: Path):
+        self.session = _session(path)
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, x):
+        import torch
+
+        y, feature = self.session.run(None, {self.input_name: x.numpy()})
+        return torch.from_numpy(y), torch.from_numpy(feature)
+
+    def eval(self):
+        return self
+
+
+class ONNXRecognizer:
+    """Stands in for the CRNN module in easyocr.recognition: model(image, text) -> preds."""
+
+    def __init__(self, path: Path):
+        self.session = _session(path)
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, image, text=None):
+        import torch
+
+        (preds,) = self.session.run(None, {self.input_name: image.numpy()})
+        return torch.from_numpy(preds)
+
+    def eval(self):
+        return self
+
+
+# =====================================================
+# EXPORT + QUANTIZE
+# =====================================================
+def _export_detector(detector, path: Path):
+    import torch
+
+    dummy = torch.randn(1, 3, 640, 640)
+    torch.onnx.export(
+        detector, dummy, str(path),
+        input_names=["image"], output_names=["y", "feature"],
+        dynamic_axes={"image": {0: "batch", 2: "height", 3: "width"},
+                      "y": {0: "batch", 1: "h2", 2: "w2"},
+                      "feature": {0: "batch", 2: "h2", 3: "w2"}},
+        opset_version=17,
+    )
+
+
+def _export_recognizer(recognizer, path: Path):
+    import torch
+
+    class _ImageOnly(torch.nn.Module):
+        # CRNN's forward(input, text) ignores `text`; export the image path only
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, image):
+            return self.model(image, None)
+
+    dummy = torch.randn(2, 1, 64, 256)
+    torch.onnx.export(
+        _ImageOnly(recognizer).eval(), dummy, str(path),
+        input_names=["image"], output_names=["preds"],
+        dynamic_axes={"image": {0: "batch", 3: "width"},
+                      "preds": {0: "batch", 1: "steps"}},
+        opset_version=17,
+    )
+
+
+def _quantize(source: Path, target: Path):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+
+
+def model_paths(runtime: str) -> Tuple[Path, Path]:
+    root = Path(settings.OCR_ONNX_DIR)
+    suffix = ".int8.onnx" if runtime == "onnx_int8" else ".onnx"
+    return root / f"craft{suffix}", root / f"crnn{suffix}"
+
+
+def ensure_models(reader, runtime: str) -> Tuple[Path, Path]:
+    """Export (and quantize) the reader's networks once; later loads reuse the files."""
+    detector_path, recognizer_path = model_paths(runtime)
+    fp32_detector, fp32_recognizer = model_paths("onnx")
+    Path(settings.OCR_ONNX_DIR).mkdir(parents=True, exist_ok=True)
+
+    if not fp32_detector.exists():
+        logger.info(f"Exporting EasyOCR detector to {fp32_detector}")
+        _export_detector(reader.detector, fp32_detector)
+    if not fp32_recognizer.exists():
+        logger.info(f"Exporting EasyOCR recognizer to {fp32_recognizer}")
+        _export_recognizer(reader.recognizer, fp32_recognizer)
+
+    if runtime == "onnx_int8":
+        if not detector_path.exists():
+            _quantize(fp32_detector, detector_path)
+        if not recognizer_path.exists():
+            _quantize(fp32_recognizer, recognizer_path)
+
+    return detector_path, recognizer_path
+
+
+def _quantize_torch(reader):
+    # what easyocr.Reader(quantize=True) would have done on CPU
+    import torch
+
+    for net in (reader.detector, reader.recognizer):
+        try:
+            torch.quantization.quantize_dynamic(net, dtype=torch.qint8, inplace=True)
+        except Exception:
+            pass
+
+
+def install(reader, runtime: str) -> str:
+    """
+    Swap the reader's torch networks for onnxruntime sessions.
+    Returns the runtime actually in use: anything that fails
+    (onnxruntime missing, export error) leaves the reader on torch.
+    """
+    if runtime not in RUNTIMES:
+        raise ValueError(f"Unknown OCR_RUNTIME '{runtime}', expected one of {RUNTIMES}")
+    if runtime == "torch":
+        return "torch"
+
+    try:
+        detector_path, recognizer_path = ensure_models(reader, runtime)
+        detector = ONNXDetector(detector_path)
+        recognizer = ONNXRecognizer(recognizer_path)
+    except Exception:
+        logger.exception(f"OCR runtime '{runtime}' unavailable, falling back to torch")
+        _quantize_torch(reader)
+        return "torch"
+
+    reader.detector = detector
+    reader.recognizer = recognizer
+    return runtime
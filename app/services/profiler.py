@@ -0,0 +1,259 @@
+import heapq
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.config import settings
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = code.co_filename.replace("\\", "/").split("/")
+    return f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+
+
+def folded_stack(frame) -> str:
+    """Root-first 'a;b;c' stack, the collapsed format flamegraph.pl and speedscope read."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class Trace:
+    """Stack samples and annotations of one traced thread."""
+
+    def __init__(self):
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.annotations: Dict[str, Any] = {}
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def export(self) -> Dict[str, Any]:
+        # plain values: may cross a process pool boundary
+        return {
+            "samples": self.samples,
+            "seconds": round(self.seconds, 4),
+            "annotations": self.annotations,
+            "stacks": dict(self.stacks),
+        }
+
+
+class Profile:
+    """One sampled request: the inference traces plus what the router knew about it."""
+
+    def __init__(self, method: str, path: str):
+        self.id = str(uuid.uuid4())
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self.details: Dict[str, Any] = {}
+        self.traces: List[Dict[str, Any]] = []
+        self.duration = 0.0
+        self.status: Optional[int] = None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "duration_ms": round(self.duration * 1000, 2),
+            "started_at": self.started_at,
+            "samples": sum(trace["samples"] for trace in self.traces),
+            **self.details,
+        }
+
+    def folded(self) -> str:
+        stacks: Counter = Counter()
+        for trace in self.traces:
+            stacks.update(trace["stacks"])
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class Profiler:
+    """
+    Opt-in statistical profiler for slow requests.
+
+    A fraction (`sample_rate`) of requests is traced: while their
+    inference runs, one shared daemon thread reads the worker thread's
+    Python stack every `interval` seconds via sys._current_frames() and
+    counts the folded stacks. Nothing is instrumented, so untraced work
+    runs at full speed; with no trace active the sampler thread sleeps.
+    The `keep` slowest traced requests are retained for /admin/profiles.
+    """
+
+    def __init__(self, enabled: bool = False, sample_rate: float = 0.01, interval: float = 0.005,
+                 keep: int = 20):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.keep = keep
+
+        self._lock = threading.Lock()
+        self._active: Dict[int, Trace] = {}
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._local = threading.local()
+        self._request: ContextVar[Optional[Profile]] = ContextVar("profile", default=None)
+
+        # min-heap of (duration, tie-breaker, profile): the fastest kept profile is evicted first
+        self._slowest: List = []
+        self._counter = itertools.count()
+        self._sampled = 0
+
+        ref = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: ref() and ref()._after_fork())
+
+    def _after_fork(self):
+        # the parent's lock may have been held by a tracing thread, and its
+        # traced threads (and the sampler) do not exist in this process
+        self._lock = threading.Lock()
+        self._active = {}
+        self._wake = threading.Event()
+        self._thread = None
+
+    # =====================================================
+    # SAMPLER THREAD
+    # =====================================================
+    def _ensure_thread(self):
+        # not inherited by forked pool workers: start one per process
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._loop, name="profiler", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                active = dict(self._active)
+                if not active:
+                    self._wake.clear()
+                    continue
+
+            frames = sys._current_frames()
+            for thread_id, trace in active.items():
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    trace.stacks[folded_stack(frame)] += 1
+                    trace.samples += 1
+            del frames
+            time.sleep(self.interval)
+
+    @contextmanager
+    def trace(self, enabled: bool = True) -> Iterator[Optional[Trace]]:
+        """Samples the calling thread for the duration of the block; yields None if not enabled."""
+        if not enabled:
+            yield None
+            return
+
+        trace = Trace()
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._ensure_thread()
+            self._active[thread_id] = trace
+            self._wake.set()
+        self._local.trace = trace
+        try:
+            yield trace
+        finally:
+            self._local.trace = None
+            with self._lock:
+                self._active.pop(thread_id, None)
+            trace.seconds = time.perf_counter() - trace.started
+
+    def annotate(self, key: str, value: Any):
+        """Attach a value to the calling thread's trace, if it is being traced."""
+        trace = getattr(self._local, "trace", None)
+        if trace is not None:
+            trace.annotations[key] = value
+
+    # =====================================================
+    # REQUESTS
+    # =====================================================
+    def should_sample(self) -> bool:
+        return self.enabled and random.random() < self.sample_rate
+
+    @contextmanager
+    def request(self, method: str, path: str) -> Iterator[Profile]:
+        profile = Profile(method, path)
+        token = self._request.set(profile)
+        start = time.perf_counter()
+        try:
+            yield profile
+        finally:
+            self._request.reset(token)
+            profile.duration = time.perf_counter() - start
+            self._offer(profile)
+
+    def requested(self) -> bool:
+        """True inside a sampled request: callers should trace the work they hand off."""
+        return self._request.get() is not None
+
+    def attach(self, trace: Optional[Dict[str, Any]] = None, **details):
+        profile = self._request.get()
+        if profile is None:
+            return
+        if trace is not None:
+            profile.traces.append(trace)
+        profile.details.update(details)
+
+    def _offer(self, profile: Profile):
+        with self._lock:
+            self._sampled += 1
+            entry = (profile.duration, next(self._counter), profile)
+            if len(self._slowest) < self.keep:
+                heapq.heappush(self._slowest, entry)
+            elif profile.duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    # =====================================================
+    # ADMIN
+    # =====================================================
+    def profiles(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            kept = [profile for _, _, profile in self._slowest]
+        return [profile.summary() for profile in sorted(kept, key=lambda p: -p.duration)]
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        with self._lock:
+            for _, _, profile in self._slowest:
+                if profile.id == profile_id:
+                    return profile
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._slowest = []
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "sample_rate": self.sample_rate,
+                "sampled_requests": self._sampled,
+                "kept": len(self._slowest),
+                "active_traces": len(self._active),
+            }
+
+
+profiler = Profiler(
+    enabled=settings.PROFILE_ENABLED,
+    sample_rate=settings.PROFILE_SAMPLE_RATE,
+    interval=settings.PROFILE_INTERVAL_MS / 1000,
+    keep=settings.PROFILE_KEEP,
+)
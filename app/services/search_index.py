@@ -0,0 +1,319 @@
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.logger import logger
+from app.services.metrics import metrics
+from app.models.ocr_extraction import split_extraction_row
+
+# (uuid, document_type, name, address, text)
+Document = Tuple[str, Optional[str], Optional[str], Optional[str], Optional[str]]
+
+SEARCH_FIELDS = ("name", "address", "text")
+
+# same split as FTS5's unicode61 tokenizer: runs of letters/digits
+TOKEN = re.compile(r"([^\W_]+)(\*)?")
+
+# characters OCR engines confuse with each other, folded to one form
+# before fuzzy lookups so "RAHUL" also finds "RAHU1" and "RAHUI"
+OCR_CONFUSIONS = str.maketrans({"0": "o", "1": "l", "i": "l", "5": "s", "8": "b", "2": "z", "6": "g"})
+OCR_DIGRAPHS = (("rn", "m"), ("vv", "w"))
+
+FUZZY_MIN_LENGTH = 3
+FUZZY_MAX_LENGTH = 24
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip diacritics, like unicode61 remove_diacritics 2."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokens(text: Optional[str]) -> List[str]:
+    return [match.group(1) for match in TOKEN.finditer(fold(text or ""))]
+
+
+def skeleton(term: str) -> str:
+    term = term.translate(OCR_CONFUSIONS)
+    for digraph, letter in OCR_DIGRAPHS:
+        term = term.replace(digraph, letter)
+    return term
+
+
+def fuzzy_term(term: str) -> bool:
+    # numbers (Aadhaar, phone, PIN) are searched exactly; they would
+    # only bloat the fuzzy vocabulary
+    digits = sum(c.isdigit() for c in term)
+    return FUZZY_MIN_LENGTH <= len(term) <= FUZZY_MAX_LENGTH and digits * 2 <= len(term)
+
+
+def fuzzy_keys(term: str) -> set:
+    """The term's skeleton plus every single-character deletion of it."""
+    base = skeleton(term)
+    keys = {base}
+    if len(base) > FUZZY_MIN_LENGTH:
+        keys.update(base[:i] + base[i + 1:] for i in range(len(base)))
+    return keys
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance with adjacent transpositions, capped at limit + 1."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if previous2 is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+class SearchIndex:
+    """
+    Local full-text index over extracted documents (SQLite FTS5).
+
+    - search_fts: contentless FTS5 table over name / address / raw
+      text, with prefix indexes for search-as-you-type; the text itself
+      stays compressed in MySQL
+    - search_docs: FTS rowid -> extraction uuid and document type
+    - search_terms / search_fuzzy: vocabulary keyed by OCR-folded
+      skeleton and its single deletions, so a query term expands to the
+      indexed terms within one edit after folding (symmetric-delete
+      lookup, no vocabulary scan)
+
+    Rows are added as they are persisted; adding the same uuid twice is
+    a no-op, so `python -m app.rebuild_search_index` can be re-run.
+    """
+
+    def __init__(self, path: str, max_expansions: int = 16):
+        self.path = path
+        self.max_expansions = max_expansions
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "indexed": 0,
+            "duplicates": 0,
+            "failures": 0,
+            "searches": 0,
+            "search_ms_total": 0.0,
+        }
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_docs (
+                rowid INTEGER PRIMARY KEY,
+                uuid TEXT NOT NULL UNIQUE,
+                document_type TEXT
+            )
+        """)
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5("
+            "name, address, text, content='', prefix='2 3', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        # name hits outrank address hits outrank body text hits
+        conn.execute("INSERT INTO search_fts (search_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')")
+        conn.execute("CREATE TABLE IF NOT EXISTS search_terms (term TEXT PRIMARY KEY) WITHOUT ROWID")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_fuzzy (
+                key TEXT NOT NULL,
+                term TEXT NOT NULL,
+                PRIMARY KEY (key, term)
+            ) WITHOUT ROWID
+        """)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    # =====================================================
+    # INDEXING
+    # =====================================================
+    def add(self, documents: Iterable[Document]) -> int:
+        """Indexes documents not seen before, in one transaction; returns how many were new."""
+        conn = self._conn()
+        added = duplicates = 0
+        terms = set()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for extraction_uuid, document_type, name, address, text in documents:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO search_docs (uuid, document_type) VALUES (?, ?)",
+                    (extraction_uuid, document_type)
+                )
+                if cursor.rowcount != 1:
+                    duplicates += 1
+                    continue
+                conn.execute(
+                    "INSERT INTO search_fts (rowid, name, address, text) VALUES (?, ?, ?, ?)",
+                    (cursor.lastrowid, name, address, text)
+                )
+                for value in (name, address, text):
+                    terms.update(term for term in tokens(value) if fuzzy_term(term))
+                added += 1
+
+            self._add_terms(conn, terms)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._stats_lock:
+            self._stats["indexed"] += added
+            self._stats["duplicates"] += duplicates
+        return added
+
+    def _add_terms(self, conn: sqlite3.Connection, terms: set):
+        terms = sorted(terms)
+        known = set()
+        for start in range(0, len(terms), 500):
+            chunk = terms[start:start + 500]
+            known.update(row[0] for row in conn.execute(
+                f"SELECT term FROM search_terms WHERE term IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+
+        new = [term for term in terms if term not in known]
+        conn.executemany("INSERT INTO search_terms (term) VALUES (?)", [(term,) for term in new])
+        conn.executemany(
+            "INSERT OR IGNORE INTO search_fuzzy (key, term) VALUES (?, ?)",
+            [(key, term) for term in new for key in fuzzy_keys(term)]
+        )
+
+    def index_rows(self, rows: Sequence[tuple]):
+        """
+        Indexes freshly inserted extraction_row tuples. Failures are only
+        logged: MySQL is the source of truth and a rebuild catches up.
+        """
+        documents = []
+        for row in rows:
+            values, text, _ = split_extraction_row(row)
+            documents.append((values[0], values[2], values[3], values[9], text))
+        try:
+            with metrics.stage("search_index"):
+                self.add(documents)
+        except Exception:
+            logger.exception(f"Search indexing of {len(documents)} rows failed")
+            with self._stats_lock:
+                self._stats["failures"] += len(documents)
+
+    # =====================================================
+    # QUERIES
+    # =====================================================
+    def expand(self, term: str) -> List[str]:
+        """The term plus indexed terms within one edit of it after OCR folding, closest first."""
+        if not fuzzy_term(term):
+            return [term]
+
+        keys = sorted(fuzzy_keys(term))
+        candidates = {row[0] for row in self._conn().execute(
+            f"SELECT DISTINCT term FROM search_fuzzy WHERE key IN ({', '.join('?' * len(keys))})", keys
+        )}
+        candidates.discard(term)
+
+        base = skeleton(term)
+        scored = []
+        for candidate in candidates:
+            distance = edit_distance(base, skeleton(candidate), 1)
+            if distance <= 1:
+                scored.append((distance, abs(len(candidate) - len(term)), candidate))
+        scored.sort()
+        return [term] + [candidate for _, _, candidate in scored[:self.max_expansions]]
+
+    def match_expression(self, query: str, field: Optional[str] = None, prefix: bool = False,
+                         fuzzy: bool = True) -> Tuple[str, Dict[str, List[str]]]:
+        """
+        FTS5 MATCH expression for a free-text query: every term must
+        match; `term*` (or the last term with prefix=True) is a prefix
+        query, other terms expand to their OCR variants when fuzzy.
+        """
+        if field is not None and field not in SEARCH_FIELDS:
+            raise ValueError(f"Unknown search field '{field}', expected one of {SEARCH_FIELDS}")
+
+        matches = list(TOKEN.finditer(fold(query)))
+        if not matches:
+            raise ValueError("Search query has no searchable terms")
+
+        groups = []
+        expanded = {}
+        for i, match in enumerate(matches):
+            term = match.group(1)
+            if match.group(2) or (prefix and i == len(matches) - 1):
+                groups.append(_quote(term) + "*")
+                continue
+            variants = self.expand(term) if fuzzy else [term]
+            if len(variants) > 1:
+                expanded[term] = variants[1:]
+            groups.append("(" + " OR ".join(_quote(v) for v in variants) + ")")
+
+        expression = " AND ".join(groups)
+        if field is not None:
+            expression = f"{field} : ({expression})"
+        return expression, expanded
+
+    def search(self, query: str, field: Optional[str] = None, document_type: Optional[str] = None,
+               prefix: bool = False, fuzzy: bool = True, limit: int = 20,
+               offset: int = 0) -> Tuple[List[Tuple[str, float, bool]], Dict[str, List[str]]]:
+        """
+        Returns ([(uuid, score, exact)] best first, fuzzy expansions used).
+        Documents matching the query as typed rank above those found only
+        through OCR variants, whose rarer spellings would otherwise win on bm25.
+        """
+        start = time.perf_counter()
+        expression, expanded = self.match_expression(query, field, prefix, fuzzy)
+
+        params: List[Any] = []
+        exact = "1"
+        if expanded:
+            exact = "f.rowid IN (SELECT rowid FROM search_fts WHERE search_fts MATCH ?)"
+            params.append(self.match_expression(query, field, prefix, fuzzy=False)[0])
+
+        sql = (
+            f"SELECT d.uuid, f.rank, {exact} AS exact FROM search_fts f "
+            f"JOIN search_docs d ON d.rowid = f.rowid WHERE f.search_fts MATCH ?"
+        )
+        params.append(expression)
+        if document_type is not None:
+            sql += " AND d.document_type = ?"
+            params.append(document_type)
+        sql += " ORDER BY exact DESC, f.rank LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        hits = [(uuid, round(-rank, 4), bool(is_exact))
+                for uuid, rank, is_exact in self._conn().execute(sql, params)]
+
+        with self._stats_lock:
+            self._stats["searches"] += 1
+            self._stats["search_ms_total"] += (time.perf_counter() - start) * 1000
+        return hits, expanded
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            searches = self._stats["searches"]
+            return {
+                **self._stats,
+                "search_ms_avg": round(self._stats["search_ms_total"] / searches, 2) if searches else 0.0,
+            }
+
+
+search_index = None
+if settings.SEARCH_ENABLED:
+    search_index = SearchIndex(settings.SEARCH_INDEX_PATH, settings.SEARCH_FUZZY_MAX_EXPANSIONS)
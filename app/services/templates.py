@@ -0,0 +1,184 @@
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.services.field_extractor import FIELD_NAMES, Fields
+from app.services.ocr_backends import Box, OCRBackend, Region
+
+BUILTIN_TEMPLATES = Path(__file__).resolve().parent.parent / "data" / "document_templates.json"
+
+# Relative rectangle (x0, y0, x1, y1), fractions of the card's width / height
+RelativeBox = Tuple[float, float, float, float]
+
+
+class TemplateField:
+    def __init__(self, name: str, box: RelativeBox, pattern: Optional[str] = None,
+                 format: Optional[str] = None, required: bool = False):
+        if name not in FIELD_NAMES:
+            raise ValueError(f"Unknown field '{name}', expected one of {FIELD_NAMES}")
+        self.name = name
+        self.box = tuple(box)
+        self.pattern = re.compile(pattern) if pattern else None
+        self.format = format
+        self.required = required
+
+    def value(self, text: str) -> Optional[str]:
+        """ROI text -> field value, None if it does not look like this field."""
+        text = " ".join(text.split())
+        if self.format == "upper":
+            text = text.upper().replace(" ", "")
+        if self.pattern is not None:
+            match = self.pattern.search(text)
+            if not match:
+                return None
+            text = match.group(1) if match.groups() else match.group()
+        if self.format == "digits":
+            text = re.sub(r"\D", "", text)
+        elif self.format == "title":
+            text = text.title()
+        return text or None
+
+
+class DocumentTemplate:
+    """
+    Fixed layout of one ID card type: the aspect ratio and header text
+    used to recognise it, and the regions its fields are printed in.
+    Loaded from JSON (see app/data/document_templates.json).
+    """
+
+    def __init__(self, name: str, document_type: str, aspect_ratio: float,
+                 header: Dict, fields: Dict[str, Dict], aspect_tolerance: float = 0.15):
+        self.name = name
+        self.document_type = document_type
+        self.aspect_ratio = aspect_ratio
+        self.aspect_tolerance = aspect_tolerance
+        self.header_box = tuple(header["box"])
+        self.keywords = [k.lower() for k in header["keywords"]]
+        self.fields = [TemplateField(field, **spec) for field, spec in fields.items()]
+
+    def fits(self, width: int, height: int) -> bool:
+        return abs(width / height - self.aspect_ratio) <= self.aspect_tolerance * self.aspect_ratio
+
+    def header_score(self, text: str) -> int:
+        """Length of the longest keyword found in the header (0 = no match)."""
+        text = " ".join(text.lower().split())
+        return max((len(keyword) for keyword in self.keywords if keyword in text), default=0)
+
+    def map_fields(self, texts: List[str]) -> Optional[Fields]:
+        """ROI texts (in field order) -> fields, None if a required field is unreadable."""
+        fields: Fields = dict.fromkeys(FIELD_NAMES)
+        for field, text in zip(self.fields, texts):
+            fields[field.name] = field.value(text)
+            if field.required and not fields[field.name]:
+                return None
+        return fields
+
+
+def load_templates(extra_path: str = "") -> Dict[str, DocumentTemplate]:
+    """Built-in templates, overridden / extended by a JSON file or a folder of them."""
+    sources = [BUILTIN_TEMPLATES]
+    if extra_path:
+        path = Path(extra_path)
+        sources += sorted(path.glob("*.json")) if path.is_dir() else [path]
+
+    specs: Dict[str, Dict] = {}
+    for source in sources:
+        specs.update(json.loads(source.read_text()))
+
+    return {name: DocumentTemplate(name, **spec) for name, spec in specs.items()}
+
+
+def _pixels(box: RelativeBox, width: int, height: int) -> Box:
+    x0, y0, x1, y1 = box
+    return (
+        max(0, int(x0 * width)), max(0, int(y0 * height)),
+        min(width, max(int(x1 * width), int(x0 * width) + 1)),
+        min(height, max(int(y1 * height), int(y0 * height) + 1)),
+    )
+
+
+# =====================================================
+# MATCHING + ROI READ
+# =====================================================
+class TemplateMatcher:
+    """
+    Template mode: pick a layout from the aspect ratio and the header
+    text read off a thumbnail, then run the recognizer only on that
+    layout's field regions. Anything that does not fit a template is
+    left to full-page OCR by the caller.
+    """
+
+    def __init__(self, templates: Dict[str, DocumentTemplate], thumb_width: int = 480):
+        self.templates = templates
+        self.thumb_width = thumb_width
+        self._lock = threading.Lock()
+        self._matched: Dict[str, int] = {}
+        self._fallbacks: Dict[str, int] = {}
+
+    def classify(self, image_np: np.ndarray, backend: OCRBackend) -> List[DocumentTemplate]:
+        """Templates whose header matches, most specific keyword first."""
+        height, width = image_np.shape[:2]
+        candidates = [t for t in self.templates.values() if t.fits(width, height)]
+        if not candidates:
+            return []
+
+        thumb = image_np
+        if width > self.thumb_width:
+            scale = self.thumb_width / width
+            thumb = cv2.resize(image_np, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        thumb_height, thumb_width = thumb.shape[:2]
+
+        # one recognizer call for every distinct header strip
+        header_boxes = sorted({t.header_box for t in candidates})
+        texts = dict(zip(header_boxes, (
+            region[1] for region in backend.read_regions(
+                thumb, [_pixels(box, thumb_width, thumb_height) for box in header_boxes]
+            )
+        )))
+
+        scored = [(t.header_score(texts[t.header_box]), t) for t in candidates]
+        return [t for score, t in sorted(scored, key=lambda item: -item[0]) if score]
+
+    def read(self, image_np: np.ndarray,
+             backend: OCRBackend) -> Optional[Tuple[str, float, List[Region], Fields, str]]:
+        """(text, confidence, regions, fields, document type) from the ROIs, or None to fall back."""
+        templates = self.classify(image_np, backend)
+        if not templates:
+            self._record(self._fallbacks, "no_template")
+            return None
+
+        # e.g. PAN headers also say "govt of india": a template whose
+        # required field is unreadable hands over to the next candidate
+        height, width = image_np.shape[:2]
+        for template in templates:
+            regions = backend.read_regions(
+                image_np, [_pixels(field.box, width, height) for field in template.fields]
+            )
+            texts = [region[1] for region in regions]
+            fields = template.map_fields(texts)
+            if fields is None:
+                self._record(self._fallbacks, f"{template.name}:required_field")
+                continue
+
+            self._record(self._matched, template.name)
+            confidence = sum(region[2] for region in regions) / len(regions)
+            return "\n".join(texts), confidence, regions, fields, template.document_type
+
+        return None
+
+    def _record(self, counter: Dict[str, int], key: str):
+        with self._lock:
+            counter[key] = counter.get(key, 0) + 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "templates": sorted(self.templates),
+                "matched": dict(self._matched),
+                "fallbacks": dict(self._fallbacks),
+            }
@@ -0,0 +1,28 @@
+import threading
+
+from app.logger import logger
+from app.models.ocr_extraction import finish_uuid_migration
+
+
+def start_uuid_backfill(pool, batch_size: int = 1000) -> threading.Thread:
+    """
+    finish_uuid_migration() on its own pooled connection in a daemon
+    thread, so startup doesn't wait on a full-table update of an upgraded
+    table. Meanwhile rows without a uuid are served by row id. Several
+    workers may run it at once; each row is only filled once.
+    """
+    def run():
+        try:
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+                filled = finish_uuid_migration(cursor, pool.dialect, commit=conn.commit, batch_size=batch_size)
+                conn.commit()
+                cursor.close()
+            if filled:
+                logger.info(f"Backfilled uuid of {filled} extraction rows")
+        except Exception:
+            logger.exception("uuid backfill failed; it is retried on the next start")
+
+    thread = threading.Thread(target=run, name="uuid-backfill", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,58 @@
+import threading
+import time
+from typing import Dict, Optional
+
+from app.config import settings
+from app.logger import logger
+from app.services.executor import inference_executor
+from app.services.ocr_service import run_warm_up
+
+
+class WarmUp:
+    """
+    Loads models and runs a dummy inference on every inference worker in
+    a background thread, so the server accepts connections immediately
+    and /health/ready flips once the first real request will be fast.
+    """
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.seconds: Optional[float] = None
+
+    def start(self):
+        self.started_at = time.monotonic()
+        if not settings.OCR_WARM_UP:
+            self._finish()
+            return
+        threading.Thread(target=self._run, name="ocr-warm-up", daemon=True).start()
+
+    def _run(self):
+        try:
+            # creating the pool forks/spawns the workers (and preloads models)
+            inference_executor.start()
+            futures = [inference_executor.submit(run_warm_up)
+                       for _ in range(inference_executor.workers)]
+            for future in futures:
+                future.result()
+        except Exception as e:
+            logger.exception("OCR warm-up failed")
+            self.error = str(e)
+        else:
+            self._finish()
+
+    def _finish(self):
+        self.seconds = round(time.monotonic() - self.started_at, 3)
+        self.ready.set()
+        logger.info(f"OCR models ready in {self.seconds}s")
+
+    def stats(self) -> Dict:
+        return {
+            "ready": self.ready.is_set(),
+            "error": self.error,
+            "warm_up_seconds": self.seconds,
+        }
+
+
+warm_up = WarmUp()
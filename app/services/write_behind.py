@@ -0,0 +1,319 @@
+import fcntl
+import glob
+import itertools
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from mysql.connector import errors as mysql_errors
+
+from app.config import settings
+from app.database import db, ConnectionPool
+from app.logger import logger
+from app.models.ocr_extraction import insert_extractions
+from app.services.executor import ExecutorBusyError
+from app.services.search_index import search_index
+from app.services.metrics import metrics
+
+_STOP = object()
+
+# Failures caused by the rows themselves (too long, duplicate key, bad
+# value). Anything else, a refused connection or a pool timeout, means
+# the database is unavailable and the rows are spooled for later.
+ROW_ERRORS = (
+    mysql_errors.DataError, mysql_errors.IntegrityError,
+    sqlite3.DataError, sqlite3.IntegrityError, ValueError, TypeError,
+)
+
+
+class ExtractionWriter:
+    """
+    Write-behind queue for ocr_extractions rows.
+
+    Rows are grouped into one multi-row INSERT when `batch_size` rows
+    are pending or `flush_interval` seconds after the first one arrived.
+    If the insert fails because MySQL is unavailable, the batch is
+    appended to a local JSONL spool file and replayed after the next
+    successful flush and on startup. A batch rejected for its data is
+    split in halves until the offending rows are alone; those go to the
+    dead-letter file and the rest is written. `close()` drains
+    everything still queued.
+
+    Worker processes sharing the spool take turns through an flock on
+    `<spool>.lock`. A replay moves the spool to its own
+    `<spool>.<pid>-<n>.replay` file and keeps it flocked until done; one
+    left behind by a crashed process is picked up by the next replay.
+    """
+
+    def __init__(self, pool: ConnectionPool, batch_size: int = 200, flush_interval: float = 0.2,
+                 max_queue: int = 10000, spool_path: Optional[str] = None,
+                 dead_letter_path: Optional[str] = None):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self.dead_letter_path = dead_letter_path
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._spool_lock = threading.Lock()
+        self._replay_ids = itertools.count()
+        self._stats_lock = threading.Lock()
+        self._thread = None
+        self._stats = {
+            "flushed_rows": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "spooled_rows": 0,
+            "replayed_rows": 0,
+            "dropped_rows": 0,
+            "dead_letter_rows": 0,
+        }
+
+    # =====================================================
+    # LIFECYCLE
+    # =====================================================
+    def start(self):
+        if self._thread is not None:
+            return
+        self._replay_spool()
+        self._thread = threading.Thread(target=self._loop, name="extraction-writer", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float = 30):
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # =====================================================
+    # PRODUCERS
+    # =====================================================
+    def submit_many(self, rows: Sequence[tuple]):
+        for i, row in enumerate(rows):
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                remaining = list(rows[i:])
+                if self.spool_path:
+                    self._spool(remaining)
+                    return
+                raise ExecutorBusyError("extraction write queue is full")
+
+    def submit(self, row: tuple):
+        self.submit_many([row])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {**self._stats, "queued": self._queue.qsize()}
+
+    # =====================================================
+    # FLUSH LOOP
+    # =====================================================
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            rows = [first]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+
+            while len(rows) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    row = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if row is _STOP:
+                    stop = True
+                    break
+                rows.append(row)
+
+            if stop:
+                rows.extend(self._drain())
+
+            for start in range(0, len(rows), self.batch_size):
+                self._flush(rows[start:start + self.batch_size])
+
+            if stop:
+                return
+
+    def _drain(self) -> List[tuple]:
+        rows = []
+        while True:
+            try:
+                row = self._queue.get_nowait()
+            except queue.Empty:
+                return rows
+            if row is not _STOP:
+                rows.append(row)
+
+    def _write(self, rows: List[tuple]):
+        with metrics.stage("db_insert"), self.pool.connection() as conn:
+            cursor = conn.cursor()
+            insert_extractions(cursor, rows)
+            conn.commit()
+            cursor.close()
+
+        if search_index is not None:
+            # the rows are committed: a failure here must not spool them again
+            try:
+                search_index.index_rows(rows)
+            except Exception:
+                logger.exception(f"Search indexing of {len(rows)} rows failed, rebuild_search_index catches up")
+
+    def _insert(self, rows: List[tuple]) -> Tuple[int, List[tuple]]:
+        """
+        Writes rows, bisecting a batch that fails on its data so only the
+        bad rows are dead-lettered. Returns (rows written, rows left
+        unwritten because the database is unavailable).
+        """
+        try:
+            self._write(rows)
+            return len(rows), []
+        except ROW_ERRORS as e:
+            if len(rows) == 1:
+                self._dead_letter(rows[0], e)
+                return 0, []
+            logger.warning(f"Insert of {len(rows)} rows rejected ({e}), splitting the batch")
+        except Exception:
+            logger.exception(f"Write-behind insert of {len(rows)} rows failed")
+            return 0, rows
+
+        middle = len(rows) // 2
+        written, unwritten = self._insert(rows[:middle])
+        if unwritten:
+            return written, unwritten + rows[middle:]
+        more, unwritten = self._insert(rows[middle:])
+        return written + more, unwritten
+
+    def _flush(self, rows: List[tuple]):
+        written, unwritten = self._insert(rows)
+
+        with self._stats_lock:
+            self._stats["flushed_rows"] += written
+            self._stats["batches"] += 1
+            if unwritten:
+                self._stats["failed_batches"] += 1
+
+        if unwritten:
+            self._spool(unwritten)
+            return
+        self._replay_spool()
+
+    # =====================================================
+    # SPOOL FILE
+    # =====================================================
+    @contextmanager
+    def _spool_locked(self) -> Iterator[None]:
+        """This process's threads, then other processes using the same spool."""
+        with self._spool_lock, open(self.spool_path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _spool(self, rows: List[tuple]):
+        if not self.spool_path:
+            logger.error(f"Dropping {len(rows)} extraction rows (no spool configured)")
+            with self._stats_lock:
+                self._stats["dropped_rows"] += len(rows)
+            return
+
+        with self._spool_locked():
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+        with self._stats_lock:
+            self._stats["spooled_rows"] += len(rows)
+
+    def _claim_replays(self) -> List[Tuple[str, IO]]:
+        """
+        Replay files this process now owns, each open and flocked until
+        its rows are written: the current spool, moved aside, plus any
+        replay file whose owner died (its lock went with the process).
+        """
+        claimed = []
+        with self._spool_locked():
+            for path in sorted(glob.glob(glob.escape(self.spool_path) + ".*.replay")):
+                f = open(path, encoding="utf-8")
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    f.close()  # another process is replaying it
+                    continue
+                claimed.append((path, f))
+
+            if os.path.exists(self.spool_path) and os.path.getsize(self.spool_path) > 0:
+                path = f"{self.spool_path}.{os.getpid()}-{next(self._replay_ids)}.replay"
+                os.replace(self.spool_path, path)
+                f = open(path, encoding="utf-8")
+                fcntl.flock(f, fcntl.LOCK_EX)
+                claimed.append((path, f))
+        return claimed
+
+    def _replay_spool(self):
+        if not self.spool_path:
+            return
+
+        for path, f in self._claim_replays():
+            try:
+                self._replay_file(path, f)
+            finally:
+                f.close()
+
+    def _replay_file(self, path: str, f: IO):
+        rows = [tuple(json.loads(line)) for line in f if line.strip()]
+
+        for start in range(0, len(rows), self.batch_size):
+            written, unwritten = self._insert(rows[start:start + self.batch_size])
+            with self._stats_lock:
+                self._stats["replayed_rows"] += written
+            if unwritten:
+                logger.warning("Spool replay stopped, keeping rows for later")
+                self._spool(unwritten + rows[start + self.batch_size:])
+                break
+
+        # the rows are written or back in the spool; a crash before this
+        # line replays the file again (already written rows then fail on
+        # their uuid and end up in the dead-letter file)
+        os.remove(path)
+
+    def _dead_letter(self, row: tuple, error: Exception):
+        """A row the database rejects on its own: kept aside, never retried."""
+        logger.error(f"Extraction {row[0]} rejected by the database, dead-lettered: {error}")
+        with self._stats_lock:
+            self._stats["dead_letter_rows"] += 1
+        if not self.dead_letter_path:
+            return
+
+        entry = {"row": row, "error": str(error), "failed_at": time.time()}
+        with self._spool_lock:
+            # one short O_APPEND write per entry, whole lines across processes
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+
+extraction_writer = None
+if settings.WRITE_BEHIND_ENABLED:
+    extraction_writer = ExtractionWriter(
+        db,
+        batch_size=settings.WRITE_BEHIND_BATCH_SIZE,
+        flush_interval=settings.WRITE_BEHIND_FLUSH_MS / 1000,
+        max_queue=settings.WRITE_BEHIND_MAX_QUEUE,
+        spool_path=settings.WRITE_BEHIND_SPOOL_PATH or None,
+        dead_letter_path=settings.WRITE_BEHIND_DEAD_LETTER_PATH or None,
+    )
@@ -0,0 +1,112 @@
+import io
+import zipfile
+from pathlib import PurePosixPath
+from typing import Iterator, Optional, Tuple
+
+from PIL import Image, ImageSequence
+
+# (name, image bytes or None, error or None)
+BatchItem = Tuple[str, Optional[bytes], Optional[str]]
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp", ".gif", ".tif", ".tiff"}
+
+
+def _suffix(name: str) -> str:
+    return PurePosixPath(name or "").suffix.lower()
+
+
+def _is_zip(name: str, content_type: str) -> bool:
+    return _suffix(name) == ".zip" or content_type in ("application/zip", "application/x-zip-compressed")
+
+
+def _is_pdf(name: str, content_type: str) -> bool:
+    return _suffix(name) == ".pdf" or content_type == "application/pdf"
+
+
+def _is_tiff(name: str, content_type: str) -> bool:
+    return _suffix(name) in (".tif", ".tiff") or content_type == "image/tiff"
+
+
+def _png_bytes(image: Image.Image) -> bytes:
+    buf = io.BytesIO()
+    image.convert("RGB").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _tiff_pages(name: str, data: bytes) -> Iterator[BatchItem]:
+    with Image.open(io.BytesIO(data)) as image:
+        if getattr(image, "n_frames", 1) == 1:
+            yield name, data, None
+            return
+        for page, frame in enumerate(ImageSequence.Iterator(image), start=1):
+            yield f"{name}#page={page}", _png_bytes(frame), None
+
+
+def _pdf_pages(name: str, data: bytes, dpi: int = 200) -> Iterator[BatchItem]:
+    try:
+        import fitz  # PyMuPDF, optional
+    except ImportError:
+        yield name, None, "PDF support requires PyMuPDF (pip install pymupdf)"
+        return
+
+    with fitz.open(stream=data, filetype="pdf") as pdf:
+        for page_no, page in enumerate(pdf, start=1):
+            pixmap = page.get_pixmap(dpi=dpi)
+            yield f"{name}#page={page_no}", pixmap.tobytes("png"), None
+
+
+def expand_upload(name: str, content_type: str, data: bytes, max_member_bytes: int,
+                  max_total_bytes: int, max_zip_depth: int = 1) -> Iterator[BatchItem]:
+    """
+    Turn one uploaded file into the images to OCR: ZIP members,
+    multipage TIFF frames, PDF pages or the image itself.
+    Archives nest at most `max_zip_depth` deep and unpack to at most
+    `max_total_bytes`, so a ZIP bomb costs an error line, not the worker.
+    Problems with a single member are yielded as errors, not raised.
+    """
+    yield from _expand(name, content_type or "", data, max_member_bytes, max_zip_depth, [max_total_bytes])
+
+
+def _expand(name: str, content_type: str, data: bytes, max_member_bytes: int,
+            zip_depth: int, budget: list) -> Iterator[BatchItem]:
+    if _is_zip(name, content_type):
+        if zip_depth < 1:
+            yield name, None, "Nested archives are not supported"
+            return
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(data))
+        except Exception as e:  # BadZipFile, or a corrupt central directory
+            yield name, None, f"Invalid ZIP archive: {e}"
+            return
+        with archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                member = f"{name}/{info.filename}"
+                # file_size is the most ZipExtFile will inflate to
+                if info.file_size > max_member_bytes:
+                    yield member, None, "Archive member too large"
+                    continue
+                if info.file_size > budget[0]:
+                    yield member, None, "Archive unpacks to more than the allowed total size"
+                    continue
+                try:
+                    member_data = archive.read(info)
+                except Exception as e:  # bad CRC, encryption, unsupported compression, truncation
+                    yield member, None, f"Could not read archive member: {e}"
+                    continue
+                budget[0] -= len(member_data)
+                yield from _expand(member, "", member_data, max_member_bytes, zip_depth - 1, budget)
+        return
+
+    try:
+        if _is_pdf(name, content_type):
+            yield from _pdf_pages(name, data)
+        elif _is_tiff(name, content_type):
+            yield from _tiff_pages(name, data)
+        elif content_type.startswith("image/") or _suffix(name) in IMAGE_SUFFIXES:
+            yield name, data, None
+        else:
+            yield name, None, "Unsupported file type"
+    except Exception as e:
+        yield name, None, f"Could not read file: {e}"
@@ -0,0 +1,31 @@
+import zlib
+from typing import Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is always available
+    zstandard = None
+
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 6
+
+DEFAULT_CODEC = "zstd" if zstandard is not None else "zlib"
+
+
+def compress(data: bytes, codec: str = DEFAULT_CODEC) -> Tuple[str, bytes]:
+    """Returns (codec, payload); the codec is stored next to the payload."""
+    if codec == "zstd":
+        return codec, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if codec == "zlib":
+        return codec, zlib.compress(data, ZLIB_LEVEL)
+    raise ValueError(f"Unknown codec '{codec}'")
+
+
+def decompress(codec: str, payload: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd payloads")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if codec == "zlib":
+        return zlib.decompress(payload)
+    raise ValueError(f"Unknown codec '{codec}'")
@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import List, Sequence
+
+from app.utils.pagination import format_timestamp
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional; only the parquet format needs it
+    pyarrow = None
+
+
+# Encoders turn batches of row tuples into bytes as they arrive:
+# header() once, encode(rows) per batch (b"" if nothing is ready yet),
+# finish() at the end. Memory is bounded by one batch, or by one row
+# group for parquet, whatever the export size.
+
+class CSVEncoder:
+    media_type = "text/csv"
+    extension = "csv"
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+        self._created_at = self.columns.index("created_at")
+
+    def _write(self, rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+    def header(self) -> bytes:
+        return self._write([self.columns])
+
+    def encode(self, rows: List[tuple]) -> bytes:
+        i = self._created_at
+        return self._write((*row[:i], format_timestamp(row[i]), *row[i + 1:]) for row in rows)
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class NDJSONEncoder:
+    media_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, rows: List[tuple]) -> bytes:
+        # format_timestamp only sees the datetimes json can't encode
+        return "".join(
+            json.dumps(dict(zip(self.columns, row)), default=format_timestamp) + "\n" for row in rows
+        ).encode()
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _Drain:
+    """Write-only file for ParquetWriter; the written bytes are taken out as they arrive."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+class ParquetEncoder:
+    media_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+
+    def __init__(self, columns: Sequence[str], row_group_size: int = 100000):
+        self.columns = list(columns)
+        self.row_group_size = row_group_size
+        self.schema = pyarrow.schema([(column, self._type(column)) for column in self.columns])
+        self._sink = _Drain()
+        self._writer = pyarrow.parquet.ParquetWriter(self._sink, self.schema, compression="zstd")
+        # converted to columnar arrow batches on arrival: far smaller than the tuples
+        self._pending = []
+        self._pending_rows = 0
+
+    @staticmethod
+    def _type(column):
+        if column == "confidence_score":
+            return pyarrow.float64()
+        if column == "created_at":
+            return pyarrow.timestamp("s")
+        return pyarrow.string()
+
+    def header(self) -> bytes:
+        return self._sink.drain()
+
+    def encode(self, rows: List[tuple]) -> bytes:
+        arrays = []
+        for field, values in zip(self.schema, zip(*rows)):
+            if field.name == "created_at":
+                # SQLite hands back the stored string
+                values = [datetime.fromisoformat(v) if isinstance(v, str) else v for v in values]
+            arrays.append(pyarrow.array(values, type=field.type))
+        self._pending.append(pyarrow.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self._pending_rows += len(rows)
+
+        if self._pending_rows < self.row_group_size:
+            return b""
+        return self._flush()
+
+    def _flush(self) -> bytes:
+        if self._pending:
+            table = pyarrow.Table.from_batches(self._pending, schema=self.schema)
+            self._writer.write_table(table, row_group_size=len(table))
+            self._pending, self._pending_rows = [], 0
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        last_group = self._flush()
+        self._writer.close()  # footer
+        return last_group + self._sink.drain()
+
+
+ENCODERS = {"csv": CSVEncoder, "ndjson": NDJSONEncoder, "parquet": ParquetEncoder}
+
+
+def make_encoder(format: str, columns: Sequence[str], row_group_size: int = 100000):
+    if format not in ENCODERS:
+        raise ValueError(f"Unknown export format '{format}', available: {list(ENCODERS)}")
+    if format == "parquet":
+        if pyarrow is None:
+            raise ValueError("Parquet export needs pyarrow installed")
+        return ParquetEncoder(columns, row_group_size)
+    return ENCODERS[format](columns)
@@ -0,0 +1,37 @@
+import io
+
+import numpy as np
+from PIL import Image
+
+MAX_WIDTH = 1200
+
+
+def decode_image(image_bytes: bytes, max_width: int = MAX_WIDTH,
+                 resize: bool = True) -> np.ndarray:
+    """
+    Decode an upload to an RGB array no wider than `max_width`.
+
+    JPEGs are decoded by libjpeg directly at 1/2, 1/4 or 1/8 scale
+    (never below the target), so a 12MP photo is never materialized at
+    full size. The returned array is a read-only view over the decoded
+    buffer rather than a further copy. With resize=False only that
+    decode-time scaling is applied and the caller picks the final size.
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+
+    if image.width > max_width:
+        target = (max_width, max(1, int(image.height * max_width / image.width)))
+        image.draft("RGB", target)
+
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    # ---- Resize for performance & stability ----
+    if resize and image.width > max_width:
+        ratio = max_width / image.width
+        image = image.resize(
+            (max_width, int(image.height * ratio)),
+            Image.LANCZOS
+        )
+
+    return np.asarray(image)
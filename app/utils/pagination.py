@@ -0,0 +1,26 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+
+def format_timestamp(value: Any) -> str:
+    # MySQL hands back datetimes, SQLite the stored string
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value)
+
+
+def encode_cursor(created_at: Any, row_id: int) -> str:
+    """Opaque page token for the (created_at, id) of the last row served."""
+    raw = json.dumps([format_timestamp(created_at), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_at, row_id = json.loads(raw)
+        return str(created_at), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
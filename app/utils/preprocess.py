@@ -0,0 +1,206 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Layout analysis runs on a grey copy this wide; it only needs to see
+# characters and lines, not read them.
+ANALYSIS_WIDTH = 800
+
+
+# =====================================================
+# ANALYSIS (on the small copy)
+# =====================================================
+def _binarize(gray_small: np.ndarray) -> np.ndarray:
+    # ink = 255; a local threshold so flat backgrounds around the card stay blank
+    return cv2.adaptiveThreshold(gray_small, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+                                 cv2.THRESH_BINARY_INV, 25, 15)
+
+
+def document_box(gray_small: np.ndarray, min_area: float = 0.1,
+                 max_area: float = 0.95) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Bounding box (x, y, w, h) of the largest four-cornered edge contour,
+    i.e. a card or sheet photographed on a background; None otherwise.
+    """
+    edges = cv2.Canny(cv2.GaussianBlur(gray_small, (5, 5), 0), 50, 150)
+    edges = cv2.dilate(edges, np.ones((5, 5), np.uint8))
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    image_area = gray_small.shape[0] * gray_small.shape[1]
+    for contour in sorted(contours, key=cv2.contourArea, reverse=True)[:5]:
+        corners = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+        if len(corners) != 4:
+            continue
+        x, y, w, h = cv2.boundingRect(corners)
+        if min_area * image_area <= w * h <= max_area * image_area:
+            return x, y, w, h
+    return None
+
+
+def char_height(binary: np.ndarray, min_components: int = 10) -> Optional[float]:
+    """Median height of character-like connected components, None if too few."""
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    if count <= 1:
+        return None
+
+    stats = stats[1:]  # drop background
+    heights = stats[:, cv2.CC_STAT_HEIGHT]
+    widths = stats[:, cv2.CC_STAT_WIDTH]
+    fill = stats[:, cv2.CC_STAT_AREA] / np.maximum(heights * widths, 1)
+
+    glyphs = (
+        (heights >= 4)
+        & (heights <= binary.shape[0] * 0.15)
+        & (widths <= heights * 3)
+        & (fill > 0.1) & (fill < 0.95)
+    )
+    if glyphs.sum() < min_components:
+        return None
+    return float(np.median(heights[glyphs]))
+
+
+def skew_angle(binary: np.ndarray) -> float:
+    """Median angle (degrees, counter-clockwise) of text-line blobs; 0 if none are found."""
+    lines = cv2.dilate(binary, cv2.getStructuringElement(cv2.MORPH_RECT, (15, 3)))
+    contours, _ = cv2.findContours(lines, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+
+    angles = []
+    for contour in contours:
+        (_, _), (w, h), angle = cv2.minAreaRect(contour)
+        # measure along the long side, folded into (-45, 45]
+        if w < h:
+            w, h = h, w
+            angle -= 90
+        while angle <= -45:
+            angle += 90
+        while angle > 45:
+            angle -= 90
+        if w >= 20 and w >= 3 * h:
+            angles.append(angle)
+
+    if len(angles) < 3:
+        return 0.0
+    # minAreaRect works in image coordinates (y down)
+    return -float(np.median(angles))
+
+
+# =====================================================
+# PIPELINE
+# =====================================================
+class Preprocessor:
+    """
+    Grayscale -> crop to document -> resolution by text size -> deskew.
+    The target width is the one that brings the median character to
+    `target_char_height` pixels, clamped to [min_width, max_width] and
+    never above the decoded width, so sparse ID cards shrink and dense
+    pages keep their detail.
+    """
+
+    def __init__(self, target_char_height: int = 16, min_width: int = 640,
+                 max_width: int = 2000, fallback_width: int = 1200,
+                 max_skew: float = 15, crop: bool = True, grayscale: bool = True):
+        self.target_char_height = target_char_height
+        self.min_width = min_width
+        self.max_width = max_width
+        self.fallback_width = fallback_width
+        self.max_skew = max_skew
+        self.crop = crop
+        self.grayscale = grayscale
+
+    def run(self, image_np: np.ndarray) -> Tuple[np.ndarray, Dict]:
+        """Returns the image for the OCR engine and a report with per-stage timings (ms)."""
+        timings: Dict[str, float] = {}
+        report = {"timings_ms": timings, "input_shape": image_np.shape[:2]}
+
+        # ---------------- GRAYSCALE ----------------
+        start = time.perf_counter()
+        gray = cv2.cvtColor(image_np, cv2.COLOR_RGB2GRAY) if image_np.ndim == 3 else image_np
+        ratio = min(1.0, ANALYSIS_WIDTH / gray.shape[1])
+        small = cv2.resize(gray, None, fx=ratio, fy=ratio, interpolation=cv2.INTER_AREA) if ratio < 1 else gray
+        timings["grayscale"] = (time.perf_counter() - start) * 1000
+
+        # ---------------- CROP TO DOCUMENT ----------------
+        start = time.perf_counter()
+        box = document_box(small) if self.crop else None
+        if box is not None:
+            x, y, w, h = box
+            small = small[y:y + h, x:x + w]
+            x0, y0 = int(x / ratio), int(y / ratio)
+            gray = gray[y0:y0 + int(h / ratio), x0:x0 + int(w / ratio)]
+            if image_np.ndim == 3:
+                image_np = image_np[y0:y0 + int(h / ratio), x0:x0 + int(w / ratio)]
+        report["cropped"] = box is not None
+        timings["crop"] = (time.perf_counter() - start) * 1000
+
+        # ---------------- RESOLUTION BY TEXT SIZE ----------------
+        start = time.perf_counter()
+        binary = _binarize(small)
+        height = char_height(binary)
+        source = gray if self.grayscale else image_np
+        width = source.shape[1]
+
+        if height is None:
+            target_width = min(width, self.fallback_width)
+        else:
+            # character height at decoded resolution
+            height /= ratio
+            report["char_height"] = round(height, 1)
+            target_width = width * self.target_char_height / height
+            target_width = min(width, max(self.min_width, min(self.max_width, target_width)))
+
+        scale = target_width / width
+        if scale < 1:
+            source = cv2.resize(source, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        report["scale"] = round(scale, 3)
+        timings["resize"] = (time.perf_counter() - start) * 1000
+
+        # ---------------- DESKEW ----------------
+        start = time.perf_counter()
+        angle = skew_angle(binary)
+        if 0.5 <= abs(angle) <= self.max_skew:
+            h, w = source.shape[:2]
+            matrix = cv2.getRotationMatrix2D((w / 2, h / 2), -angle, 1.0)
+            source = cv2.warpAffine(source, matrix, (w, h), flags=cv2.INTER_LINEAR,
+                                    borderMode=cv2.BORDER_REPLICATE)
+            report["deskew_degrees"] = round(angle, 2)
+        timings["deskew"] = (time.perf_counter() - start) * 1000
+
+        report["output_shape"] = source.shape[:2]
+        return np.ascontiguousarray(source), report
+
+
+class PreprocessStats:
+    """Average stage cost and how much the detector input shrank (per process)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._images = 0
+        self._stage_ms: Dict[str, float] = {}
+        self._input_pixels = 0
+        self._output_pixels = 0
+        self._cropped = 0
+        self._deskewed = 0
+
+    def record(self, report: Dict):
+        with self._lock:
+            self._images += 1
+            for stage, ms in report["timings_ms"].items():
+                self._stage_ms[stage] = self._stage_ms.get(stage, 0.0) + ms
+            self._input_pixels += report["input_shape"][0] * report["input_shape"][1]
+            self._output_pixels += report["output_shape"][0] * report["output_shape"][1]
+            self._cropped += report["cropped"]
+            self._deskewed += "deskew_degrees" in report
+
+    def stats(self) -> Dict:
+        with self._lock:
+            images = self._images or 1
+            return {
+                "images": self._images,
+                "stage_avg_ms": {stage: round(total / images, 2) for stage, total in self._stage_ms.items()},
+                "pixel_ratio": round(self._output_pixels / self._input_pixels, 4) if self._input_pixels else None,
+                "cropped": self._cropped,
+                "deskewed": self._deskewed,
+            }
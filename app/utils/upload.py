@@ -0,0 +1,97 @@
+from typing import Dict, Optional
+
+from fastapi import UploadFile
+from fastapi.responses import JSONResponse
+from starlette.exceptions import HTTPException
+
+from app.utils.response import error_response
+
+CHUNK_SIZE = 1024 * 1024
+
+# multipart boundaries, part headers and small form fields on top of the file bytes
+FORM_OVERHEAD_BYTES = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """The upload exceeded the configured size limit."""
+
+
+class RequestTooLargeError(HTTPException):
+    """
+    Raised from BodySizeLimit's receive(). An HTTPException, so FastAPI's
+    form parsing passes it on instead of turning it into a 400.
+    """
+
+    def __init__(self, max_bytes: int):
+        super().__init__(status_code=413, detail=f"Request body exceeds {max_bytes} bytes")
+
+
+def request_too_large_response(detail: str) -> JSONResponse:
+    return JSONResponse(status_code=413, content=error_response("Request too large", error=detail))
+
+
+class BodySizeLimit:
+    """
+    ASGI middleware capping request bodies while they arrive, before
+    Starlette spools a multipart form to disk: a declared Content-Length
+    over the limit is refused outright, other bodies are counted chunk
+    by chunk. `limits` maps a path to its own cap, else `max_bytes`.
+    """
+
+    def __init__(self, app, max_bytes: int, limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.limits = limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        max_bytes = self.limits.get(scope["path"], self.max_bytes)
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > max_bytes:
+                response = request_too_large_response(f"Request body exceeds {max_bytes} bytes")
+                return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise RequestTooLargeError(max_bytes)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def install_body_size_limit(app, max_bytes: int, limits: Optional[Dict[str, int]] = None):
+    app.add_middleware(BodySizeLimit, max_bytes=max_bytes, limits=limits)
+    app.add_exception_handler(RequestTooLargeError, lambda request, e: request_too_large_response(e.detail))
+
+
+async def read_upload(file: UploadFile, max_bytes: int) -> bytearray:
+    """
+    Read an upload in chunks into one buffer, sized up front when the
+    size is known, stopping as soon as it passes `max_bytes`.
+    """
+    size = getattr(file, "size", None)
+    if size is not None and size > max_bytes:
+        raise UploadTooLargeError(f"File exceeds {max_bytes} bytes")
+
+    buffer = bytearray(size or 0)
+    filled = 0
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        end = filled + len(chunk)
+        if end > max_bytes:
+            raise UploadTooLargeError(f"File exceeds {max_bytes} bytes")
+        buffer[filled:end] = chunk  # grows the buffer if the declared size was short
+        filled = end
+
+    del buffer[filled:]
+    return buffer
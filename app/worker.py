@@ -0,0 +1,135 @@
+"""
+OCR job worker.
+
+    python -m app.worker
+
+Consumes jobs submitted through POST /api/ocr/jobs from the local
+SQLite queue, stores the extraction in MySQL and POSTs the result to
+the job's callback URL if one was given. Run several of these to scale.
+"""
+import json
+import threading
+import time
+import urllib.request
+import uuid
+from contextlib import contextmanager
+
+from app.config import settings
+from app.database import db
+from app.logger import logger
+from app.models.ocr_extraction import extraction_row, insert_extractions
+from app.services.job_queue import check_callback_url, job_queue
+from app.services.ocr_service import ocr_service
+from app.services.search_index import search_index
+
+
+def process_job(job) -> dict:
+    text, confidence, lines = ocr_service.extract(job["image"])[:3]
+    if not text.strip():
+        raise ValueError("No readable text found in image")
+
+    fields, document_type = ocr_service.analyze(text)
+
+    extraction_id = str(uuid.uuid4())
+    row = extraction_row(extraction_id, job["filename"], document_type, fields, text, confidence, lines)
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        insert_extractions(cursor, [row])
+        conn.commit()
+        cursor.close()
+
+    if search_index is not None:
+        search_index.index_rows([row])
+
+    return {
+        "id": extraction_id,
+        "document_type": document_type,
+        "extracted_data": fields,
+        "confidence_score": round(confidence, 4)
+    }
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None  # a redirect would skip check_callback_url; 3xx is an error
+
+
+_callback_opener = urllib.request.build_opener(_NoRedirect)
+
+
+def send_callback(url: str, payload: dict):
+    # checked again: the host may resolve elsewhere than at submit time
+    check_callback_url(url)
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload, default=str).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with _callback_opener.open(request, timeout=settings.JOBS_CALLBACK_TIMEOUT) as response:
+        response.read()
+
+
+@contextmanager
+def heartbeat(job_id: str, interval: float):
+    """
+    Renews the job's lease every `interval` seconds while the block runs,
+    so a long OCR is not mistaken for a dead worker by requeue_stale.
+    """
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(interval):
+            try:
+                if not job_queue.heartbeat(job_id):
+                    logger.warning(f"Job {job_id} lost its lease (requeued as stale)")
+                    return
+            except Exception:
+                logger.exception(f"Heartbeat for job {job_id} failed")
+
+    thread = threading.Thread(target=beat, name="job-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_forever():
+    logger.info("OCR job worker started")
+    last_stale_check = 0.0
+
+    while True:
+        if time.monotonic() - last_stale_check > 60:
+            requeued, failed = job_queue.requeue_stale(settings.JOBS_STALE_SECONDS, settings.JOBS_MAX_ATTEMPTS)
+            if requeued:
+                logger.warning(f"Requeued {requeued} stale jobs")
+            if failed:
+                logger.error(f"Failed {failed} stale jobs after {settings.JOBS_MAX_ATTEMPTS} attempts")
+            last_stale_check = time.monotonic()
+
+        job = job_queue.claim()
+        if job is None:
+            time.sleep(settings.JOBS_POLL_INTERVAL)
+            continue
+
+        try:
+            with heartbeat(job["id"], settings.JOBS_HEARTBEAT_SECONDS):
+                result = process_job(job)
+            job_queue.complete(job["id"], result)
+            payload = {"job_id": job["id"], "status": "done", "result": result}
+        except Exception as e:
+            logger.exception(f"Job {job['id']} failed")
+            job_queue.fail(job["id"], str(e))
+            payload = {"job_id": job["id"], "status": "failed", "error": str(e)}
+
+        if job["callback_url"]:
+            try:
+                send_callback(job["callback_url"], payload)
+            except Exception:
+                logger.exception(f"Callback for job {job['id']} failed")
+
+
+if __name__ == "__main__":
+    run_forever()
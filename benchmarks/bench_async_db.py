@@ -0,0 +1,267 @@
+"""
+Event-loop lag under mixed read/extract load, per DB access style.
+
+    python -m benchmarks.bench_async_db [--readers 32] [--extractors 4] [--seconds 10] [--rtt-ms 1]
+    DB_BACKEND=mysql python -m benchmarks.bench_async_db --rtt-ms 0
+
+One asyncio loop runs, like a uvicorn worker:
+- `--readers` coroutines loop over history pages and detail lookups;
+- `--extractors` coroutines hand ~`--extract-ms` of GIL-releasing image
+  work to a thread pool (standing in for inference) and insert the row;
+- a probe sleeps 5 ms at a time and records how late it wakes up, which
+  is how long the loop was blocked.
+
+The DB calls are made three ways:
+- blocking: the sync pool called inside the coroutine (old app/server.py);
+- executor: the sync pool on a thread pool (previous router path);
+- async: ExtractionRepository on the async pool.
+
+With the SQLite stand-in every statement also sleeps --rtt-ms, in the
+caller's thread, as a MySQL round trip would. Against MySQL (--rtt-ms 0)
+the async pool uses aiomysql if installed.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from app.async_database import AsyncConnectionPool, make_async_pool, threaded_creator
+from app.config import settings
+from app.database import ConnectionPool, SQLiteConnection, mysql_creator
+from app.models.extraction_repository import ExtractionRepository
+from app.models.ocr_extraction import (
+    create_ocr_table, extraction_row, fetch_extraction, fetch_history, fetch_text,
+    insert_extractions, migrate_ocr_table,
+)
+from benchmarks.common import percentile
+
+PROBE_INTERVAL = 0.005
+
+
+# =====================================================
+# DB SETUP
+# =====================================================
+class SlowCursor:
+    def __init__(self, cursor, rtt: float):
+        self._cursor = cursor
+        self._rtt = rtt
+
+    def execute(self, query, params=()):
+        time.sleep(self._rtt)
+        return self._cursor.execute(query, params)
+
+    def executemany(self, query, seq_params):
+        time.sleep(self._rtt)
+        return self._cursor.executemany(query, seq_params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class SlowConnection:
+    """SQLite stand-in with a simulated network round trip per statement."""
+
+    def __init__(self, path: str, rtt: float):
+        self._conn = SQLiteConnection(path)
+        self._rtt = rtt
+
+    def cursor(self, dictionary: bool = False, **_kwargs):
+        return SlowCursor(self._conn.cursor(dictionary=dictionary), self._rtt)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def make_pools(args):
+    size = args.readers + args.extractors
+    if settings.DB_BACKEND == "mysql":
+        return ConnectionPool(mysql_creator, size=size, max_overflow=0), make_async_pool(), "mysql"
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_async_db_"), "ocr.sqlite3")
+    creator = lambda: SlowConnection(path, args.rtt_ms / 1000)
+    sync_pool = ConnectionPool(creator, size=size, max_overflow=0, dialect="sqlite")
+    async_pool = AsyncConnectionPool(threaded_creator(creator), size=size, max_overflow=0, dialect="sqlite")
+    return sync_pool, async_pool, "sqlite"
+
+
+def seed(pool: ConnectionPool, rows: int):
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        create_ocr_table(cursor, pool.dialect)
+        migrate_ocr_table(cursor, pool.dialect)
+        uuids = []
+        for start in range(0, rows, 1000):
+            batch = [new_row(i) for i in range(start, min(rows, start + 1000))]
+            insert_extractions(cursor, batch)
+            uuids.extend(row[0] for row in batch)
+        conn.commit()
+        cursor.close()
+    return uuids
+
+
+def new_row(i: int):
+    fields = {"name": "RAHUL KUMAR", "pan": f"ABCDE{i % 10000:04d}F", "phone": f"9{i:09d}"}
+    return extraction_row(str(uuid.uuid4()), f"scan_{i}.jpg", "PAN", fields,
+                          "INCOME TAX DEPARTMENT RAHUL KUMAR " * 8, 0.9, [[[0, 0], "RAHUL KUMAR", 0.9]])
+
+
+# =====================================================
+# ACCESS STYLES
+# =====================================================
+def sync_read(pool, kind, key):
+    with pool.connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        if kind == "history":
+            result = fetch_history(cursor, {"document_type": "PAN"}, None, 50)
+        else:
+            result = fetch_extraction(cursor, key)
+            cursor.close()
+            cursor = conn.cursor()
+            result = result, fetch_text(cursor, key)
+        cursor.close()
+    return result
+
+
+def sync_insert(pool, rows):
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        insert_extractions(cursor, rows)
+        conn.commit()
+        cursor.close()
+
+
+class Blocking:
+    def __init__(self, sync_pool, async_pool, threads):
+        self.pool = sync_pool
+
+    async def read(self, kind, key):
+        return sync_read(self.pool, kind, key)
+
+    async def insert(self, rows):
+        sync_insert(self.pool, rows)
+
+
+class Executor:
+    def __init__(self, sync_pool, async_pool, threads):
+        self.pool = sync_pool
+        self.threads = threads
+
+    async def read(self, kind, key):
+        return await asyncio.get_running_loop().run_in_executor(self.threads, sync_read, self.pool, kind, key)
+
+    async def insert(self, rows):
+        await asyncio.get_running_loop().run_in_executor(self.threads, sync_insert, self.pool, rows)
+
+
+class Async:
+    def __init__(self, sync_pool, async_pool, threads):
+        self.repository = ExtractionRepository(async_pool)
+
+    async def read(self, kind, key):
+        if kind == "history":
+            return await self.repository.list({"document_type": "PAN"}, None, 50)
+        return await self.repository.get(key, include_text=True)
+
+    async def insert(self, rows):
+        await self.repository.insert(rows)
+
+
+STYLES = {"blocking": Blocking, "executor": Executor, "async": Async}
+
+
+# =====================================================
+# LOAD
+# =====================================================
+def inference(image, seconds: float):
+    # cv2 releases the GIL, as torch does during a forward pass
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        image = cv2.GaussianBlur(image, (5, 5), 0)
+    return image
+
+
+async def run_style(style, uuids, args, inference_pool):
+    stop = asyncio.Event()
+    lags, read_ms, extracts = [], [], [0]
+    image = np.random.default_rng(0).integers(0, 255, (600, 900), dtype=np.uint8)
+
+    async def probe():
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL)
+            lags.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+
+    async def reader(seed):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            kind = "history" if rng.random() < args.history_share else "detail"
+            start = time.perf_counter()
+            await style.read(kind, rng.choice(uuids))
+            read_ms.append((time.perf_counter() - start) * 1000)
+            # request boundary: a blocking read never suspends on its own
+            await asyncio.sleep(0)
+
+    async def extractor(seed):
+        i = seed * 10 ** 6
+        while not stop.is_set():
+            await asyncio.get_running_loop().run_in_executor(
+                inference_pool, inference, image, args.extract_ms / 1000)
+            i += 1
+            await style.insert([new_row(i)])
+            extracts[0] += 1
+
+    tasks = [asyncio.create_task(probe())]
+    tasks += [asyncio.create_task(reader(i)) for i in range(args.readers)]
+    tasks += [asyncio.create_task(extractor(i + 1)) for i in range(args.extractors)]
+    await asyncio.sleep(args.seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return lags, read_ms, extracts[0]
+
+
+async def main_async(args):
+    sync_pool, async_pool, backend = make_pools(args)
+    uuids = seed(sync_pool, args.rows)
+    threads = ThreadPoolExecutor(max_workers=args.readers + args.extractors, thread_name_prefix="db")
+    inference_pool = ThreadPoolExecutor(max_workers=args.extractors, thread_name_prefix="ocr")
+
+    print(f"{backend}, rtt {args.rtt_ms} ms, {args.readers} readers, {args.extractors} extractors, "
+          f"{args.seconds}s per style, async driver {async_pool.driver}")
+    print(f"{'':>9} {'lag p50':>8} {'lag p99':>8} {'lag max':>8} {'read p50':>9} {'read p99':>9} "
+          f"{'reads/s':>8} {'extracts/s':>11}")
+    for name in args.styles.split(","):
+        style = STYLES[name](sync_pool, async_pool, threads)
+        lags, read_ms, extracts = await run_style(style, uuids, args, inference_pool)
+        print(f"{name:>9} {percentile(lags, 50):>8.2f} {percentile(lags, 99):>8.2f} {max(lags):>8.2f} "
+              f"{percentile(read_ms, 50):>9.2f} {percentile(read_ms, 99):>9.2f} "
+              f"{len(read_ms) / args.seconds:>8.0f} {extracts / args.seconds:>11.1f}")
+
+    await async_pool.close_all()
+    sync_pool.close_all()
+    threads.shutdown()
+    inference_pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--extractors", type=int, default=4)
+    parser.add_argument("--extract-ms", type=float, default=50)
+    parser.add_argument("--history-share", type=float, default=0.5, help="history pages vs detail lookups")
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="simulated round trip (SQLite only)")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--styles", default="blocking,executor,async")
+    main_args = parser.parse_args()
+    asyncio.run(main_async(main_args))
+
+
+if __name__ == "__main__":
+    main()
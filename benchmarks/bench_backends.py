@@ -0,0 +1,95 @@
+"""
+Run a labelled image corpus through every registered OCR backend.
+
+    python -m benchmarks.bench_backends --corpus samples/ [--backends easyocr,tesseract] [--json out.json]
+
+The corpus folder holds images and a labels.json (see common.py).
+Each backend runs in its own subprocess so peak RSS is per engine.
+Reports throughput, latency percentiles, RSS and field accuracy.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from benchmarks.common import field_accuracy, load_labelled_corpus, max_rss_mb, percentile
+
+
+def run_backend(name: str, corpus_dir: str) -> dict:
+    from app.services.field_extractor import extract_document
+    from app.services.ocr_backends import get_backend
+    from app.utils.image import decode_image
+
+    corpus = load_labelled_corpus(corpus_dir)
+
+    start = time.perf_counter()
+    backend = get_backend(name)
+    load_seconds = time.perf_counter() - start
+
+    backend.read(decode_image(corpus[0][1]))  # warm-up
+
+    latencies = []
+    correct = labelled = 0
+    total_start = time.perf_counter()
+    for _, image_bytes, labels in corpus:
+        start = time.perf_counter()
+        regions = backend.read(decode_image(image_bytes))
+        fields, document_type = extract_document("\n".join(r[1] for r in regions))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        c, t = field_accuracy(fields, document_type, labels)
+        correct += c
+        labelled += t
+    elapsed = time.perf_counter() - total_start
+
+    return {
+        "backend": name,
+        "images": len(corpus),
+        "load_s": round(load_seconds, 2),
+        "img_per_s": round(len(corpus) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "rss_mb": round(max_rss_mb(), 1),
+        "field_accuracy": round(correct / labelled, 4) if labelled else None,
+    }
+
+
+def main():
+    from app.services.ocr_backends import BACKENDS
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", required=True)
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_backend(args.child, args.corpus)))
+        return
+
+    results = []
+    for name in args.backends.split(","):
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_backends", "--corpus", args.corpus, "--child", name],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"{name}: failed\n{proc.stderr.strip().splitlines()[-1] if proc.stderr else ''}")
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    columns = ["backend", "img_per_s", "p50_ms", "p95_ms", "p99_ms", "rss_mb", "field_accuracy", "load_s"]
+    print(" ".join(f"{c:>14}" for c in columns))
+    for r in results:
+        print(" ".join(f"{str(r[c]):>14}" for c in columns))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
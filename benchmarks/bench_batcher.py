@@ -0,0 +1,95 @@
+"""
+Cross-request recognizer batching on CPU: images/s and latency with the
+batcher off and on, at several client concurrencies.
+
+    python -m benchmarks.bench_batcher [--images samples/] [--clients 1,4,8] [--seconds 30]
+
+Each client thread calls EasyOCRBackend.read in a closed loop, as thread
+executor workers do. Images are decoded and preprocessed once up front,
+so only detection + recognition are timed. "off" recognizes each
+image's crops on their own (reader.recognize). "on" pools the crops of
+every image in flight through RecognitionBatcher, using the
+OCR_BATCH_MAX_SIZE / OCR_BATCH_MAX_WAIT_MS / OCR_BATCH_LATENCY_BUDGET_MS
+settings. Turn OCR_BATCH_ENABLED on only where "on" gives more images/s
+and keeps p95 inside the budget. Without --images, synthetic cards
+from benchmarks.synthetic_cards are used.
+"""
+import argparse
+import itertools
+import threading
+import time
+
+from app.config import settings
+from app.services.batcher import RecognitionBatcher
+from app.services.ocr_backends import EasyOCRBackend
+from app.services.ocr_service import ocr_service
+from benchmarks.common import load_labelled_corpus, percentile
+from benchmarks.synthetic_cards import generate
+
+
+def run(backend, images, clients: int, seconds: float):
+    latencies = []
+    lock = threading.Lock()
+    index = itertools.count()
+    stop = time.perf_counter() + seconds
+
+    def client():
+        while time.perf_counter() < stop:
+            image = images[next(index) % len(images)]
+            start = time.perf_counter()
+            backend.read(image)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", help="folder of sample images (default: 16 synthetic cards)")
+    parser.add_argument("--clients", default="1,4,8", help="concurrent requests, comma separated")
+    parser.add_argument("--seconds", type=float, default=30, help="per mode and concurrency")
+    args = parser.parse_args()
+
+    corpus = load_labelled_corpus(args.images) if args.images else generate(16)
+    images = [ocr_service.load_image(image) for _, image, _ in corpus]
+
+    backend = EasyOCRBackend()
+    batcher = RecognitionBatcher(
+        backend.reader,
+        max_batch=settings.OCR_BATCH_MAX_SIZE,
+        max_wait_ms=settings.OCR_BATCH_MAX_WAIT_MS,
+        latency_budget_ms=settings.OCR_BATCH_LATENCY_BUDGET_MS,
+    )
+
+    # warm both paths once
+    backend.batcher = None
+    backend.read(images[0])
+    backend.batcher = batcher
+    backend.read(images[0])
+
+    print(f"{'clients':>7} {'batching':>8} {'images/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'crops/batch':>11}")
+    for clients in (int(c) for c in args.clients.split(",")):
+        for mode in ("off", "on"):
+            backend.batcher = batcher if mode == "on" else None
+            before = batcher.stats()
+            latencies, elapsed = run(backend, images, clients, args.seconds)
+
+            after = batcher.stats()
+            batches = after["batches"] - before["batches"]
+            per_batch = f"{(after['crops'] - before['crops']) / batches:>11.1f}" if batches else f"{'-':>11}"
+            print(f"{clients:>7} {mode:>8} {len(latencies) / elapsed:>9.2f} "
+                  f"{percentile(latencies, 50) * 1000:>8.0f} {percentile(latencies, 95) * 1000:>8.0f} {per_batch}")
+
+    batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Peak RSS of the upload decode path, old pipeline vs decode_image.
+
+    python -m benchmarks.bench_decode_memory [--image photo.jpg]
+
+Each variant runs in a fresh subprocess so ru_maxrss measures only
+that decode. Without --image a 4032x3024 JPEG (12MP phone photo) is
+generated.
+"""
+import argparse
+import io
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from app.utils.image import decode_image
+
+
+def legacy_decode(image_bytes: bytes) -> np.ndarray:
+    # pipeline before streaming decode: full decode, RGB copy, resize, np.array copy
+    image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    max_width = 1200
+    if image.width > max_width:
+        ratio = max_width / image.width
+        image = image.resize((max_width, int(image.height * ratio)), Image.LANCZOS)
+    return np.array(image)
+
+
+VARIANTS = {
+    "before": legacy_decode,
+    "after": decode_image,
+}
+
+
+def max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(variant: str, path: str):
+    with open(path, "rb") as f:
+        image_bytes = f.read()
+    baseline = max_rss_mb()
+
+    start = time.perf_counter()
+    array = VARIANTS[variant](image_bytes)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"{variant:>8} {max_rss_mb() - baseline:>10.1f} {elapsed:>9.1f} {array.shape}")
+
+
+def make_photo() -> str:
+    image = Image.effect_noise((4032, 3024), 64).convert("RGB")
+    tmp = tempfile.NamedTemporaryFile(suffix=".jpg", delete=False)
+    image.save(tmp, format="JPEG", quality=90)
+    tmp.close()
+    return tmp.name
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--image")
+    parser.add_argument("--child", nargs=2, metavar=("VARIANT", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    path = args.image or make_photo()
+    print(f"{'variant':>8} {'peak MB':>10} {'ms':>9} shape")
+    for variant in VARIANTS:
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_decode_memory", "--child", variant, path],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
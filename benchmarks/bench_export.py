@@ -0,0 +1,159 @@
+"""
+Streamed bulk export: throughput and memory, whatever the row count.
+
+    DB_BACKEND=sqlite SQLITE_PATH=history.sqlite3 \\
+        python -m benchmarks.bench_export --seed 10000000 [--formats csv,ndjson,parquet]
+    python -m benchmarks.bench_export --url http://localhost:8000 --server-pid 1234
+
+--seed loads synthetic rows with bench_history's seeder (same DB, so
+one seeded file serves both benchmarks). Each format is then exported
+with the route's building blocks: ExtractionRepository.stream (a
+server-side cursor) feeding the incremental encoder, with every batch
+encoded off the event loop. With --url the real GET /api/ocr/export is
+read over HTTP instead. Reported: rows/s, output MB/s, time to first
+byte, and RSS growth of the exporting process during the run, which
+should stay flat as rows grow. --fetchall adds the old fetchall()
+pattern for comparison; only use it on a small seed.
+"""
+import argparse
+import asyncio
+import os
+import time
+import urllib.parse
+import urllib.request
+
+from app.models.ocr_extraction import EXPORT_COLUMNS, export_query, export_row
+from app.models.extraction_repository import extraction_repository
+from app.utils.export import make_encoder
+from benchmarks.load_test import ResourceMonitor, _rss_mb
+
+
+class CountingSink:
+    def __init__(self, path=None):
+        self.bytes = 0
+        self.first_byte = None
+        self._file = open(path, "wb") if path else None
+
+    def write(self, chunk: bytes):
+        if chunk and self.first_byte is None:
+            self.first_byte = time.perf_counter()
+        self.bytes += len(chunk)
+        if self._file:
+            self._file.write(chunk)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+# =====================================================
+# EXPORTS
+# =====================================================
+async def stream_export(args, format, sink):
+    columns = EXPORT_COLUMNS + ("raw_text",) if args.include_text else EXPORT_COLUMNS
+    encoder = make_encoder(format, columns, args.row_group)
+    loop = asyncio.get_running_loop()
+    rows = 0
+    sink.write(encoder.header())
+    async for batch in extraction_repository.stream(filters(args), args.include_text, args.batch_size):
+        sink.write(await loop.run_in_executor(None, encoder.encode, batch))
+        rows += len(batch)
+    sink.write(await loop.run_in_executor(None, encoder.finish))
+    return rows
+
+
+async def fetchall_export(args, format, sink):
+    """The pattern being replaced: every row in memory before the first byte."""
+    columns = EXPORT_COLUMNS + ("raw_text",) if args.include_text else EXPORT_COLUMNS
+    encoder = make_encoder(format, columns, args.row_group)
+    sql, params = export_query(filters(args), args.include_text)
+    async with extraction_repository.pool.connection() as conn:
+        rows = [export_row(row, args.include_text) for row in await conn.fetchall(sql, params)]
+    sink.write(encoder.header() + encoder.encode(rows) + encoder.finish())
+    return len(rows)
+
+
+def http_export(args, format, sink):
+    query = {"format": format, "include_text": str(args.include_text).lower(),
+             **{k: v for k, v in filters(args).items() if v}}
+    url = f"{args.url.rstrip('/')}/api/ocr/export?{urllib.parse.urlencode(query)}"
+    with urllib.request.urlopen(url, timeout=600) as response:
+        while True:
+            chunk = response.read(1 << 20)
+            if not chunk:
+                return None  # row count unknown from the client side
+            sink.write(chunk)
+
+
+def filters(args):
+    return {"document_type": args.document_type, "created_from": args.created_from,
+            "created_to": args.created_to}
+
+
+async def run(args, format, kind):
+    path = os.path.join(args.out, f"export.{format}") if args.out else None
+    sink = CountingSink(path)
+    pid = args.server_pid if kind == "http" else os.getpid()
+    rss_start = _rss_mb(pid) if pid else 0.0
+    monitor = ResourceMonitor(pid, interval=0.2) if pid else None
+    if monitor:
+        monitor.start()
+
+    start = time.perf_counter()
+    if kind == "http":
+        rows = http_export(args, format, sink)
+    else:
+        export = stream_export if kind == "stream" else fetchall_export
+        rows = await export(args, format, sink)
+    elapsed = time.perf_counter() - start
+    sink.close()
+
+    resources = monitor.stop() if monitor else None
+    first_byte = (sink.first_byte - start) * 1000 if sink.first_byte else float("nan")
+    rows_per_s = f"{rows / elapsed:>10,.0f}" if rows is not None else f"{'-':>10}"
+    growth = f"{resources['rss_peak_mb'] - rss_start:>9.1f}" if resources else f"{'-':>9}"
+    print(f"{kind:>8} {format:>8} {rows if rows is not None else '-':>11} {elapsed:>8.1f} {rows_per_s} "
+          f"{sink.bytes / elapsed / 1e6:>7.1f} {first_byte:>10.1f} {growth}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, help="first load this many synthetic rows")
+    parser.add_argument("--chunk", type=int, default=10000, help="rows per seed insert")
+    parser.add_argument("--formats", default="csv,ndjson,parquet")
+    parser.add_argument("--document-type")
+    parser.add_argument("--created-from")
+    parser.add_argument("--created-to")
+    parser.add_argument("--include-text", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--row-group", type=int, default=100000)
+    parser.add_argument("--out", help="also write the files here (default: count bytes only)")
+    parser.add_argument("--fetchall", action="store_true", help="also run the fetchall() baseline")
+    parser.add_argument("--url", help="export through a running server instead")
+    parser.add_argument("--server-pid", type=int, help="with --url: server pid for RSS")
+    args = parser.parse_args()
+
+    if args.seed:
+        from benchmarks.bench_history import seed
+
+        seed(args.seed, args.chunk)
+
+    print(f"{'':>8} {'format':>8} {'rows':>11} {'seconds':>8} {'rows/s':>10} {'MB/s':>7} "
+          f"{'first ms':>10} {'RSS +MB':>9}")
+    # one loop for every run: pooled connections belong to the loop that opened them
+    asyncio.run(run_all(args))
+
+
+async def run_all(args):
+    for format in args.formats.split(","):
+        if args.url:
+            await run(args, format, "http")
+            continue
+        await run(args, format, "stream")
+        if args.fetchall:
+            await run(args, format, "fetchall")
+    await extraction_repository.pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Per-document cost of field extraction + classification.
+
+    python -m benchmarks.bench_field_extraction [--corpus dir_of_txt] [--docs 5000]
+
+Compares the previous multi-scan implementation with
+field_extractor.extract_document and checks both give the same output.
+Without --corpus a synthetic OCR corpus (Aadhaar, PAN, business cards,
+licences, noise) is generated.
+"""
+import argparse
+import random
+import re
+import time
+from pathlib import Path
+
+from app.services.field_extractor import extract_document
+
+
+# =====================================================
+# BASELINE (previous OCRService implementation)
+# =====================================================
+def legacy_extract(text):
+    fields = {k: None for k in ("name", "email", "phone", "aadhaar", "pan", "dob", "address", "state", "country")}
+    lines = [l.strip() for l in text.split("\n") if l.strip()]
+    text_lower = text.lower()
+
+    m = re.search(r'\b\d{4}\s?\d{4}\s?\d{4}\b', text)
+    if m:
+        fields["aadhaar"] = m.group().replace(" ", "")
+    m = re.search(r'(dob|date of birth|birth)[^\d]*(\d{2}[/-]\d{2}[/-]\d{4})', text_lower)
+    if m:
+        fields["dob"] = m.group(2)
+    m = re.search(r'\b[A-Z]{5}[0-9]{4}[A-Z]\b', text)
+    if m:
+        fields["pan"] = m.group()
+    m = re.search(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}', text)
+    if m:
+        fields["email"] = m.group()
+    m = re.search(r'(\+91[\s-]?)?[6-9]\d{9}', text)
+    if m:
+        fields["phone"] = m.group()
+
+    blocklist = ["government", "india", "department", "authority", "republic",
+                 "unique", "identification", "income", "tax"]
+    for line in lines:
+        if (line.isupper() and 1 < len(line.split()) <= 3
+                and not any(b in line.lower() for b in blocklist)
+                and not re.search(r'\d', line)):
+            fields["name"] = line.title()
+            break
+    for i, line in enumerate(lines):
+        if any(k in line.lower() for k in ["address", "resident", "s/o", "c/o", "w/o"]):
+            fields["address"] = " ".join(lines[i:i + 3])
+            break
+    if "india" in text_lower:
+        fields["country"] = "India"
+    for s in ["delhi", "maharashtra", "karnataka", "tamil nadu", "uttar pradesh", "gujarat", "rajasthan"]:
+        if s in text_lower:
+            fields["state"] = s.title()
+            break
+
+    text_lower = text.lower()
+    if fields.get("aadhaar"):
+        doc_type = "AADHAAR"
+    elif fields.get("pan"):
+        doc_type = "PAN"
+    elif "voter" in text_lower:
+        doc_type = "VOTER_ID"
+    elif "driving" in text_lower or "dl no" in text_lower:
+        doc_type = "DRIVING_LICENCE"
+    elif fields.get("email") and fields.get("phone"):
+        doc_type = "BUSINESS_CARD"
+    else:
+        doc_type = "GENERIC_DOCUMENT"
+    return fields, doc_type
+
+
+# =====================================================
+# SYNTHETIC CORPUS
+# =====================================================
+NAMES = ["RAHUL KUMAR", "PRIYA SHARMA", "AMIT VERMA", "SNEHA PATIL", "ARJUN NAIR SINGH"]
+STATES = ["Delhi", "Maharashtra", "Karnataka", "Tamil Nadu", "Uttar Pradesh", "Gujarat", "Rajasthan", "Kerala"]
+
+
+def synthetic_doc(rng: random.Random) -> str:
+    name = rng.choice(NAMES)
+    state = rng.choice(STATES)
+    kind = rng.choice(["aadhaar", "pan", "card", "dl", "noise"])
+    digits = lambda n: "".join(rng.choice("0123456789") for _ in range(n))
+
+    if kind == "aadhaar":
+        lines = ["GOVERNMENT OF INDIA", name, f"DOB: {rng.randint(10, 28)}/0{rng.randint(1, 9)}/19{rng.randint(50, 99)}",
+                 "MALE", f"{digits(4)} {digits(4)} {digits(4)}",
+                 f"Address: S/O Ramesh, {rng.randint(1, 300)} MG Road", f"{state} {digits(6)}"]
+    elif kind == "pan":
+        lines = ["INCOME TAX DEPARTMENT", "GOVT. OF INDIA", name, "Date of Birth",
+                 f"0{rng.randint(1, 9)}-0{rng.randint(1, 9)}-198{rng.randint(0, 9)}",
+                 "Permanent Account Number", "ABCDE" + digits(4) + "F"]
+    elif kind == "card":
+        lines = [name, "Senior Engineer", "Acme Pvt Ltd", f"{name.split()[0].lower()}@acme.co.in",
+                 f"+91 9{digits(9)}", f"Address: {rng.randint(1, 99)} Park Street, {state}"]
+    elif kind == "dl":
+        lines = ["Union of India", "Driving Licence", f"DL No {digits(4)} {digits(7)}", name, f"{state}"]
+    else:
+        lines = [" ".join(rng.choice(["lorem", "ipsum", "dolor", "amet", "7", "x"]) for _ in range(8))
+                 for _ in range(rng.randint(3, 12))]
+
+    # a little OCR noise
+    return "\n".join(l if rng.random() > 0.1 else l.replace("O", "0") for l in lines)
+
+
+def load_corpus(folder, docs, seed):
+    if folder:
+        return [p.read_text(encoding="utf-8", errors="ignore") for p in sorted(Path(folder).glob("*.txt"))]
+    rng = random.Random(seed)
+    return [synthetic_doc(rng) for _ in range(docs)]
+
+
+def time_per_doc(fn, corpus, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", help="folder of .txt OCR outputs")
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.docs, args.seed)
+
+    mismatches = sum(legacy_extract(t) != extract_document(t) for t in corpus)
+
+    legacy_us = time_per_doc(legacy_extract, corpus, args.repeat)
+    engine_us = time_per_doc(extract_document, corpus, args.repeat)
+
+    print(f"documents:   {len(corpus)}")
+    print(f"mismatches:  {mismatches}")
+    print(f"legacy:      {legacy_us:8.2f} us/doc")
+    print(f"single-pass: {engine_us:8.2f} us/doc  ({legacy_us / engine_us:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
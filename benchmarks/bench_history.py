@@ -0,0 +1,246 @@
+"""
+Seed ocr_extractions and load-test the history queries.
+
+    DB_BACKEND=sqlite SQLITE_PATH=history.sqlite3 \\
+        python -m benchmarks.bench_history --seed 10000000 [--clients 8] [--seconds 30]
+    python -m benchmarks.bench_history --url http://localhost:8000 [--clients 8]
+
+--seed bulk-loads synthetic rows through the app's DB pool (MySQL or the
+SQLite stand-in) and then runs migrate_ocr_table, which builds the
+history indexes on the loaded table. The load test runs a query mix from
+concurrent clients, either straight against the DB or through
+GET /api/ocr/history with --url, and reports latency per query kind.
+"deep" walks 200 pages by cursor (--deep-pages 0 skips it); "offset" is
+the LIMIT/OFFSET equivalent of its last page, for comparison, measured
+straight against the DB only since the API has no offset paging.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.parse
+import urllib.request
+from datetime import datetime, timedelta
+
+from app.database import db
+from app.models.ocr_extraction import (
+    EXTRACTION_COLUMNS, create_ocr_table, fetch_history, history_query, migrate_ocr_table,
+)
+from app.utils.pagination import decode_cursor, encode_cursor
+from benchmarks.common import percentile
+
+DOCUMENT_TYPES = ["AADHAAR", "PAN", "VOTER_ID", "DRIVING_LICENCE", "BUSINESS_CARD", "GENERIC_DOCUMENT"]
+START = datetime(2024, 1, 1)
+SPAN_SECONDS = 2 * 365 * 24 * 3600
+
+
+# =====================================================
+# SEED
+# =====================================================
+def synthetic_row(i: int, rows: int):
+    rng = random.Random(i)
+    document_type = DOCUMENT_TYPES[i % len(DOCUMENT_TYPES)]
+    created_at = START + timedelta(seconds=int(i * SPAN_SECONDS / rows))
+    return (
+        f"00000000-0000-4000-8000-{i:012d}",
+        f"scan_{i}.jpg",
+        document_type,
+        "RAHUL KUMAR",
+        None,
+        f"9{i % 10 ** 9:09d}",
+        f"{i:012d}" if document_type == "AADHAAR" else None,
+        f"ABCDE{i % 10000:04d}F" if document_type == "PAN" else None,
+        "12/03/1990",
+        None,
+        "Delhi",
+        "India",
+        round(rng.uniform(0.5, 1.0), 4),
+        created_at.strftime("%Y-%m-%d %H:%M:%S"),
+    )
+
+
+def seed(rows: int, chunk: int):
+    columns = EXTRACTION_COLUMNS + ("created_at",)
+    sql = (
+        f"INSERT INTO ocr_extractions ({', '.join(columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        create_ocr_table(cursor, db.dialect)
+        conn.commit()
+
+        start = time.perf_counter()
+        for offset in range(0, rows, chunk):
+            cursor.executemany(sql, [synthetic_row(i, rows) for i in range(offset, min(rows, offset + chunk))])
+            conn.commit()
+            done = min(rows, offset + chunk)
+            print(f"\rseeded {done:,}/{rows:,} ({done / (time.perf_counter() - start):,.0f} rows/s)", end="")
+        print()
+
+        start = time.perf_counter()
+        migrate_ocr_table(cursor, db.dialect)
+        conn.commit()
+        print(f"indexes built in {time.perf_counter() - start:.1f}s")
+        cursor.close()
+
+
+# =====================================================
+# QUERY MIX
+# =====================================================
+def query_mix(rows: int):
+    """kind -> function(rng) returning filters; values are drawn from the seeded data."""
+    def day(rng):
+        at = START + timedelta(seconds=rng.randrange(SPAN_SECONDS))
+        return at.strftime("%Y-%m-%d 00:00:00"), (at + timedelta(days=7)).strftime("%Y-%m-%d 00:00:00")
+
+    def type_range(rng):
+        created_from, created_to = day(rng)
+        return {"document_type": rng.choice(DOCUMENT_TYPES), "created_from": created_from, "created_to": created_to}
+
+    def aadhaar(rng):
+        i = rng.randrange(0, rows, len(DOCUMENT_TYPES))  # AADHAAR rows
+        return {"aadhaar": f"{i:012d}"}
+
+    def pan(rng):
+        return {"pan": f"ABCDE{rng.randrange(10000):04d}F"}
+
+    def phone(rng):
+        return {"phone": f"9{rng.randrange(min(rows, 10 ** 9)):09d}"}
+
+    return {
+        "latest": lambda rng: {},
+        "type": lambda rng: {"document_type": rng.choice(DOCUMENT_TYPES)},
+        "type_range": type_range,
+        "aadhaar": aadhaar,
+        "pan": pan,
+        "phone": phone,
+    }
+
+
+class DirectClient:
+    def page(self, filters, cursor, limit):
+        after = decode_cursor(cursor) if cursor else None
+        with db.connection() as conn:
+            c = conn.cursor(dictionary=True)
+            rows, has_more = fetch_history(c, filters, after, limit)
+            c.close()
+        return encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if has_more else None
+
+    def offset_page(self, offset, limit):
+        with db.connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT id FROM ocr_extractions ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s",
+                      (limit, offset))
+            c.fetchall()
+            c.close()
+
+
+class HTTPClient:
+    def __init__(self, url: str):
+        self.url = url.rstrip("/") + "/api/ocr/history"
+
+    def page(self, filters, cursor, limit):
+        params = {k: v for k, v in filters.items() if v is not None}
+        params["limit"] = limit
+        if cursor:
+            params["cursor"] = cursor
+        with urllib.request.urlopen(f"{self.url}?{urllib.parse.urlencode(params)}") as response:
+            body = json.loads(response.read())
+        return body["data"]["next_cursor"]
+
+
+def explain(mix, rows):
+    """Query plan of each kind, to check every one is an index range scan."""
+    rng = random.Random(0)
+    prefix = "EXPLAIN QUERY PLAN " if db.dialect == "sqlite" else "EXPLAIN "
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        for kind, make_filters in mix.items():
+            sql, params = history_query(make_filters(rng), after=("2025-01-01 00:00:00", 10 ** 9), limit=51)
+            cursor.execute(prefix + sql, params)
+            plan = " | ".join(" ".join(str(v) for v in row if v is not None) for row in cursor.fetchall())
+            print(f"{kind:>12}: {plan}")
+        cursor.close()
+
+
+def load_test(client, mix, clients: int, seconds: float, limit: int, deep_pages: int):
+    deep = ["deep"] if deep_pages > 0 else []
+    latencies = {kind: [] for kind in list(mix) + deep + ["offset"]}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def worker(seed_value):
+        rng = random.Random(seed_value)
+        kinds = list(mix) + deep
+        while time.monotonic() < deadline:
+            kind = rng.choice(kinds)
+            if kind == "deep":
+                cursor = None
+                for _ in range(deep_pages):
+                    start = time.perf_counter()
+                    cursor = client.page({}, cursor, limit)
+                    if cursor is None:
+                        break
+                elapsed = time.perf_counter() - start  # last (deepest) page
+            else:
+                start = time.perf_counter()
+                client.page(mix[kind](rng), None, limit)
+                elapsed = time.perf_counter() - start
+            with lock:
+                latencies[kind].append(elapsed * 1000)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # the API only pages by cursor, so the OFFSET comparison runs on the DB
+    if deep and isinstance(client, DirectClient):
+        for _ in range(3):
+            start = time.perf_counter()
+            client.offset_page(deep_pages * limit, limit)
+            latencies["offset"].append((time.perf_counter() - start) * 1000)
+
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=0, help="insert this many rows first (10000000 for the full test)")
+    parser.add_argument("--chunk", type=int, default=20000)
+    parser.add_argument("--url", help="load-test the HTTP endpoint instead of the DB directly")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--deep-pages", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.seed, args.chunk)
+
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM ocr_extractions")
+        rows = cursor.fetchone()[0]
+        cursor.close()
+    print(f"rows: {rows:,}  backend: {db.dialect}  clients: {args.clients}")
+
+    mix = query_mix(rows)
+    explain(mix, rows)
+
+    client = HTTPClient(args.url) if args.url else DirectClient()
+    latencies = load_test(client, mix, args.clients, args.seconds, args.limit, args.deep_pages)
+
+    print(f"\n{'kind':>12} {'queries':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for kind, values in latencies.items():
+        if values:
+            print(f"{kind:>12} {len(values):>8} {percentile(values, 50):>8.2f} "
+                  f"{percentile(values, 95):>8.2f} {percentile(values, 99):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
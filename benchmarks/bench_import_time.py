@@ -0,0 +1,60 @@
+"""
+Cold import time of the API modules.
+
+    python -m benchmarks.bench_import_time [--module app.main] [--runs 5] [--top 15]
+
+Each run imports the module in a fresh interpreter with -X importtime
+and reports the wall time plus the slowest modules (cumulative), so a
+heavy import creeping back into module scope shows up immediately.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+def import_once(module: str):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        sys.exit(proc.stderr.strip().splitlines()[-1])
+
+    # "import time: self [us] | cumulative | imported package"
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = (
+            part.strip() for part in line[len("import time:"):].split("|")
+        )
+        modules.append((int(cumulative_us), int(self_us), name))
+    return elapsed, modules
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    timings = []
+    modules = []
+    for _ in range(args.runs):
+        elapsed, modules = import_once(args.module)
+        timings.append(elapsed)
+
+    print(f"import {args.module}: median {statistics.median(timings) * 1000:.0f} ms "
+          f"(min {min(timings) * 1000:.0f}, max {max(timings) * 1000:.0f}, {args.runs} runs)")
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, name in sorted(modules, reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
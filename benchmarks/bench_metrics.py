@@ -0,0 +1,67 @@
+"""
+Cost of the stage instrumentation, enabled vs disabled.
+
+    python -m benchmarks.bench_metrics [--iterations 1000000]
+
+Times an empty `with metrics.stage(...)` block (the per-stage overhead
+added to every request, ~12 stages each), a collect() round as done per
+inference, and rendering /metrics with a realistic number of series.
+"""
+import argparse
+import random
+import time
+
+from app.services.metrics import Metrics
+
+
+def per_call_ns(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    fn(iterations)
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def stage_loop(metrics: Metrics):
+    def run(n):
+        for _ in range(n):
+            with metrics.stage("decode"):
+                pass
+    return run
+
+
+def collect_loop(metrics: Metrics):
+    def run(n):
+        for _ in range(n // 10):
+            with metrics.collect() as timings:
+                for name in ("decode", "grayscale", "crop", "resize", "deskew", "detect", "recognize", "ocr"):
+                    with metrics.stage(name):
+                        pass
+            metrics.observe_stages(timings)
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=1000000)
+    args = parser.parse_args()
+
+    print(f"{'':>10} {'stage ns':>10} {'inference ns':>13}")
+    for enabled in (False, True):
+        metrics = Metrics(enabled)
+        stage_ns = per_call_ns(stage_loop(metrics), args.iterations)
+        collect_ns = per_call_ns(collect_loop(metrics), args.iterations) * 10
+        print(f"{'enabled' if enabled else 'disabled':>10} {stage_ns:>10.0f} {collect_ns:>13.0f}")
+
+    metrics = Metrics(True)
+    rng = random.Random(0)
+    for _ in range(100000):
+        metrics.stages.observe(rng.expovariate(10), rng.choice(["decode", "detect", "recognize", "fields", "db_insert"]))
+        metrics.requests.observe(rng.expovariate(5), "POST", rng.choice(["/api/ocr/extract", "/api/ocr/search"]), "200")
+        metrics.count_document(rng.choice(["AADHAAR", "PAN", "GENERIC_DOCUMENT"]), "easyocr")
+
+    start = time.perf_counter()
+    body = metrics.render()
+    print(f"\nrender: {(time.perf_counter() - start) * 1000:.2f} ms, {len(body.splitlines())} lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Accuracy vs speed of the EasyOCR runtimes (torch, onnx, onnx_int8).
+
+    python -m benchmarks.bench_onnx_runtime --corpus samples/ [--runtimes torch,onnx,onnx_int8] [--json out.json]
+
+Each runtime runs in its own subprocess (OCR_RUNTIME set in the env) over
+a labelled corpus (see common.py). Besides throughput, latency and field
+accuracy, the text of every image is compared with the torch output:
+"same_text" is the share of identical reads, "text_similarity" the mean
+character-level similarity. The first run exports the ONNX models into
+OCR_ONNX_DIR; load_s of later runs is the steady-state startup cost.
+"""
+import argparse
+import difflib
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import field_accuracy, load_labelled_corpus, max_rss_mb, percentile
+
+
+def run_runtime(corpus_dir: str) -> dict:
+    from app.services.field_extractor import extract_document
+    from app.services.ocr_backends import get_backend
+    from app.utils.image import decode_image
+
+    corpus = load_labelled_corpus(corpus_dir)
+
+    start = time.perf_counter()
+    backend = get_backend("easyocr")
+    load_seconds = time.perf_counter() - start
+
+    backend.read(decode_image(corpus[0][1]))  # warm-up
+
+    latencies = []
+    texts = {}
+    correct = labelled = 0
+    total_start = time.perf_counter()
+    for name, image_bytes, labels in corpus:
+        start = time.perf_counter()
+        regions = backend.read(decode_image(image_bytes))
+        text = "\n".join(r[1] for r in regions)
+        fields, document_type = extract_document(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        texts[name] = text
+        c, t = field_accuracy(fields, document_type, labels)
+        correct += c
+        labelled += t
+    elapsed = time.perf_counter() - total_start
+
+    return {
+        "runtime": backend.runtime,
+        "images": len(corpus),
+        "load_s": round(load_seconds, 2),
+        "img_per_s": round(len(corpus) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "rss_mb": round(max_rss_mb(), 1),
+        "field_accuracy": round(correct / labelled, 4) if labelled else None,
+        "texts": texts,
+    }
+
+
+def compare_texts(result: dict, reference: dict):
+    names = list(reference["texts"])
+    same = sum(result["texts"].get(n) == reference["texts"][n] for n in names)
+    similarity = sum(
+        difflib.SequenceMatcher(None, result["texts"].get(n, ""), reference["texts"][n]).ratio()
+        for n in names
+    )
+    result["same_text"] = round(same / len(names), 4) if names else None
+    result["text_similarity"] = round(similarity / len(names), 4) if names else None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", required=True)
+    parser.add_argument("--runtimes", default="torch,onnx,onnx_int8")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_runtime(args.corpus)))
+        return
+
+    results = []
+    for runtime in args.runtimes.split(","):
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_onnx_runtime", "--corpus", args.corpus, "--child"],
+            capture_output=True, text=True,
+            env={**os.environ, "OCR_RUNTIME": runtime, "OCR_BATCH_ENABLED": "false"},
+        )
+        if proc.returncode != 0:
+            print(f"{runtime}: failed\n{proc.stderr.strip().splitlines()[-1] if proc.stderr else ''}")
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        result["requested"] = runtime
+        results.append(result)
+
+    reference = next((r for r in results if r["requested"] == "torch"), None)
+    for result in results:
+        if reference:
+            compare_texts(result, reference)
+        # a failed export silently runs torch; make that visible
+        if result["runtime"] != result["requested"]:
+            result["requested"] += " (fell back)"
+
+    columns = ["requested", "img_per_s", "p50_ms", "p95_ms", "rss_mb",
+               "field_accuracy", "same_text", "text_similarity", "load_s"]
+    print(" ".join(f"{c:>16}" for c in columns))
+    for r in results:
+        print(" ".join(f"{str(r.get(c)):>16}" for c in columns))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([{k: v for k, v in r.items() if k != "texts"} for r in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+PaddleOCR latency: old temp-file round trip vs in-memory arrays.
+
+    python -m benchmarks.bench_paddle_path --corpus samples/ [--repeat 3]
+
+"before" re-encodes the upload to a JPEG temp file and lets PaddleOCR
+read and decode it again; "after" is the decode_image + array path
+server.py uses now. Field accuracy is reported when labels.json exists.
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+
+from PIL import Image
+
+from app.services.field_extractor import extract_document
+from app.services.ocr_backends import get_backend
+from app.utils.image import decode_image
+from benchmarks.common import field_accuracy, load_labelled_corpus, percentile
+
+
+def temp_file_path(ocr, image_bytes):
+    image = Image.open(io.BytesIO(image_bytes))
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp_file:
+        image.convert("RGB").save(tmp_file.name)
+        tmp_path = tmp_file.name
+    try:
+        result = ocr.ocr(tmp_path)
+    finally:
+        os.unlink(tmp_path)
+    return [line[1][0] for line in result[0]] if result and result[0] else []
+
+
+def in_memory_path(backend, image_bytes):
+    return [region[1] for region in backend.read(decode_image(image_bytes))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", required=True)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_labelled_corpus(args.corpus)
+    backend = get_backend("paddleocr")
+
+    variants = {
+        "before": lambda b: temp_file_path(backend.ocr, b),
+        "after": lambda b: in_memory_path(backend, b),
+    }
+
+    print(f"{'variant':>8} {'p50_ms':>8} {'p95_ms':>8} {'mean_ms':>8} {'accuracy':>9}")
+    for name, fn in variants.items():
+        fn(corpus[0][1])  # warm-up
+        latencies = []
+        correct = labelled = 0
+        for _ in range(args.repeat):
+            for _, image_bytes, labels in corpus:
+                start = time.perf_counter()
+                lines = fn(image_bytes)
+                latencies.append((time.perf_counter() - start) * 1000)
+                c, t = field_accuracy(*extract_document("\n".join(lines)), labels)
+                correct += c
+                labelled += t
+        accuracy = f"{correct / labelled:.4f}" if labelled else "-"
+        mean = sum(latencies) / len(latencies)
+        print(f"{name:>8} {percentile(latencies, 50):>8.1f} {percentile(latencies, 95):>8.1f} {mean:>8.1f} {accuracy:>9}")
+
+
+if __name__ == "__main__":
+    main()
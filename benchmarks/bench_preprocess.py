@@ -0,0 +1,149 @@
+"""
+Fixed 1200px resize vs adaptive preprocessing.
+
+    python -m benchmarks.bench_preprocess [--corpus samples/] [--backend easyocr]
+
+For every image: pixels handed to the OCR engine and preprocessing cost
+for both pipelines, plus the adaptive per-stage timings. With --backend
+each image is also OCR'd both ways to compare latency and field
+accuracy (labels.json, see common.py). Without --corpus a synthetic set
+of sparse ID cards (photographed on a background, slightly rotated) and
+dense text pages is generated.
+"""
+import argparse
+import io
+import random
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+from app.config import settings
+from app.utils.image import decode_image
+from app.utils.preprocess import Preprocessor
+from benchmarks.common import field_accuracy, load_labelled_corpus, percentile
+
+
+# =====================================================
+# SYNTHETIC CORPUS
+# =====================================================
+def _jpeg(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def synthetic_card(rng: random.Random) -> bytes:
+    card = Image.new("RGB", (1700, 1070), "white")
+    draw = ImageDraw.Draw(card)
+    font = ImageFont.load_default(size=56)
+    lines = ["GOVERNMENT OF INDIA", "RAHUL KUMAR", "DOB: 12/03/1990", "MALE",
+             f"{rng.randint(1000, 9999)} {rng.randint(1000, 9999)} {rng.randint(1000, 9999)}"]
+    for i, line in enumerate(lines):
+        draw.text((80, 80 + i * 150), line, fill="black", font=font)
+
+    photo = Image.new("RGB", (4032, 3024), (rng.randint(60, 120),) * 3)
+    card = card.rotate(rng.uniform(-8, 8), expand=True, fillcolor=photo.getpixel((0, 0)))
+    photo.paste(card, (rng.randint(200, 1200), rng.randint(200, 900)))
+    return _jpeg(photo)
+
+
+def synthetic_page(rng: random.Random) -> bytes:
+    page = Image.new("RGB", (2480, 3508), "white")  # A4 @ 300dpi
+    draw = ImageDraw.Draw(page)
+    font = ImageFont.load_default(size=30)
+    words = ["lorem", "ipsum", "dolor", "sit", "amet", "address", "state", "india", "2024"]
+    for row in range(80):
+        draw.text((150, 150 + row * 40), " ".join(rng.choice(words) for _ in range(14)),
+                  fill="black", font=font)
+    return _jpeg(page)
+
+
+def synthetic_corpus(images: int, seed: int):
+    rng = random.Random(seed)
+    return [
+        (f"{kind.__name__}_{i}.jpg", kind(rng), {})
+        for i in range(images)
+        for kind in [(synthetic_card, synthetic_page)[i % 2]]
+    ]
+
+
+# =====================================================
+# MEASUREMENT
+# =====================================================
+def fixed_pipeline(image_bytes: bytes):
+    return decode_image(image_bytes), {}
+
+
+def adaptive_pipeline(preprocessor: Preprocessor):
+    def run(image_bytes: bytes):
+        return preprocessor.run(decode_image(image_bytes, settings.OCR_DECODE_MAX_WIDTH, resize=False))
+    return run
+
+
+def measure(name, pipeline, corpus, backend):
+    from app.services.field_extractor import extract_document
+
+    prep_ms, ocr_ms, pixels = [], [], []
+    stages = {}
+    correct = labelled = 0
+    for _, image_bytes, labels in corpus:
+        start = time.perf_counter()
+        image_np, report = pipeline(image_bytes)
+        prep_ms.append((time.perf_counter() - start) * 1000)
+        pixels.append(image_np.shape[0] * image_np.shape[1])
+        for stage, ms in report.get("timings_ms", {}).items():
+            stages[stage] = stages.get(stage, 0.0) + ms / len(corpus)
+
+        if backend is not None:
+            start = time.perf_counter()
+            regions = backend.read(image_np)
+            fields, document_type = extract_document("\n".join(r[1] for r in regions))
+            ocr_ms.append((time.perf_counter() - start) * 1000)
+            c, t = field_accuracy(fields, document_type, labels)
+            correct += c
+            labelled += t
+
+    print(f"\n{name}")
+    print(f"  pixels to engine: mean {sum(pixels) / len(pixels) / 1e6:.2f} MP")
+    print(f"  preprocess:       p50 {percentile(prep_ms, 50):.1f} ms  p95 {percentile(prep_ms, 95):.1f} ms")
+    if stages:
+        print("  stages (mean ms): " + "  ".join(f"{k} {v:.1f}" for k, v in stages.items()))
+    if ocr_ms:
+        print(f"  ocr:              p50 {percentile(ocr_ms, 50):.1f} ms  p95 {percentile(ocr_ms, 95):.1f} ms")
+        if labelled:
+            print(f"  field accuracy:   {correct / labelled:.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", help="folder of images (+ labels.json)")
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--backend", help="also OCR each image with this backend")
+    args = parser.parse_args()
+
+    corpus = load_labelled_corpus(args.corpus) if args.corpus else synthetic_corpus(args.images, args.seed)
+
+    backend = None
+    if args.backend:
+        from app.services.ocr_backends import get_backend
+
+        backend = get_backend(args.backend)
+        backend.read(decode_image(corpus[0][1]))  # warm-up
+
+    preprocessor = Preprocessor(
+        target_char_height=settings.OCR_TARGET_CHAR_HEIGHT,
+        min_width=settings.OCR_MIN_WIDTH,
+        max_width=settings.OCR_MAX_WIDTH,
+        max_skew=settings.OCR_MAX_SKEW_DEGREES,
+        crop=settings.OCR_CROP_TO_DOCUMENT,
+        grayscale=settings.OCR_GRAYSCALE,
+    )
+
+    print(f"images: {len(corpus)}")
+    measure("fixed 1200px", fixed_pipeline, corpus, backend)
+    measure("adaptive", adaptive_pipeline(preprocessor), corpus, backend)
+
+
+if __name__ == "__main__":
+    main()
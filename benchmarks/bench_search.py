@@ -0,0 +1,158 @@
+"""
+Build the search index over synthetic ID-card text and measure queries.
+
+    python -m benchmarks.bench_search --docs 1000000 [--dir /tmp] [--queries 2000] [--like]
+    python -m benchmarks.bench_search --docs 10000000 --dir /data/tmp
+
+Documents are Aadhaar / PAN style text built from name and place word
+lists, with OCR-style character confusions injected into some words.
+Reports indexing throughput, index size and per-kind query latency;
+"fuzzy" queries use a misread spelling and must still find the
+document. --like also times a LIKE '%name%' scan over the same text in
+a plain table, the query this replaces. Single-word queries on very
+common terms (surnames, place names) are the slow case: bm25 has to
+score every matching document.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+
+from app.services.search_index import SearchIndex
+from benchmarks.common import percentile
+
+FIRST = ["Rahul", "Priya", "Amit", "Sunita", "Vikram", "Anjali", "Rohan", "Kavita", "Suresh", "Deepa",
+         "Arjun", "Meena", "Manoj", "Pooja", "Sanjay", "Neha", "Rajesh", "Lakshmi", "Imran", "Fatima",
+         "Gurpreet", "Harish", "Divya", "Karthik", "Shalini", "Naveen", "Rekha", "Abdul", "Sneha", "Vinod"]
+LAST = ["Kumar", "Sharma", "Verma", "Singh", "Patel", "Reddy", "Nair", "Iyer", "Gupta", "Khan",
+        "Das", "Joshi", "Mehta", "Chopra", "Banerjee", "Mukherjee", "Pillai", "Rao", "Yadav", "Mishra"]
+PLACES = ["Delhi", "Mumbai", "Andheri", "Bandra", "Pune", "Nagpur", "Chennai", "Adyar", "Bengaluru",
+          "Koramangala", "Hyderabad", "Secunderabad", "Kolkata", "Howrah", "Lucknow", "Kanpur", "Jaipur",
+          "Ahmedabad", "Surat", "Indore", "Bhopal", "Patna", "Noida", "Gurugram", "Chandigarh"]
+STREETS = ["MG Road", "Station Road", "Gandhi Nagar", "Nehru Street", "Sector", "Main Road", "Colony"]
+
+# reverse of the fold applied at query time: what OCR tends to produce
+MISREADS = {"l": "1", "o": "0", "s": "5", "b": "8", "i": "l", "m": "rn"}
+
+
+def misread(word: str, rng: random.Random) -> str:
+    positions = [i for i, c in enumerate(word.lower()) if c in MISREADS]
+    if not positions:
+        return word
+    i = rng.choice(positions)
+    return word[:i] + MISREADS[word[i].lower()] + word[i + 1:]
+
+
+def synthetic_document(i: int, rng: random.Random, noise: float):
+    # a long tail of rarer surnames so the vocabulary grows with the corpus
+    name = f"{rng.choice(FIRST)} {rng.choice(LAST)}{'' if rng.random() < 0.7 else rng.choice(LAST).lower()}"
+    place = rng.choice(PLACES)
+    address = f"{rng.randint(1, 999)} {rng.choice(STREETS)} {rng.randint(1, 60)}, {place} {rng.randint(110001, 855999)}"
+    if i % 2:
+        text = f"GOVERNMENT OF INDIA {name} DOB {rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/19{rng.randint(50, 99)} " \
+               f"MALE {rng.randint(10 ** 11, 10 ** 12 - 1)} Address {address}"
+        document_type = "AADHAAR"
+    else:
+        text = f"INCOME TAX DEPARTMENT GOVT OF INDIA Permanent Account Number ABCDE{i % 10000:04d}F {name}"
+        document_type = "PAN"
+    words = [misread(w, rng) if rng.random() < noise else w for w in text.split()]
+    return f"00000000-0000-4000-8000-{i:012d}", document_type, name, address, " ".join(words)
+
+
+def build(index: SearchIndex, docs: int, chunk: int, noise: float, like_conn=None):
+    rng = random.Random(7)
+    start = time.perf_counter()
+    for offset in range(0, docs, chunk):
+        batch = [synthetic_document(i, rng, noise) for i in range(offset, min(docs, offset + chunk))]
+        index.add(batch)
+        if like_conn is not None:
+            like_conn.executemany("INSERT INTO docs VALUES (?, ?)", [(d[0], d[4]) for d in batch])
+            like_conn.commit()
+        done = min(docs, offset + chunk)
+        print(f"\rindexed {done:,}/{docs:,} ({done / (time.perf_counter() - start):,.0f} docs/s)", end="")
+    print()
+    return time.perf_counter() - start
+
+
+def query_kinds():
+    def name(rng):
+        return f"{rng.choice(FIRST)} {rng.choice(LAST)}", {}
+
+    def surname(rng):
+        return rng.choice(LAST), {"field": "name", "fuzzy": False}
+
+    def prefix(rng):
+        return f"{rng.choice(FIRST)} {rng.choice(LAST)[:3]}", {"prefix": True}
+
+    def fuzzy(rng):
+        return f"{misread(rng.choice(FIRST), rng)} {rng.choice(LAST)}", {}
+
+    def address(rng):
+        return f"{rng.choice(STREETS)} {rng.choice(PLACES)}", {"field": "address", "document_type": "AADHAAR"}
+
+    return {"name": name, "surname": surname, "prefix": prefix, "fuzzy": fuzzy, "address": address}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=1000000)
+    parser.add_argument("--dir", default=".")
+    parser.add_argument("--chunk", type=int, default=5000)
+    parser.add_argument("--noise", type=float, default=0.1, help="share of words misread")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--like", action="store_true", help="also time a LIKE scan baseline")
+    args = parser.parse_args()
+
+    path = os.path.join(args.dir, f"bench_search_{args.docs}.sqlite3")
+    like_path = os.path.join(args.dir, f"bench_search_like_{args.docs}.sqlite3")
+    for stale in (path, path + "-wal", path + "-shm", like_path):
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    like_conn = None
+    if args.like:
+        like_conn = sqlite3.connect(like_path)
+        like_conn.execute("CREATE TABLE docs (uuid TEXT, raw_text TEXT)")
+
+    index = SearchIndex(path)
+    seconds = build(index, args.docs, args.chunk, args.noise, like_conn)
+    index._conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    terms = index._conn().execute("SELECT COUNT(*) FROM search_terms").fetchone()[0]
+    print(f"docs: {args.docs:,}  index: {os.path.getsize(path) / 1e6:,.0f} MB  "
+          f"vocabulary: {terms:,}  build: {seconds:.0f}s")
+
+    rng = random.Random(1)
+    kinds = query_kinds()
+    latencies = {kind: [] for kind in kinds}
+    found = {kind: 0 for kind in kinds}
+    for _ in range(args.queries):
+        kind = rng.choice(list(kinds))
+        query, options = kinds[kind](rng)
+        start = time.perf_counter()
+        hits, _ = index.search(query, limit=args.limit, **options)
+        latencies[kind].append((time.perf_counter() - start) * 1000)
+        found[kind] += bool(hits)
+
+    print(f"\n{'kind':>10} {'queries':>8} {'found':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for kind, values in latencies.items():
+        if values:
+            print(f"{kind:>10} {len(values):>8} {found[kind] / len(values):>7.0%} {percentile(values, 50):>8.2f} "
+                  f"{percentile(values, 95):>8.2f} {percentile(values, 99):>8.2f}")
+
+    if like_conn is not None:
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            # ranking needs every match, so the scan always reads the whole table
+            like_conn.execute("SELECT COUNT(*) FROM docs WHERE raw_text LIKE ?",
+                              (f"%{rng.choice(FIRST)} {rng.choice(LAST)}%",)).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{'like':>10} {len(timings):>8} {'':>7} {percentile(timings, 50):>8.2f} "
+              f"{percentile(timings, 95):>8.2f} {max(timings):>8.2f}")
+        like_conn.close()
+
+
+if __name__ == "__main__":
+    main()
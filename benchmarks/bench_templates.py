@@ -0,0 +1,126 @@
+"""
+Latency saved by template (ROI-only) OCR per ID type.
+
+    python -m benchmarks.bench_templates [--backend easyocr] [--cards 10] [--corpus samples/]
+
+Without --corpus, cards are rendered from the templates themselves
+(header text in the header strip, field values in their regions), so
+the ground truth is known. Each card is read two ways: full-page
+detection + recognition + field_extractor, and TemplateMatcher's
+header check + ROI recognition. Cards that fall back to full page
+count towards the template timings as well.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from app.config import settings
+from app.services.field_extractor import extract_document
+from app.services.ocr_backends import get_backend
+from app.services.templates import TemplateMatcher, load_templates
+from app.utils.image import decode_image
+from benchmarks.common import field_accuracy, load_labelled_corpus, percentile
+
+NAMES = ["RAHUL KUMAR", "PRIYA SHARMA", "AMIT VERMA", "SNEHA PATIL"]
+
+SAMPLE_VALUES = {
+    "name": lambda rng: rng.choice(NAMES),
+    "dob": lambda rng: f"{rng.randint(10, 28)}/0{rng.randint(1, 9)}/19{rng.randint(50, 99)}",
+    "aadhaar": lambda rng: " ".join(str(rng.randint(1000, 9999)) for _ in range(3)),
+    "pan": lambda rng: "".join(rng.choice("ABCDEFGHJKLMNPQRSTUVWXYZ") for _ in range(5))
+                       + str(rng.randint(1000, 9999)) + rng.choice("ABCDEFGHJK"),
+}
+
+
+def render_card(template, rng: random.Random, width: int = 1000):
+    """Card image following the template layout, plus its labels."""
+    height = int(width / template.aspect_ratio)
+    card = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(card)
+
+    def put(box, text):
+        x0, y0, x1, y1 = box
+        size = max(12, int((y1 - y0) * height * 0.6))
+        draw.text((x0 * width + 4, y0 * height + 2), text, fill="black",
+                  font=ImageFont.load_default(size=size))
+
+    put(template.header_box, template.keywords[0].upper())
+    labels = {"document_type": template.document_type}
+    for field in template.fields:
+        value = SAMPLE_VALUES.get(field.name, lambda rng: "SAMPLE")(rng)
+        put(field.box, value)
+        labels[field.name] = value.replace(" ", "") if field.format == "digits" else value
+    return np.asarray(card), labels
+
+
+def run(name, fn, cards):
+    latencies = []
+    correct = labelled = 0
+    for image_np, labels in cards:
+        start = time.perf_counter()
+        fields, document_type = fn(image_np)
+        latencies.append((time.perf_counter() - start) * 1000)
+        c, t = field_accuracy(fields, document_type, labels)
+        correct += c
+        labelled += t
+    return {
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "accuracy": round(correct / labelled, 4) if labelled else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", default=settings.OCR_TEMPLATE_BACKEND or settings.OCR_BACKEND)
+    parser.add_argument("--cards", type=int, default=10, help="synthetic cards per template")
+    parser.add_argument("--corpus", help="folder of card images (+ labels.json with document_type)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    templates = load_templates(settings.OCR_TEMPLATES_PATH)
+    matcher = TemplateMatcher(templates, thumb_width=settings.OCR_TEMPLATE_THUMB_WIDTH)
+    backend = get_backend(args.backend)
+
+    if args.corpus:
+        by_type = {}
+        for _, image_bytes, labels in load_labelled_corpus(args.corpus):
+            by_type.setdefault(labels.get("document_type", "UNLABELLED"), []).append(
+                (decode_image(image_bytes), labels)
+            )
+    else:
+        rng = random.Random(args.seed)
+        by_type = {
+            template.document_type: [render_card(template, rng) for _ in range(args.cards)]
+            for template in templates.values()
+        }
+
+    def full_page(image_np):
+        return extract_document("\n".join(r[1] for r in backend.read(image_np)))
+
+    def template_mode(image_np):
+        result = matcher.read(image_np, backend)
+        if result is None:
+            return full_page(image_np)
+        return result[3], result[4]
+
+    backend.read(next(iter(by_type.values()))[0][0])  # warm-up
+
+    print(f"backend: {args.backend}")
+    print(f"{'type':>18} {'cards':>6} {'full p50':>9} {'tmpl p50':>9} {'saved':>7} "
+          f"{'full p95':>9} {'tmpl p95':>9} {'full acc':>9} {'tmpl acc':>9}")
+    for document_type, cards in by_type.items():
+        full = run("full page", full_page, cards)
+        roi = run("template", template_mode, cards)
+        saved = 1 - roi["p50_ms"] / full["p50_ms"] if full["p50_ms"] else 0.0
+        print(f"{document_type:>18} {len(cards):>6} {full['p50_ms']:>9} {roi['p50_ms']:>9} {saved:>7.0%} "
+              f"{full['p95_ms']:>9} {roi['p95_ms']:>9} {str(full['accuracy']):>9} {str(roi['accuracy']):>9}")
+
+    print(f"\ntemplate stats: {matcher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
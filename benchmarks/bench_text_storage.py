@@ -0,0 +1,132 @@
+"""
+Inline raw_text vs compressed side table, on a seeded SQLite stand-in.
+
+    python -m benchmarks.bench_text_storage [--rows 200000] [--dir /tmp]
+
+Builds the same synthetic extractions twice: the old layout (raw_text
+TEXT inside ocr_extractions) and the current one (insert_extractions:
+slim row + compressed text/lines in ocr_extraction_texts). Reports the
+size of the hot table, the side table and the compression ratio, plus
+the time of queries that only need the hot columns (a full aggregate
+scan and keyset history pages).
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+
+from app.database import SQLiteConnection
+from app.models.ocr_extraction import (
+    create_ocr_table, extraction_row, fetch_history, insert_extractions, migrate_ocr_table,
+)
+from app.utils.compression import DEFAULT_CODEC
+
+WORDS = ["GOVERNMENT", "OF", "INDIA", "Address", "S/O", "Ramesh", "MG", "Road", "Delhi",
+         "DOB", "MALE", "FEMALE", "Permanent", "Account", "Number", "Income", "Tax", "Department"]
+
+
+def synthetic_extraction(i: int, rng: random.Random):
+    lines = []
+    for n in range(rng.randint(8, 20)):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6)))
+        y = 20 + n * 34
+        lines.append([[[12, y], [12 + 14 * len(text), y], [12 + 14 * len(text), y + 28], [12, y + 28]],
+                      text, round(rng.uniform(0.4, 1.0), 4)])
+    text = "\n".join(line[1] for line in lines)
+    fields = {"name": "Rahul Kumar", "aadhaar": f"{i:012d}", "dob": "12/03/1990", "country": "India"}
+    return extraction_row(f"00000000-0000-4000-8000-{i:012d}", f"scan_{i}.jpg", "AADHAAR",
+                          fields, text, round(rng.uniform(0.5, 1.0), 4), lines)
+
+
+def table_bytes(conn: sqlite3.Connection, table: str) -> int:
+    try:
+        return conn.execute("SELECT SUM(pgsize) FROM dbstat WHERE name = ?", (table,)).fetchone()[0] or 0
+    except sqlite3.OperationalError:  # SQLite built without dbstat
+        return -1
+
+
+def build(path: str, rows: int, inline: bool, chunk: int = 5000):
+    if os.path.exists(path):
+        os.remove(path)
+    conn = SQLiteConnection(path)
+    cursor = conn.cursor()
+    create_ocr_table(cursor, "sqlite")
+    migrate_ocr_table(cursor, "sqlite")
+
+    rng = random.Random(7)
+    for offset in range(0, rows, chunk):
+        batch = [synthetic_extraction(i, rng) for i in range(offset, min(rows, offset + chunk))]
+        if inline:
+            # previous layout: everything in one row
+            cursor.executemany(
+                "INSERT INTO ocr_extractions (uuid, filename, document_type, name, email, phone, aadhaar, "
+                "pan, dob, address, state, country, confidence_score, raw_text) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                [row[:-1] for row in batch],
+            )
+        else:
+            insert_extractions(cursor, batch)
+        conn.commit()
+    cursor.close()
+    return conn
+
+
+def time_queries(conn, repeat: int = 5):
+    cursor = conn.cursor(dictionary=True)
+
+    def best(fn):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        return min(timings)
+
+    def scan():
+        cursor.execute("SELECT document_type, COUNT(*), AVG(confidence_score) FROM ocr_extractions "
+                       "GROUP BY document_type")
+        cursor.fetchall()
+
+    def pages():
+        after = None
+        for _ in range(100):
+            rows, has_more = fetch_history(cursor, {}, after, 50)
+            if not has_more:
+                break
+            after = (rows[-1]["created_at"], rows[-1]["id"])
+
+    return best(scan), best(pages)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--dir", default=".")
+    args = parser.parse_args()
+
+    print(f"rows: {args.rows:,}  codec: {DEFAULT_CODEC}")
+    results = {}
+    for name, inline in (("inline", True), ("side table", False)):
+        path = os.path.join(args.dir, f"bench_text_{name.replace(' ', '_')}.sqlite3")
+        conn = build(path, args.rows, inline)
+        probe = sqlite3.connect(path)
+        hot = table_bytes(probe, "ocr_extractions")
+        side = table_bytes(probe, "ocr_extraction_texts")
+        ratio = probe.execute(
+            "SELECT SUM(raw_size) * 1.0 / NULLIF(SUM(LENGTH(payload)), 0) FROM ocr_extraction_texts"
+        ).fetchone()[0]
+        scan_ms, pages_ms = time_queries(conn)
+        results[name] = (hot, side, ratio, scan_ms, pages_ms, os.path.getsize(path))
+        probe.close()
+        conn.close()
+
+    print(f"\n{'layout':>12} {'hot MB':>9} {'side MB':>9} {'file MB':>9} {'compress':>9} "
+          f"{'scan ms':>9} {'100 pages ms':>13}")
+    for name, (hot, side, ratio, scan_ms, pages_ms, size) in results.items():
+        print(f"{name:>12} {hot / 1e6:>9.1f} {side / 1e6:>9.1f} {size / 1e6:>9.1f} "
+              f"{(f'{ratio:.1f}x' if ratio else '-'):>9} {scan_ms:>9.1f} {pages_ms:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Throughput of the EasyOCR process pool from 1 to N workers.
+
+    python -m benchmarks.bench_worker_pool --images samples/ --max-workers 8
+
+Without --images a synthetic text card is rendered with PIL.
+"""
+import argparse
+import io
+import os
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from app.services.executor import make_inference_process_pool
+from app.services.ocr_service import run_extract_text
+
+
+def synthetic_card() -> bytes:
+    image = Image.new("RGB", (1000, 630), "white")
+    draw = ImageDraw.Draw(image)
+    lines = ["GOVERNMENT OF INDIA", "RAHUL KUMAR SHARMA", "DOB: 01/02/1990", "1234 5678 9012"]
+    for i, line in enumerate(lines):
+        draw.text((60, 80 + i * 110), line, fill="black")
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def load_images(folder):
+    if not folder:
+        return [synthetic_card()]
+    paths = sorted(p for p in Path(folder).iterdir() if p.suffix.lower() in {".jpg", ".jpeg", ".png"})
+    return [p.read_bytes() for p in paths]
+
+
+def run(workers: int, images, total: int) -> float:
+    pool = make_inference_process_pool(workers)
+    try:
+        # warm every worker once
+        list(pool.map(run_extract_text, [images[0]] * workers))
+
+        batch = [images[i % len(images)] for i in range(total)]
+        start = time.perf_counter()
+        list(pool.map(run_extract_text, batch))
+        return total / (time.perf_counter() - start)
+    finally:
+        pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", help="folder of sample images")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--per-worker", type=int, default=8, help="images per worker per run")
+    args = parser.parse_args()
+
+    images = load_images(args.images)
+    baseline = None
+
+    print(f"{'workers':>8} {'img/s':>8} {'speedup':>8}")
+    n = 1
+    while n <= args.max_workers:
+        rate = run(n, images, n * args.per_worker)
+        baseline = baseline or rate
+        print(f"{n:>8} {rate:>8.2f} {rate / baseline:>8.2f}")
+        n = n * 2 if n * 2 <= args.max_workers or n == args.max_workers else args.max_workers
+
+
+if __name__ == "__main__":
+    main()
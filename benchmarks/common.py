@@ -0,0 +1,50 @@
+"""Helpers shared by the benchmark scripts."""
+import json
+import re
+import resource
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp"}
+
+
+def load_labelled_corpus(folder: str) -> List[Tuple[str, bytes, Dict]]:
+    """
+    Images in `folder` plus an optional labels.json mapping
+    file name -> expected fields (and optionally "document_type").
+    """
+    root = Path(folder)
+    labels_path = root / "labels.json"
+    labels = json.loads(labels_path.read_text()) if labels_path.exists() else {}
+
+    return [
+        (path.name, path.read_bytes(), labels.get(path.name, {}))
+        for path in sorted(root.iterdir())
+        if path.suffix.lower() in IMAGE_SUFFIXES
+    ]
+
+
+def _normalize(value) -> str:
+    return re.sub(r"\s+", "", str(value or "")).lower()
+
+
+def field_accuracy(fields: Dict, document_type: str, labels: Dict) -> Tuple[int, int]:
+    """(correct, labelled) over the labelled fields of one document."""
+    correct = total = 0
+    for key, expected in labels.items():
+        actual = document_type if key == "document_type" else fields.get(key)
+        total += 1
+        correct += _normalize(actual) == _normalize(expected)
+    return correct, total
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
@@ -0,0 +1,434 @@
+"""
+Load test POST /api/ocr/extract and write a JSON report.
+
+    # app started inside this process (uvicorn on a free port), SQLite stand-in DB
+    python -m benchmarks.load_test --synthetic 60 --concurrency 4 --requests 200 --json run.json
+
+    # a running server (MySQL or whatever it is configured with)
+    python -m benchmarks.load_test --url http://localhost:8000 --server-pid 1234 \\
+        --corpus samples/ --concurrency 16 --seconds 60 --json run.json --compare baseline.json
+
+Images come from --corpus (images + labels.json, see common.py) or
+are generated by synthetic_cards with known fields. Every response is
+scored against its labels, so the report has throughput, latency
+percentiles, CPU (cores used by the server process tree), peak RSS and
+field accuracy, overall and per document type. --compare prints the
+change against an earlier report. In-process runs default to
+DB_BACKEND=sqlite in a temporary directory and the OCR result cache off,
+so repeated images are really OCR'd; set the environment to override.
+In-process CPU/RSS include the client threads; use --url for a clean
+server-only measurement.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from benchmarks.common import field_accuracy, load_labelled_corpus, percentile
+
+SETTINGS_SNAPSHOT = (
+    "OCR_BACKEND", "OCR_MODE", "OCR_RUNTIME", "OCR_EXECUTOR", "OCR_WORKERS", "OCR_PREPROCESS",
+    "OCR_BATCH_ENABLED", "OCR_CACHE_ENABLED", "DB_BACKEND", "WRITE_BEHIND_ENABLED", "SEARCH_ENABLED",
+    "METRICS_ENABLED",
+)
+
+
+# =====================================================
+# TARGETS
+# =====================================================
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class InProcessServer:
+    """The FastAPI app under uvicorn on a background thread of this process."""
+
+    def __init__(self, db_backend: str, cache: bool):
+        os.environ.setdefault("DB_BACKEND", db_backend)
+        if os.environ["DB_BACKEND"] == "sqlite":
+            workdir = tempfile.mkdtemp(prefix="ocr_load_test_")
+            os.environ.setdefault("SQLITE_PATH", os.path.join(workdir, "ocr.sqlite3"))
+            os.environ.setdefault("JOBS_DB_PATH", os.path.join(workdir, "jobs.sqlite3"))
+            os.environ.setdefault("SEARCH_INDEX_PATH", os.path.join(workdir, "search.sqlite3"))
+            os.environ.setdefault("WRITE_BEHIND_SPOOL_PATH", os.path.join(workdir, "spool.jsonl"))
+        if not cache:
+            os.environ.setdefault("OCR_CACHE_ENABLED", "false")
+
+        # settings are read at import, so only now
+        import uvicorn
+        from app.main import app
+
+        self.url = f"http://127.0.0.1:{_free_port()}"
+        port = int(self.url.rsplit(":", 1)[1])
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self.server.install_signal_handlers = lambda: None  # not the main thread
+        self.thread = threading.Thread(target=self.server.run, name="uvicorn", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.05)
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(30)
+
+
+def _multipart(filename: str, data: bytes, content_type: str = "image/jpeg"):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+class HTTPClient:
+    def __init__(self, url: str, query: str = ""):
+        self.base = url.rstrip("/")
+        self.extract_url = f"{self.base}/api/ocr/extract" + (f"?{query}" if query else "")
+
+    def extract(self, filename: str, data: bytes):
+        body, content_type = _multipart(filename, data)
+        request = urllib.request.Request(self.extract_url, data=body, method="POST",
+                                         headers={"Content-Type": content_type})
+        try:
+            with urllib.request.urlopen(request, timeout=300) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+    def get(self, path: str):
+        try:
+            with urllib.request.urlopen(self.base + path, timeout=30) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+    def wait_ready(self, timeout: float):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if self.get("/health/ready")[0] == 200:
+                    return
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            time.sleep(0.5)
+        raise TimeoutError(f"{self.base} not ready after {timeout}s")
+
+
+# =====================================================
+# RESOURCE USAGE (Linux /proc, whole process tree)
+# =====================================================
+def _tree(root: int) -> List[int]:
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+
+    pids, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def _cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime, stime, cutime, cstime (reaped children)
+    return sum(int(v) for v in fields[11:15]) / os.sysconf("SC_CLK_TCK")
+
+
+def _rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class ResourceMonitor:
+    """CPU seconds and peak RSS of a process and its descendants, sampled every `interval`."""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss_mb = 0.0
+        self._cpu: Dict[int, float] = {}
+        self._cpu_start: Dict[int, float] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _sample(self):
+        rss = 0.0
+        for pid in _tree(self.pid):
+            try:
+                self._cpu[pid] = _cpu_seconds(pid)
+                rss += _rss_mb(pid)
+            except OSError:
+                continue  # exited
+        self.peak_rss_mb = max(self.peak_rss_mb, rss)
+        return rss
+
+    def start(self):
+        self._sample()
+        self._cpu_start = dict(self._cpu)
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def stop(self) -> Dict:
+        self._stop.set()
+        self._thread.join()
+        end_rss = self._sample()
+        elapsed = time.perf_counter() - self._started
+        cpu = sum(value - self._cpu_start.get(pid, 0.0) for pid, value in self._cpu.items())
+        return {
+            "cpu_seconds": round(cpu, 2),
+            "cpu_cores_avg": round(cpu / elapsed, 2),
+            "rss_peak_mb": round(self.peak_rss_mb, 1),
+            "rss_end_mb": round(end_rss, 1),
+        }
+
+
+# =====================================================
+# LOAD
+# =====================================================
+def run_load(client: HTTPClient, corpus, concurrency: int, requests: Optional[int], seconds: Optional[float]):
+    """Closed loop: `concurrency` threads each send their next request as soon as the last returns."""
+    results = []
+    lock = threading.Lock()
+    issued = itertools.count()
+    deadline = time.monotonic() + seconds if seconds else None
+
+    def next_index():
+        with lock:
+            index = next(issued)
+        if requests and index >= requests or deadline and time.monotonic() >= deadline:
+            return None
+        return index
+
+    def worker():
+        while True:
+            index = next_index()
+            if index is None:
+                return
+            name, data, labels = corpus[index % len(corpus)]
+            start = time.perf_counter()
+            status, body = client.extract(name, data)
+            latency = (time.perf_counter() - start) * 1000
+            with lock:
+                results.append((latency, status, body, labels))
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - start
+
+
+def summarize(results, elapsed: float) -> Dict:
+    latencies = [latency for latency, _, _, _ in results]
+    errors: Dict[str, int] = {}
+    kinds: Dict[str, Dict] = {}
+    correct = labelled = type_correct = typed = cached = 0
+
+    for latency, status, body, labels in results:
+        ok = status == 200 and body is not None and body.get("status")
+        if not ok:
+            key = str(status) if status != 200 else (body or {}).get("message", "error")
+            errors[key] = errors.get(key, 0) + 1
+
+        kind = kinds.setdefault(labels.get("document_type", "unlabelled"),
+                                {"latencies": [], "correct": 0, "labelled": 0})
+        kind["latencies"].append(latency)
+
+        data = body["data"] if ok else {"extracted_data": {}, "document_type": None}
+        cached += bool(data.get("cached"))
+        field_labels = {k: v for k, v in labels.items() if k != "document_type"}
+        c, t = field_accuracy(data["extracted_data"], data["document_type"], field_labels)
+        correct, labelled = correct + c, labelled + t
+        kind["correct"] += c
+        kind["labelled"] += t
+        if "document_type" in labels:
+            typed += 1
+            type_correct += data["document_type"] == labels["document_type"]
+
+    def latency_summary(values):
+        return {
+            "p50": round(percentile(values, 50), 1),
+            "p90": round(percentile(values, 90), 1),
+            "p95": round(percentile(values, 95), 1),
+            "p99": round(percentile(values, 99), 1),
+            "max": round(max(values), 1) if values else 0.0,
+            "mean": round(sum(values) / len(values), 1) if values else 0.0,
+        }
+
+    return {
+        "requests": len(results),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": latency_summary(latencies),
+        "errors": errors,
+        "cached_responses": cached,
+        "accuracy": {
+            "fields": round(correct / labelled, 4) if labelled else None,
+            "document_type": round(type_correct / typed, 4) if typed else None,
+        },
+        "per_document_type": {
+            kind: {
+                "requests": len(values["latencies"]),
+                "latency_ms": latency_summary(values["latencies"]),
+                "field_accuracy": round(values["correct"] / values["labelled"], 4) if values["labelled"] else None,
+            }
+            for kind, values in sorted(kinds.items())
+        },
+    }
+
+
+# =====================================================
+# REPORT
+# =====================================================
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+COMPARED = (
+    ("throughput_rps", True), ("latency_ms.p50", False), ("latency_ms.p95", False),
+    ("latency_ms.p99", False), ("resources.cpu_cores_avg", False), ("resources.rss_peak_mb", False),
+    ("accuracy.fields", True), ("accuracy.document_type", True),
+)
+
+
+def compare(report: Dict, baseline: Dict):
+    def lookup(data, path):
+        for key in path.split("."):
+            data = (data or {}).get(key)
+        return data
+
+    print(f"\n{'metric':>26} {'baseline':>10} {'current':>10} {'change':>8}  "
+          f"(baseline {baseline['meta'].get('commit')})")
+    for path, higher_is_better in COMPARED:
+        old, new = lookup(baseline, path), lookup(report, path)
+        if old is None or new is None:
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        better = change > 0 if higher_is_better else change < 0
+        flag = "" if abs(change) < 2 else (" better" if better else " WORSE")
+        print(f"{path:>26} {old:>10} {new:>10} {change:>+7.1f}%{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--corpus", help="folder of images + labels.json")
+    source.add_argument("--synthetic", type=int, default=30, help="generate this many cards (default)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="load-test a running server instead of an in-process one")
+    parser.add_argument("--server-pid", type=int, help="with --url: server pid for CPU/RSS (tree)")
+    parser.add_argument("--db", default="sqlite", choices=["sqlite", "mysql"], help="in-process DB backend")
+    parser.add_argument("--cache", action="store_true", help="in-process: keep the OCR result cache on")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, help="total requests (default: one pass over the images)")
+    parser.add_argument("--seconds", type=float, help="run for a fixed time instead")
+    parser.add_argument("--warmup", type=int, default=2, help="requests sent before measuring")
+    parser.add_argument("--mode", help="OCR mode query parameter")
+    parser.add_argument("--backend", help="OCR backend query parameter")
+    parser.add_argument("--ready-timeout", type=float, default=600)
+    parser.add_argument("--json", help="write the report here")
+    parser.add_argument("--compare", help="earlier report to compare against")
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = load_labelled_corpus(args.corpus)
+    else:
+        from benchmarks.synthetic_cards import generate
+
+        corpus = generate(args.synthetic, args.seed)
+    random.Random(args.seed).shuffle(corpus)
+
+    server = None
+    if args.url:
+        url, pid = args.url, args.server_pid
+    else:
+        server = InProcessServer(args.db, args.cache)
+        server.start()
+        url, pid = server.url, os.getpid()
+
+    query = "&".join(f"{k}={v}" for k, v in (("mode", args.mode), ("backend", args.backend)) if v)
+    client = HTTPClient(url, query)
+    try:
+        client.wait_ready(args.ready_timeout)
+        for name, data, _ in corpus[:args.warmup]:
+            client.extract(name, data)
+
+        monitor = ResourceMonitor(pid) if pid else None
+        if monitor:
+            monitor.start()
+        requests = args.requests or (None if args.seconds else len(corpus))
+        results, elapsed = run_load(client, corpus, args.concurrency, requests, args.seconds)
+        resources = monitor.stop() if monitor else None
+        server_stats = client.get("/stats")[1]
+    finally:
+        if server is not None:
+            server.stop()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "target": "http" if args.url else "in-process",
+            "url": url,
+            "concurrency": args.concurrency,
+            "images": len(corpus),
+            "corpus": args.corpus or f"synthetic:{args.synthetic}:seed{args.seed}",
+            "query": query,
+            "settings": {key: os.environ[key] for key in SETTINGS_SNAPSHOT if key in os.environ},
+        },
+        **summarize(results, elapsed),
+        "resources": resources,
+        "server_stats": server_stats,
+    }
+
+    summary = {k: report[k] for k in ("requests", "throughput_rps", "latency_ms", "errors", "accuracy", "resources")}
+    print(json.dumps(summary, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
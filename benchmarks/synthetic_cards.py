@@ -0,0 +1,164 @@
+"""
+Synthetic Aadhaar / PAN / business-card images with ground-truth fields.
+
+    python -m benchmarks.synthetic_cards --out samples/ [--count 100] [--seed 0]
+
+Writes JPEGs plus a labels.json in the format load_labelled_corpus
+(common.py) reads, so the set can be fed to any benchmark taking
+--corpus. The same seed always yields the same images. Cards are
+PIL-rendered, then rotated, noised, sometimes blurred and dropped on a
+background like a phone photo.
+"""
+import argparse
+import io
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+FIRST = ["RAHUL", "PRIYA", "AMIT", "SUNITA", "VIKRAM", "ANJALI", "ROHAN", "KAVITA", "SURESH", "DEEPA"]
+LAST = ["KUMAR", "SHARMA", "VERMA", "SINGH", "PATEL", "REDDY", "NAIR", "GUPTA", "JOSHI", "MEHTA"]
+STATES = ["Delhi", "Maharashtra", "Karnataka", "Tamil Nadu", "Gujarat", "Kerala"]
+COMPANIES = ["Acme Pvt Ltd", "Zenith Systems", "Blue Lotus Traders", "Sahyadri Infotech"]
+
+# (width, height) of an ID-1 card at ~300 dpi
+CARD_SIZE = (1012, 638)
+
+Card = Tuple[bytes, Dict[str, str]]
+
+
+def _digits(rng: random.Random, n: int) -> str:
+    return "".join(rng.choice("0123456789") for _ in range(n))
+
+
+def _font(size: int):
+    return ImageFont.load_default(size=size)
+
+
+def _card(lines: List[Tuple[str, int]], band: Tuple[int, int, int], rng: random.Random) -> Image.Image:
+    """White card with a coloured header band and left-aligned text lines (text, font size)."""
+    card = Image.new("RGB", CARD_SIZE, (250, 250, 245))
+    draw = ImageDraw.Draw(card)
+    draw.rectangle((0, 0, CARD_SIZE[0], 90), fill=band)
+
+    y = 20
+    for i, (text, size) in enumerate(lines):
+        x = 40 if i == 0 else 300
+        draw.text((x, y), text, fill="white" if i == 0 else (20, 20, 20), font=_font(size))
+        y += size + (60 if i == 0 else rng.randint(14, 24))
+
+    # photo placeholder
+    draw.rectangle((40, 130, 260, 400), fill=(rng.randint(150, 200),) * 3)
+    return card
+
+
+# =====================================================
+# DOCUMENT KINDS
+# =====================================================
+def aadhaar(rng: random.Random) -> Tuple[Image.Image, Dict[str, str]]:
+    name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+    dob = f"{rng.randint(10, 28)}/{rng.randint(10, 12)}/19{rng.randint(50, 99)}"
+    number = f"{rng.randint(2, 9)}{_digits(rng, 3)} {_digits(rng, 4)} {_digits(rng, 4)}"
+    image = _card([
+        ("GOVERNMENT OF INDIA", 44),
+        (name, 40),
+        (f"DOB: {dob}", 34),
+        (rng.choice(["MALE", "FEMALE"]), 34),
+        (number, 50),
+    ], (230, 120, 40), rng)
+    return image, {"document_type": "AADHAAR", "name": name, "dob": dob, "aadhaar": number}
+
+
+def pan(rng: random.Random) -> Tuple[Image.Image, Dict[str, str]]:
+    name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+    number = "".join(rng.choice("ABCDEFGHJKLMNPQRSTUVWXYZ") for _ in range(5)) + _digits(rng, 4) + rng.choice("ABCDEFGHJK")
+    image = _card([
+        ("INCOME TAX DEPARTMENT", 44),
+        (name, 40),
+        ("Permanent Account Number", 30),
+        (number, 48),
+    ], (40, 90, 170), rng)
+    return image, {"document_type": "PAN", "name": name, "pan": number}
+
+
+def business_card(rng: random.Random) -> Tuple[Image.Image, Dict[str, str]]:
+    first, last = rng.choice(FIRST), rng.choice(LAST)
+    company = rng.choice(COMPANIES)
+    email = f"{first.lower()}.{last.lower()}@{company.split()[0].lower()}.co.in"
+    phone = f"+91 9{_digits(rng, 9)}"
+    image = _card([
+        (company.upper(), 44),
+        (f"{first} {last}", 40),
+        ("Senior Engineer", 30),
+        (email, 30),
+        (phone, 34),
+        (f"Address: {rng.randint(1, 99)} Park Street, {rng.choice(STATES)}", 26),
+    ], (60, 60, 60), rng)
+    return image, {"document_type": "BUSINESS_CARD", "name": f"{first} {last}", "email": email, "phone": phone}
+
+
+KINDS = {"aadhaar": aadhaar, "pan": pan, "business_card": business_card}
+
+
+# =====================================================
+# AUGMENTATION
+# =====================================================
+def photograph(card: Image.Image, rng: random.Random, max_rotation: float = 6, noise: float = 8,
+               background: bool = True) -> bytes:
+    """Rotate, blur, noise and JPEG-encode the card, optionally on a background."""
+    fill = (rng.randint(60, 140),) * 3
+    image = card.rotate(rng.uniform(-max_rotation, max_rotation), expand=True,
+                        resample=Image.BICUBIC, fillcolor=fill)
+    if background:
+        canvas = Image.new("RGB", (image.width + rng.randint(200, 600), image.height + rng.randint(200, 600)), fill)
+        canvas.paste(image, (rng.randint(50, canvas.width - image.width - 50),
+                             rng.randint(50, canvas.height - image.height - 50)))
+        image = canvas
+    if rng.random() < 0.3:
+        image = image.filter(ImageFilter.GaussianBlur(rng.uniform(0.5, 1.2)))
+
+    pixels = np.asarray(image, dtype=np.int16)
+    noisy = np.random.default_rng(rng.randrange(2 ** 32)).normal(0, noise, pixels.shape)
+    image = Image.fromarray(np.clip(pixels + noisy, 0, 255).astype(np.uint8))
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=rng.randint(70, 92))
+    return buffer.getvalue()
+
+
+def generate(count: int, seed: int = 0, kinds: Tuple[str, ...] = tuple(KINDS), **augment) -> List[Tuple[str, bytes, Dict]]:
+    """[(file name, JPEG bytes, labels)], cycling through `kinds`; deterministic for a seed."""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(count):
+        kind = kinds[i % len(kinds)]
+        card, labels = KINDS[kind](rng)
+        corpus.append((f"{kind}_{i:05d}.jpg", photograph(card, rng, **augment), labels))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--kinds", default=",".join(KINDS))
+    parser.add_argument("--max-rotation", type=float, default=6)
+    parser.add_argument("--noise", type=float, default=8, help="gaussian noise sigma (0-255 scale)")
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    corpus = generate(args.count, args.seed, tuple(args.kinds.split(",")),
+                      max_rotation=args.max_rotation, noise=args.noise)
+    for name, image_bytes, _ in corpus:
+        (out / name).write_bytes(image_bytes)
+    (out / "labels.json").write_text(json.dumps({name: labels for name, _, labels in corpus}, indent=2))
+    print(f"wrote {len(corpus)} images + labels.json to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+
+# module-level singletons (search index, job queue, write-behind spool)
+# create their files at import; keep them out of the working tree
+_scratch = tempfile.mkdtemp(prefix="ocr-tests-")
+for _name, _file in (
+    ("SQLITE_PATH", "ocr.sqlite3"),
+    ("SEARCH_INDEX_PATH", "search.sqlite3"),
+    ("JOBS_DB_PATH", "jobs.sqlite3"),
+    ("WRITE_BEHIND_SPOOL_PATH", "extractions.spool.jsonl"),
+    ("WRITE_BEHIND_DEAD_LETTER_PATH", "extractions.dead.jsonl"),
+):
+    os.environ.setdefault(_name, os.path.join(_scratch, _file))
+
+import pytest  # noqa: E402
+
+from app.database import SQLiteConnection  # noqa: E402
+
+# ocr_extractions as the baseline release created it: no uuid, no dob
+LEGACY_SCHEMA = """
+    CREATE TABLE ocr_extractions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        filename VARCHAR(255),
+        document_type VARCHAR(50),
+        name VARCHAR(255),
+        email VARCHAR(255),
+        phone VARCHAR(50),
+        aadhaar VARCHAR(20),
+        pan VARCHAR(20),
+        address TEXT,
+        state VARCHAR(100),
+        country VARCHAR(100),
+        raw_text TEXT,
+        confidence_score FLOAT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    return str(tmp_path / "ocr.sqlite3")
+
+
+@pytest.fixture
+def legacy_db(sqlite_path):
+    """A baseline-schema table holding one row, left open for the test."""
+    conn = SQLiteConnection(sqlite_path)
+    cursor = conn.cursor()
+    cursor.execute(LEGACY_SCHEMA)
+    cursor.execute(
+        "INSERT INTO ocr_extractions (filename, document_type, name, raw_text, confidence_score, created_at) "
+        "VALUES (%s, %s, %s, %s, %s, %s)",
+        ("old.jpg", "PAN", "ASHA RAO", "legacy text", 0.9, "2024-01-02 03:04:05")
+    )
+    conn.commit()
+    yield conn
+    conn.close()
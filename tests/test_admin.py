@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("httpx")  # FastAPI's TestClient
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.routers.admin import router
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_admin_is_disabled_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    assert client.get("/admin/profiles").status_code == 404
+    assert client.delete("/admin/profiles").status_code == 404
+    assert client.get("/admin/profiles", headers={"X-Admin-Token": ""}).status_code == 404
+
+
+def test_admin_requires_the_configured_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/admin/profiles").status_code == 403
+    assert client.get("/admin/profiles", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get("/admin/profiles", headers={"X-Admin-Token": "s3cret"}).status_code == 200
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from app.async_database import AsyncConnectionPool, threaded_creator
+from app.database import PoolTimeoutError, SQLiteConnection
+
+
+def make_pool(sqlite_path, **kwargs):
+    options = {"size": 1, "max_overflow": 0, "timeout": 0.05, "dialect": "sqlite"}
+    options.update(kwargs)
+    return AsyncConnectionPool(threaded_creator(lambda: SQLiteConnection(sqlite_path)), **options)
+
+
+async def seed(pool, count):
+    async with pool.connection() as conn:
+        await conn.execute("CREATE TABLE t (n INTEGER)")
+        await conn.executemany("INSERT INTO t (n) VALUES (%s)", [(i,) for i in range(count)])
+        await conn.commit()
+
+
+def test_checkout_timeout(sqlite_path):
+    async def main():
+        pool = make_pool(sqlite_path)
+        held = await pool.acquire()
+        with pytest.raises(PoolTimeoutError):
+            await pool.acquire()
+        assert pool.stats()["timeouts"] == 1
+
+        await pool.release(held)
+        async with pool.connection() as conn:
+            assert conn is held
+        assert pool.stats()["in_use"] == 0
+        await pool.close_all()
+
+    asyncio.run(main())
+
+
+def test_recycle_replaces_old_connections(sqlite_path):
+    async def main():
+        pool = make_pool(sqlite_path, recycle=1e-9)
+        async with pool.connection() as first:
+            pass
+        async with pool.connection() as second:
+            assert await second.fetchone("SELECT 1") == (1,)
+        assert second is not first
+        stats = pool.stats()
+        assert (stats["recycled"], stats["open"], stats["idle"]) == (1, 1, 1)
+        await pool.close_all()
+        assert pool.stats()["open"] == 0
+
+    asyncio.run(main())
+
+
+def test_failed_replacement_frees_the_slot(sqlite_path):
+    database_up = True
+
+    def creator():
+        if not database_up:
+            raise RuntimeError("database down")
+        return SQLiteConnection(sqlite_path)
+
+    async def main():
+        nonlocal database_up
+        pool = AsyncConnectionPool(threaded_creator(creator), size=1, max_overflow=0, timeout=0.05,
+                                   recycle=1e-9, dialect="sqlite")
+        async with pool.connection():
+            pass
+
+        database_up = False
+        with pytest.raises(RuntimeError, match="DB Connection Failed"):
+            await pool.acquire()
+        assert pool.stats()["open"] == 0
+
+        # a leaked slot would make this a PoolTimeoutError
+        database_up = True
+        async with pool.connection() as conn:
+            assert await conn.fetchone("SELECT 1") == (1,)
+        await pool.close_all()
+
+    asyncio.run(main())
+
+
+def test_abandoned_stream_breaks_the_connection(sqlite_path):
+    async def main():
+        pool = make_pool(sqlite_path)
+        await seed(pool, 10)
+
+        async with pool.connection() as conn:
+            stream = conn.iterate("SELECT n FROM t ORDER BY n", batch_size=3)
+            assert await stream.__anext__() == [(0,), (1,), (2,)]
+            await stream.aclose()  # the client went away mid-export
+            abandoned = conn
+
+        stats = pool.stats()
+        assert (stats["open"], stats["idle"], stats["in_use"]) == (0, 0, 0)
+
+        async with pool.connection() as conn:
+            assert conn is not abandoned
+            assert await conn.fetchone("SELECT COUNT(*) FROM t") == (10,)
+        await pool.close_all()
+
+    asyncio.run(main())
+
+
+def test_finished_stream_keeps_the_connection(sqlite_path):
+    async def main():
+        pool = make_pool(sqlite_path)
+        await seed(pool, 10)
+
+        async with pool.connection() as conn:
+            batches = [batch async for batch in conn.iterate("SELECT n FROM t", batch_size=4)]
+            streamed = conn
+        assert [len(batch) for batch in batches] == [4, 4, 2]
+
+        async with pool.connection() as conn:
+            assert conn is streamed
+        await pool.close_all()
+
+    asyncio.run(main())
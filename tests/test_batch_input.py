@@ -0,0 +1,82 @@
+import io
+import zipfile
+
+from PIL import Image
+
+from app.utils.batch_input import expand_upload
+
+MB = 1024 * 1024
+
+
+def _zip(members) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members:
+            archive.writestr(name, data)
+    return buf.getvalue()
+
+
+def _expand(name, data, content_type="", max_member_bytes=MB, max_total_bytes=10 * MB):
+    return list(expand_upload(name, content_type, data, max_member_bytes, max_total_bytes))
+
+
+def test_single_image_and_unsupported_type():
+    assert _expand("a.png", b"png") == [("a.png", b"png", None)]
+    assert _expand("notes.txt", b"hi") == [("notes.txt", None, "Unsupported file type")]
+
+
+def test_zip_members():
+    items = _expand("cards.zip", _zip([("a.jpg", b"1"), ("dir/b.png", b"2")]))
+    assert items == [("cards.zip/a.jpg", b"1", None), ("cards.zip/dir/b.png", b"2", None)]
+
+
+def test_nested_zip_is_an_item_error():
+    inner = _zip([("a.jpg", b"1")])
+    items = _expand("outer.zip", _zip([("inner.zip", inner), ("b.jpg", b"2")]))
+    assert items == [
+        ("outer.zip/inner.zip", None, "Nested archives are not supported"),
+        ("outer.zip/b.jpg", b"2", None),
+    ]
+
+
+def test_deeply_nested_zip_does_not_recurse():
+    data = _zip([("a.jpg", b"1")])
+    for level in range(200):
+        data = _zip([(f"{level}.zip", data)])
+    assert _expand("bomb.zip", data) == [("bomb.zip/199.zip", None, "Nested archives are not supported")]
+
+
+def test_member_and_total_size_limits():
+    data = _zip([("big.jpg", b"\0" * 2000), ("a.jpg", b"\0" * 600), ("b.jpg", b"\0" * 600)])
+    items = _expand("z.zip", data, max_member_bytes=1000, max_total_bytes=1000)
+    assert [(name, error) for name, _, error in items] == [
+        ("z.zip/big.jpg", "Archive member too large"),
+        ("z.zip/a.jpg", None),
+        ("z.zip/b.jpg", "Archive unpacks to more than the allowed total size"),
+    ]
+
+
+def test_corrupt_member_is_an_item_error():
+    data = bytearray(_zip([("a.jpg", b"x" * 100), ("b.jpg", b"ok")]))
+    # flip a byte inside a.jpg's compressed data
+    offset = data.index(b"a.jpg") + len("a.jpg") + 2
+    data[offset] ^= 0xFF
+    items = _expand("z.zip", bytes(data))
+    assert items[0][0] == "z.zip/a.jpg" and items[0][1] is None
+    assert items[0][2].startswith("Could not read archive member")
+    assert items[1] == ("z.zip/b.jpg", b"ok", None)
+
+
+def test_invalid_zip():
+    [(name, data, error)] = _expand("z.zip", b"not a zip")
+    assert data is None and error.startswith("Invalid ZIP archive")
+
+
+def test_multipage_tiff_pages():
+    buf = io.BytesIO()
+    pages = [Image.new("RGB", (4, 4), color) for color in ("red", "green")]
+    pages[0].save(buf, format="TIFF", save_all=True, append_images=pages[1:])
+
+    items = _expand("scan.tiff", buf.getvalue())
+    assert [name for name, _, _ in items] == ["scan.tiff#page=1", "scan.tiff#page=2"]
+    assert all(data.startswith(b"\x89PNG") for _, data, _ in items)
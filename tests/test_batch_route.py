@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("httpx")  # FastAPI's TestClient
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.routers.ocr import router
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def files(count, size):
+    return [("files", (f"{i}.png", b"\0" * size, "image/png")) for i in range(count)]
+
+
+def test_batch_rejects_too_many_files(client, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_FILES", 3)
+    response = client.post("/api/ocr/extract/batch", files=files(4, 10))
+    assert response.status_code == 413
+    assert response.json()["message"] == "Too many files"
+
+
+def test_batch_rejects_files_over_the_request_budget(client, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_REQUEST_BYTES", 2500)
+    response = client.post("/api/ocr/extract/batch", files=files(3, 1000))
+    assert response.status_code == 413
+    assert response.json()["message"] == "Batch too large"
+
+
+def test_batch_rejects_a_file_over_the_per_file_cap(client, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_UPLOAD_BYTES", 500)
+    response = client.post("/api/ocr/extract/batch", files=files(1, 1000))
+    assert response.status_code == 413
+    assert response.json()["message"] == "File too large"
@@ -0,0 +1,59 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.services import batcher as batcher_module
+from app.services.batcher import MODEL_HEIGHT, RecognitionBatcher
+
+
+class EchoBatcher(RecognitionBatcher):
+    """Recognizes each crop as itself, no EasyOCR needed."""
+
+    def _recognize(self, image_list):
+        return list(image_list)
+
+
+batcher = EchoBatcher(reader=None, max_wait_ms=1)
+
+
+def recognize_in_child(crops):
+    return batcher.recognize(crops)
+
+
+def test_recognize_returns_each_callers_slice():
+    assert batcher.recognize(["a", "b"]) == ["a", "b"]
+    assert batcher.recognize([]) == []
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_forked_worker_does_not_hang():
+    # the parent's batch thread is running when the pool forks, as with OCR_PRELOAD
+    assert batcher.recognize(["warm"]) == ["warm"]
+
+    pool = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("fork"))
+    try:
+        assert pool.submit(recognize_in_child, ["x", "y"]).result(timeout=10) == ["x", "y"]
+    finally:
+        for process in list(pool._processes.values()):
+            process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def test_crops_are_padded_per_width_chunk(monkeypatch):
+    calls = []
+
+    def fake_recognize_lines(reader, image_list, max_width, batch_size):
+        calls.append((max_width, [box for box, _ in image_list]))
+        return [box for box, _ in image_list]
+
+    monkeypatch.setattr(batcher_module, "recognize_lines", fake_recognize_lines)
+    widths = [900, 70, 300, 64, 640, 128]
+    crops = [(f"crop{i}", np.zeros((MODEL_HEIGHT, width))) for i, width in enumerate(widths)]
+
+    results = RecognitionBatcher(reader=None, max_batch=2)._recognize(crops)
+
+    # input order back, narrow crops never padded to the 900 px one
+    assert results == [box for box, _ in crops]
+    assert calls == [(128, ["crop3", "crop1"]), (320, ["crop5", "crop2"]), (960, ["crop4", "crop0"])]
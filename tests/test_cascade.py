@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services import ocr_backends
+from app.services.ocr_backends import BackendUnavailable, OCRBackend, get_backend
+from app.services.ocr_service import OCRService
+
+
+class MissingBackend(OCRBackend):
+    name = "test-missing"
+    requires = "pip install nothing-here"
+
+    def __init__(self):
+        import nothing_here  # noqa: F401
+
+
+class DeepBackend(OCRBackend):
+    name = "test-deep"
+
+    def read(self, image_np):
+        return [([[0, 0], [1, 0], [1, 1], [0, 1]], "deep text", 0.9)]
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    monkeypatch.setitem(ocr_backends.BACKENDS, MissingBackend.name, MissingBackend)
+    monkeypatch.setitem(ocr_backends.BACKENDS, DeepBackend.name, DeepBackend)
+    monkeypatch.setattr(ocr_backends, "_instances", {})
+    monkeypatch.setattr(settings, "OCR_CASCADE_FAST_BACKEND", MissingBackend.name)
+    monkeypatch.setattr(settings, "OCR_CASCADE_DEEP_BACKEND", DeepBackend.name)
+    monkeypatch.setattr(settings, "OCR_MODE", "cascade")
+    monkeypatch.setattr(settings, "OCR_CACHE_ENABLED", False)
+
+
+def test_missing_backend_names_the_install(backends):
+    with pytest.raises(BackendUnavailable, match="pip install nothing-here"):
+        get_backend(MissingBackend.name)
+
+
+def test_cascade_falls_back_to_deep_engine(backends):
+    service = OCRService()
+    assert service.startup_backends() == [DeepBackend.name]
+
+    image = np.full((8, 8, 3), 255, dtype=np.uint8)
+    for _ in range(2):
+        text, confidence, lines, cached, engine = service._cascade(image, 0.0)
+        assert (text, engine) == ("deep text", DeepBackend.name)
+
+    assert service.cascade_stats.stats()["escalation_reasons"] == {"fast_backend_unavailable": 2}
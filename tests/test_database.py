@@ -0,0 +1,31 @@
+import pytest
+
+from app.database import ConnectionPool, SQLiteConnection
+
+
+def test_failed_replace_frees_the_slot(sqlite_path):
+    database_up = True
+
+    def creator():
+        if not database_up:
+            raise RuntimeError("database down")
+        return SQLiteConnection(sqlite_path)
+
+    pool = ConnectionPool(creator, size=1, max_overflow=0, timeout=0.1, pre_ping=False, dialect="sqlite")
+    with pool.connection():
+        pass
+    assert pool.stats()["open"] == 1
+
+    # the idle connection is due for recycling, and the database is down
+    pool.recycle = 1e-9
+    database_up = False
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert pool.stats()["open"] == 0
+
+    # without the slot back this would time out: size 1, nothing idle
+    database_up = True
+    pool.recycle = 3600
+    with pool.connection() as conn:
+        assert conn.cursor().execute("SELECT 1").fetchone()[0] == 1
+    assert pool.stats()["open"] == 1
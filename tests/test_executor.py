@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.executor import BoundedExecutor, ExecutorBusyError
+
+
+def make_executor(workers=1, queue_size=1):
+    return BoundedExecutor("test", lambda: ThreadPoolExecutor(max_workers=workers), workers, queue_size)
+
+
+def wait_idle(executor, timeout=5):
+    # done callbacks (which free the slots) may run just after result() returns
+    deadline = time.monotonic() + timeout
+    while executor.stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_saturated_executor_rejects_and_recovers():
+    executor = make_executor(workers=1, queue_size=1)
+    gate = threading.Event()
+    futures = [executor.submit(gate.wait) for _ in range(2)]
+    assert executor.stats()["pending"] == 2
+
+    with pytest.raises(ExecutorBusyError):
+        executor.submit(gate.wait)
+    assert executor.stats()["rejected"] == 1
+
+    gate.set()
+    for future in futures:
+        future.result(timeout=5)
+    wait_idle(executor)
+    assert executor.stats()["pending"] == 0
+    assert executor.submit(lambda: 42).result(timeout=5) == 42
+    executor.shutdown()
+
+
+def test_failing_task_frees_its_slot():
+    executor = make_executor(workers=1, queue_size=0)
+
+    def boom():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(executor.run(boom))
+    wait_idle(executor)
+    assert executor.stats()["pending"] == 0
+    executor.shutdown()
+
+
+def test_failing_pool_frees_the_slot():
+    def no_pool():
+        raise RuntimeError("cannot start workers")
+
+    executor = BoundedExecutor("test", no_pool, 1, 0)
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+    assert executor.stats()["pending"] == 0
+    with pytest.raises(RuntimeError):
+        executor.submit(print)  # still a slot to try with, not ExecutorBusyError
+
+
+def test_run_wait_queues_for_a_slot():
+    executor = make_executor(workers=1, queue_size=0)
+    gate = threading.Event()
+
+    async def main():
+        blocker = asyncio.ensure_future(executor.run(gate.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorBusyError):
+            await executor.run(lambda: "rejected")
+        waiter = asyncio.ensure_future(executor.run(lambda: "waited", wait=True))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        gate.set()
+        return await blocker, await waiter
+
+    assert asyncio.run(main()) == (True, "waited")
+    wait_idle(executor)
+    assert executor.stats()["pending"] == 0
+    executor.shutdown()
+
+
+def test_extract_route_answers_429_when_saturated(monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.routers import ocr
+
+    executor = make_executor(workers=1, queue_size=1)
+    monkeypatch.setattr(ocr, "inference_executor", executor)
+    gate = threading.Event()
+    futures = [executor.submit(gate.wait) for _ in range(executor.max_pending)]
+
+    app = FastAPI()
+    app.include_router(ocr.router)
+    response = TestClient(app).post(
+        "/api/ocr/extract", files={"file": ("a.png", b"png", "image/png")}
+    )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["message"] == "Server busy, please retry"
+
+    gate.set()
+    for future in futures:
+        future.result(timeout=5)
+    wait_idle(executor)
+    assert executor.stats() == {"workers": 1, "max_pending": 2, "pending": 0, "rejected": 1}
+    executor.shutdown()
@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from app.models.ocr_extraction import EXPORT_COLUMNS
+from app.utils.export import make_encoder
+
+ROWS = [
+    ("u1", "a.jpg", "PAN", "Asha Rao", None, "9876543210", None, "ABCDE1234F", "01/02/1990",
+     "12, MG Road\nBengaluru", "Karnataka", "India", 0.91, datetime(2024, 1, 2, 3, 4, 5)),
+    # SQLite hands back created_at as the stored string
+    ("u2", "b,c.png", "GENERIC_DOCUMENT", "Zoë \"Z\" N", None, None, None, None, None,
+     None, None, None, 0.5, "2024-01-03 00:00:00"),
+]
+
+
+def _export(format, rows, batch_size=1, **kwargs):
+    encoder = make_encoder(format, EXPORT_COLUMNS, **kwargs)
+    chunks = [encoder.header()]
+    for start in range(0, len(rows), batch_size):
+        chunks.append(encoder.encode(rows[start:start + batch_size]))
+    chunks.append(encoder.finish())
+    return b"".join(chunks)
+
+
+def test_csv_round_trip():
+    records = list(csv.reader(io.StringIO(_export("csv", ROWS).decode())))
+    assert records[0] == list(EXPORT_COLUMNS)
+    assert records[1][EXPORT_COLUMNS.index("address")] == "12, MG Road\nBengaluru"
+    assert records[1][-1] == "2024-01-02 03:04:05"
+    assert records[2][:4] == ["u2", "b,c.png", "GENERIC_DOCUMENT", "Zoë \"Z\" N"]
+    assert records[2][-1] == "2024-01-03 00:00:00"
+    assert len(records) == 3
+
+
+def test_ndjson_round_trip():
+    records = [json.loads(line) for line in _export("ndjson", ROWS).decode().splitlines()]
+    assert [r["uuid"] for r in records] == ["u1", "u2"]
+    assert records[0]["created_at"] == "2024-01-02 03:04:05"
+    assert records[0]["confidence_score"] == 0.91
+    assert records[1]["email"] is None
+
+
+def test_parquet_round_trip():
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    # row groups of 2 over batches of 1: a flush mid-export and one at finish()
+    data = _export("parquet", ROWS * 2 + ROWS[:1], row_group_size=2)
+
+    table = pyarrow_parquet.read_table(io.BytesIO(data))
+    assert table.column_names == list(EXPORT_COLUMNS)
+    assert table.num_rows == 5
+    assert pyarrow_parquet.ParquetFile(io.BytesIO(data)).num_row_groups == 3
+    records = table.to_pylist()
+    assert records[0]["created_at"] == datetime(2024, 1, 2, 3, 4, 5)
+    assert records[1]["created_at"] == datetime(2024, 1, 3)
+    assert records[1]["name"] == "Zoë \"Z\" N"
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError, match="Unknown export format"):
+        make_encoder("xlsx", EXPORT_COLUMNS)
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from app.services.field_extractor import KEYWORDS, extract_document, keyword_kinds
+from benchmarks.bench_field_extraction import legacy_extract
+
+
+@pytest.mark.parametrize("text, field, expected", [
+    # keywords sharing letters: "delhi" + "india", "resident" + "tax"
+    ("DELHINDIA\nAB CD", "country", "India"),
+    ("DELHINDIA\nAB CD", "state", "Delhi"),
+    ("RESIDENTAX ID\nMARY JANE", "name", "Mary Jane"),
+    ("RESIDENTAX ID\nMARY JANE", "address", "RESIDENTAX ID MARY JANE"),
+])
+def test_overlapping_keywords(text, field, expected):
+    assert extract_document(text)[0][field] == expected
+
+
+def test_no_keyword_is_a_prefix_of_another():
+    # KEYWORD_RE captures one keyword per position, which relies on this
+    assert not [(a, b) for a in KEYWORDS for b in KEYWORDS if a != b and b.startswith(a)]
+
+
+def test_line_based_fields_need_newlines():
+    lines = ["GOVERNMENT OF INDIA", "RAHUL KUMAR", "Address: 12 MG Road", "Bengaluru", "Karnataka 560001"]
+    fields, _ = extract_document("\n".join(lines))
+    assert fields["name"] == "Rahul Kumar"
+    assert fields["address"] == "Address: 12 MG Road Bengaluru Karnataka 560001"
+
+    # what the legacy API (server.py) used to pass: everything on one line
+    flattened, _ = extract_document(" ".join(lines))
+    assert flattened["name"] is None
+
+
+# whole keywords, their halves (so glued fragments overlap: "delh" + "india"),
+# and the shapes the other fields look for
+FRAGMENTS = [
+    *KEYWORDS,
+    *(keyword[:len(keyword) // 2] for keyword in KEYWORDS),
+    *(keyword[len(keyword) // 2:] for keyword in KEYWORDS),
+    "AB", "CD", "MARY", "JANE", "x", "1234 5678 9012", "ABCDE1234F",
+    "dob: 01/02/1990", "a@b.in", "9876543210", " ", " ", "\n", "\n", "é",
+]
+
+
+def test_matches_the_previous_implementation_on_fuzzed_text():
+    rng = random.Random(7)
+    for _ in range(5000):
+        parts = [rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 12))]
+        text = "".join(part.upper() if rng.random() < 0.5 else part for part in parts)
+        assert extract_document(text) == legacy_extract(text), repr(text)
+
+
+def test_keyword_kinds_sees_overlaps():
+    assert {"state", "country", "blocklist"} <= keyword_kinds("delhindia")
@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+pytest.importorskip("httpx")  # FastAPI's TestClient
+from fastapi.testclient import TestClient
+
+import app.main
+from app.config import settings
+from app.services import warm_up as warm_up_module
+from app.services.warm_up import WarmUp
+
+
+class HeldExecutor:
+    """Stands in for the inference pool: warm-up tasks finish when the test says so."""
+
+    workers = 2
+
+    def __init__(self):
+        self.futures = []
+
+    def start(self):
+        pass
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+
+@pytest.fixture
+def warming(monkeypatch):
+    executor = HeldExecutor()
+    state = WarmUp()
+    monkeypatch.setattr(settings, "OCR_WARM_UP", True)
+    monkeypatch.setattr(warm_up_module, "inference_executor", executor)
+    monkeypatch.setattr(app.main, "warm_up", state)
+    state.start()
+    return state, executor
+
+
+def test_ready_is_503_until_every_worker_is_warm(warming):
+    state, executor = warming
+    client = TestClient(app.main.app)
+
+    assert client.get("/health/live").status_code == 200
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming_up"
+
+    executor.futures[0].set_result(None)
+    assert client.get("/health/ready").status_code == 503
+
+    executor.futures[1].set_result(None)
+    assert state.ready.wait(5)
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert response.json()["warm_up_seconds"] is not None
+
+
+def test_failed_warm_up_stays_503_with_the_error(warming):
+    state, executor = warming
+    client = TestClient(app.main.app)
+
+    executor.futures[0].set_exception(RuntimeError("model file missing"))
+    executor.futures[1].set_result(None)
+    for thread in threading.enumerate():
+        if thread.name == "ocr-warm-up":
+            thread.join(5)
+
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["error"] == "model file missing"
@@ -0,0 +1,116 @@
+import sqlite3
+import time
+
+import pytest
+
+from app.config import settings
+from app.services.job_queue import JobQueue, check_callback_url
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"))
+
+
+def age(queue, seconds):
+    """Backdates the running jobs' start and last heartbeat."""
+    then = time.time() - seconds
+    queue._conn().execute("UPDATE ocr_jobs SET started_at = ?, heartbeat_at = ?", (then, then))
+
+
+@pytest.mark.parametrize("url", [
+    "file:///etc/passwd",
+    "ftp://93.184.216.34/result",
+    "http:///no-host",
+    "http://127.0.0.1:8000/admin",
+    "http://localhost/callback",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://10.1.2.3/hook",
+    "http://[::1]/hook",
+])
+def test_callback_url_rejected(url):
+    with pytest.raises(ValueError):
+        check_callback_url(url)
+
+
+def test_callback_url_public_address_accepted():
+    assert check_callback_url("https://93.184.216.34/hook") == "https://93.184.216.34/hook"
+
+
+def test_callback_allowlist(monkeypatch):
+    monkeypatch.setattr(settings, "JOBS_CALLBACK_ALLOWED_HOSTS", ["hooks.internal"])
+    assert check_callback_url("http://hooks.internal/done")
+    with pytest.raises(ValueError):
+        check_callback_url("https://93.184.216.34/hook")
+
+
+def test_submit_validates_callback(queue):
+    with pytest.raises(ValueError):
+        queue.submit("a.jpg", b"img", callback_url="http://127.0.0.1/")
+    assert queue.depth() == {"interactive": 0, "bulk": 0}
+
+
+def test_requeue_stale_fails_after_max_attempts(queue):
+    job_id = queue.submit("a.jpg", b"img")
+
+    for attempt in range(1, 4):
+        assert queue.claim()["id"] == job_id
+        age(queue, 3600)
+        requeued, failed = queue.requeue_stale(600, max_attempts=3)
+        assert (requeued, failed) == ((1, 0) if attempt < 3 else (0, 1))
+
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == 3
+    assert queue.claim() is None
+
+
+def test_heartbeat_keeps_a_long_job_from_being_requeued(queue):
+    job_id = queue.submit("a.jpg", b"img")
+    queue.claim()
+    age(queue, 3600)
+
+    assert queue.heartbeat(job_id)
+    assert queue.requeue_stale(600) == (0, 0)
+    assert queue.get(job_id)["status"] == "running"
+
+
+def test_heartbeat_of_a_finished_job_is_refused(queue):
+    job_id = queue.submit("a.jpg", b"img")
+    queue.claim()
+    queue.complete(job_id, {"id": "x"})
+    assert not queue.heartbeat(job_id)
+
+
+def test_worker_renews_the_lease_while_the_job_runs(queue, monkeypatch):
+    from app import worker
+
+    monkeypatch.setattr(worker, "job_queue", queue)
+    job_id = queue.submit("a.jpg", b"img")
+    queue.claim()
+    age(queue, 3600)
+
+    with worker.heartbeat(job_id, interval=0.01):
+        time.sleep(0.1)  # the OCR
+
+    assert queue.requeue_stale(600) == (0, 0)
+    age(queue, 3600)  # no heartbeat once the block is left
+    assert queue.requeue_stale(600) == (1, 0)
+
+
+def test_queue_file_without_the_lease_column_is_migrated(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE ocr_jobs (id TEXT PRIMARY KEY, lane TEXT NOT NULL, priority INTEGER NOT NULL, "
+        "status TEXT NOT NULL, filename TEXT, image BLOB, callback_url TEXT, result TEXT, error TEXT, "
+        "attempts INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+    )
+    conn.execute("INSERT INTO ocr_jobs (id, lane, priority, status, attempts, created_at, started_at) "
+                 "VALUES ('old', 'bulk', 1, 'running', 1, 0, ?)", (time.time() - 3600,))
+    conn.commit()
+    conn.close()
+
+    queue = JobQueue(path)
+    # claimed before leases existed: judged by started_at
+    assert queue.requeue_stale(600) == (1, 0)
@@ -0,0 +1,83 @@
+import pytest
+
+pytest.importorskip("httpx")  # FastAPI's TestClient
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.models.extraction_repository import extraction_repository
+from app.routers import ocr
+from app.services.metrics import Metrics
+
+
+def samples(registry):
+    return [line for line in registry.render().splitlines() if not line.startswith("#")]
+
+
+def test_render_exposition():
+    registry = Metrics(enabled=True)
+    with registry.stage("decode"):
+        pass
+    registry.record("ocr", 0.3)
+    registry.count_document("PAN", "paddleocr")
+    registry.count_document(None, None)
+    registry.callback("ocr_ready", "1 once warmed up.", lambda: {(): 1})
+
+    text = registry.render()
+    assert "# TYPE ocr_stage_duration_seconds histogram" in text
+    assert 'ocr_stage_duration_seconds_bucket{stage="ocr",le="0.25"} 0' in text
+    assert 'ocr_stage_duration_seconds_bucket{stage="ocr",le="0.5"} 1' in text
+    assert 'ocr_stage_duration_seconds_bucket{stage="ocr",le="+Inf"} 1' in text
+    assert 'ocr_stage_duration_seconds_sum{stage="ocr"} 0.3' in text
+    assert 'ocr_stage_duration_seconds_count{stage="decode"} 1' in text
+    assert 'ocr_documents_total{document_type="PAN",engine="paddleocr"} 1' in text
+    assert 'ocr_documents_total{document_type="UNKNOWN",engine=""} 1' in text
+    assert "# TYPE ocr_ready gauge\nocr_ready 1\n" in text
+
+
+def test_collected_timings_stay_out_of_the_histograms():
+    registry = Metrics(enabled=True)
+    with registry.collect() as timings:
+        registry.record("ocr", 0.2)
+    assert timings == {"ocr": 0.2}
+    assert samples(registry) == []
+
+    registry.observe_stages(timings)
+    assert 'ocr_stage_duration_seconds_count{stage="ocr"} 1' in samples(registry)
+
+
+def test_request_label_is_the_route_template(monkeypatch):
+    async def missing(*args, **kwargs):
+        return None, None
+
+    monkeypatch.setattr(extraction_repository, "get", missing)
+    registry = Metrics(enabled=True)
+    app = FastAPI()
+    app.include_router(ocr.router)
+    app.middleware("http")(registry.time_requests)
+    client = TestClient(app)
+
+    assert client.get("/api/ocr/history/abc123").status_code == 404
+    assert client.get("/api/ocr/history/def456").status_code == 404
+    assert client.get("/nowhere").status_code == 404
+
+    lines = samples(registry)
+    assert ('http_request_duration_seconds_count'
+            '{method="GET",route="/api/ocr/history/{extraction_id}",status="404"} 2') in lines
+    assert 'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"} 1' in lines
+    assert not any("abc123" in line or "/nowhere" in line for line in lines)
+
+
+def test_disabled_metrics_register_nothing():
+    registry = Metrics(enabled=False)
+    with registry.stage("decode"):
+        pass
+    with registry.collect() as timings:
+        registry.record("ocr", 0.2)
+    registry.observe_stages({"ocr": 0.2})
+    registry.count_document("PAN", "paddleocr")
+    registry.observe_request("GET", "/api/ocr/history/{extraction_id}", 200, 0.01)
+    registry.callback("ocr_ready", "1 once warmed up.", lambda: {(): 1})
+
+    assert timings == {}
+    assert registry.render() == ""
+    assert "ocr_ready" not in registry._metrics
@@ -0,0 +1,78 @@
+import multiprocessing
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.services.ocr_cache import OCRCache, image_key
+
+RESULT = ("text", 0.9, [["text", 0.9]])
+
+
+def disk_keys(path):
+    with sqlite3.connect(path) as conn:
+        return {key for key, in conn.execute("SELECT key FROM ocr_cache")}
+
+
+def test_image_key_depends_on_content_and_shape():
+    image = np.zeros((4, 6), dtype=np.uint8)
+    assert image_key(image) == image_key(image.copy())
+    assert image_key(image) != image_key(image.reshape(6, 4))
+    assert image_key(image) != image_key(np.ones((4, 6), dtype=np.uint8))
+
+
+def test_disk_is_opened_on_first_use(tmp_path):
+    cache = OCRCache(disk_path=str(tmp_path / "cache.sqlite3"))
+    assert cache._disk_conn is None
+    cache.put("k", RESULT)
+    assert cache._disk_conn is not None
+
+
+def test_disk_hit_after_memory_eviction(tmp_path):
+    cache = OCRCache(max_entries=1, disk_path=str(tmp_path / "cache.sqlite3"))
+    cache.put("a", RESULT)
+    cache.put("b", RESULT)
+    assert cache.get("a") == RESULT
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_disk_cap_is_applied_in_batches_and_keeps_recent_hits(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = OCRCache(max_entries=1, disk_path=path, disk_max_entries=4, disk_maintain_every=4)
+    for i in range(4):
+        cache.put(f"k{i}", RESULT)
+    assert cache.get("k0") == RESULT  # oldest put, but just used
+
+    for i in range(4, 7):
+        cache.put(f"k{i}", RESULT)
+    # 8 disk operations -> two maintenance passes, the last one just now
+    assert disk_keys(path) == {"k0", "k4", "k5", "k6"}
+    assert cache.stats()["disk_evictions"] == 3
+
+
+cache = OCRCache(disk_path=None)
+
+
+def child_round_trip(path):
+    # the parent's handle was dropped at fork; this process opens its own
+    inherited = cache._disk_conn
+    cache._memory.clear()
+    value = cache.get("parent")
+    cache.put("child", RESULT)
+    return inherited is None, value
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_forked_worker_opens_its_own_disk_connection(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache.disk_path = path
+    cache.put("parent", RESULT)
+    assert cache._disk_conn is not None
+
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("fork")) as pool:
+        fresh, value = pool.submit(child_round_trip, path).result(timeout=10)
+
+    assert fresh
+    assert value == ("text", 0.9, [["text", 0.9]])
+    assert disk_keys(path) == {"parent", "child"}
@@ -0,0 +1,151 @@
+import asyncio
+
+from app.async_database import AsyncConnectionPool, threaded_creator
+from app.database import ConnectionPool, SQLiteConnection
+from app.models.extraction_repository import ExtractionRepository
+from app.models.ocr_extraction import (
+    EXPORT_COLUMNS, EXTRACTION_COLUMNS, create_ocr_table, export_query, export_row, extraction_row,
+    INDEXES, create_index_sql, existing_indexes, fetch_text, insert_extractions, migrate_ocr_table,
+    move_inline_text, scan_texts, split_extraction_row, uuid_not_null_sql,
+)
+from app.services.uuid_backfill import start_uuid_backfill
+
+
+def migrate(conn, batch_size=1000):
+    cursor = conn.cursor()
+    create_ocr_table(cursor, "sqlite")
+    migrate_ocr_table(cursor, "sqlite", commit=conn.commit, batch_size=batch_size)
+    conn.commit()
+    return cursor
+
+
+def test_migration_backfills_uuid_of_legacy_rows(legacy_db):
+    cursor = legacy_db.cursor()
+    cursor.executemany("INSERT INTO ocr_extractions (filename) VALUES (%s)", [(f"{i}.jpg",) for i in range(5)])
+    legacy_db.commit()
+
+    cursor = migrate(legacy_db, batch_size=2)
+    cursor.execute("SELECT id, uuid FROM ocr_extractions ORDER BY id")
+    rows = cursor.fetchall()
+    assert len(rows) == 6
+    assert all(len(uuid) == 36 for _, uuid in rows)
+    assert len({uuid for _, uuid in rows}) == 6
+
+    # idempotent: a second run leaves the uuids alone
+    migrate(legacy_db)
+    cursor.execute("SELECT id, uuid FROM ocr_extractions ORDER BY id")
+    assert cursor.fetchall() == rows
+
+
+def test_mysql_ddl():
+    assert uuid_not_null_sql("mysql") == (
+        "ALTER TABLE ocr_extractions MODIFY COLUMN uuid CHAR(36) NOT NULL, ALGORITHM=INPLACE, LOCK=NONE"
+    )
+    assert uuid_not_null_sql("sqlite") is None
+    assert create_index_sql("uq_ocr_uuid") == (
+        "CREATE UNIQUE INDEX uq_ocr_uuid ON ocr_extractions (uuid) ALGORITHM=INPLACE LOCK=NONE"
+    )
+    assert create_index_sql("ix_ocr_created", "sqlite") == "CREATE INDEX ix_ocr_created ON ocr_extractions (created_at, id)"
+
+
+def test_startup_indexes_then_background_backfill(legacy_db, sqlite_path):
+    cursor = legacy_db.cursor()
+    create_ocr_table(cursor, "sqlite")
+    migrate_ocr_table(cursor, "sqlite", backfill=False)
+    legacy_db.commit()
+    assert set(INDEXES) <= existing_indexes(cursor, "sqlite")
+    cursor.execute("SELECT COUNT(*) FROM ocr_extractions WHERE uuid IS NULL")
+    assert cursor.fetchone()[0] == 1
+
+    pool = ConnectionPool(lambda: SQLiteConnection(sqlite_path), size=1, dialect="sqlite")
+    start_uuid_backfill(pool).join(timeout=10)
+    pool.close_all()
+    cursor.execute("SELECT uuid FROM ocr_extractions")
+    assert len(cursor.fetchone()[0]) == 36
+
+
+def test_new_tables_require_uuid(sqlite_path):
+    conn = SQLiteConnection(sqlite_path)
+    cursor = migrate(conn)
+    cursor.execute("PRAGMA table_info(ocr_extractions)")
+    assert {row[1]: row[3] for row in cursor.fetchall()}["uuid"] == 1
+    conn.close()
+
+
+def test_move_inline_text_after_backfill(legacy_db):
+    cursor = migrate(legacy_db)
+    assert move_inline_text(cursor) == 1
+    assert move_inline_text(cursor) == 0
+
+    cursor.execute("SELECT uuid, raw_text FROM ocr_extractions")
+    uuid, raw_text = cursor.fetchone()
+    assert raw_text is None
+    assert fetch_text(cursor, uuid) == {"text": "legacy text", "lines": []}
+
+
+def test_scan_texts_includes_legacy_rows(legacy_db):
+    cursor = migrate(legacy_db)
+    rows = scan_texts(cursor)
+    assert [(row[0], row[3], row[5]) for row in rows] == [(1, "ASHA RAO", "legacy text")]
+
+
+def test_export_includes_legacy_rows(legacy_db):
+    cursor = migrate(legacy_db)
+    insert_extractions(cursor, [
+        extraction_row("new-uuid", "new.jpg", "AADHAAR", {"name": "RAVI"}, "new text", 0.8,
+                       [["new text", 0.8]]),
+    ])
+    legacy_db.commit()
+
+    sql, params = export_query({}, include_text=True)
+    cursor.execute(sql, params)
+    rows = [export_row(row, include_text=True) for row in cursor.fetchall()]
+    assert [(row[1], row[-1]) for row in rows] == [("old.jpg", "legacy text"), ("new.jpg", "new text")]
+    assert all(len(row) == len(EXPORT_COLUMNS) + 1 for row in rows)
+
+    sql, params = export_query({"document_type": "PAN"})
+    cursor.execute(sql, params)
+    assert [row[1] for row in cursor.fetchall()] == ["old.jpg"]
+
+
+def run_repository(sqlite_path, use):
+    async def run():
+        pool = AsyncConnectionPool(threaded_creator(lambda: SQLiteConnection(sqlite_path)),
+                                   size=1, max_overflow=0, timeout=5)
+        try:
+            return await use(ExtractionRepository(pool))
+        finally:
+            await pool.close_all()
+    return asyncio.run(run())
+
+
+def test_repository_get_by_row_id_with_inline_text(legacy_db, sqlite_path):
+    # the column added, but the row not backfilled yet: still reachable by row id
+    legacy_db.cursor().execute("ALTER TABLE ocr_extractions ADD COLUMN uuid CHAR(36)")
+    legacy_db.cursor().execute("ALTER TABLE ocr_extractions ADD COLUMN dob VARCHAR(20)")
+    legacy_db.commit()
+    row, text = run_repository(sqlite_path, lambda repository: repository.get(1, True, by_row_id=True))
+    assert row["uuid"] is None
+    assert row["filename"] == "old.jpg"
+    assert text == {"text": "legacy text", "lines": []}
+
+
+def test_repository_stream_includes_legacy_rows(legacy_db, sqlite_path):
+    migrate(legacy_db)
+
+    async def stream(repository):
+        return [batch async for batch in repository.stream(include_text=True, batch_size=1)]
+
+    batches = run_repository(sqlite_path, stream)
+    assert [[row[1] for row in batch] for batch in batches] == [["old.jpg"]]
+    assert batches[0][0][-1] == "legacy text"
+
+
+def test_split_extraction_row_reads_old_spool_rows():
+    row = extraction_row("u", "f.jpg", "PAN", {"name": "A"}, "text", 0.5, [["text", 0.5]])
+    assert split_extraction_row(row) == (row[:-2], "text", [["text", 0.5]])
+
+    # spooled before the side table: raw_text sat before confidence_score
+    old = (*row[:12], "text", 0.5)
+    assert len(old) == len(EXTRACTION_COLUMNS) + 1
+    assert split_extraction_row(old) == (row[:-2], "text", [])
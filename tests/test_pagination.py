@@ -0,0 +1,22 @@
+from datetime import datetime
+
+import pytest
+
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    token = encode_cursor(datetime(2024, 1, 2, 3, 4, 5), 42)
+    assert "=" not in token and "/" not in token and "+" not in token
+    assert decode_cursor(token) == ("2024-01-02 03:04:05", 42)
+
+
+def test_cursor_from_sqlite_string_matches_datetime():
+    # SQLite returns the stored string, MySQL a datetime; both page the same way
+    assert encode_cursor("2024-01-02 03:04:05", 7) == encode_cursor(datetime(2024, 1, 2, 3, 4, 5), 7)
+
+
+@pytest.mark.parametrize("token", ["", "not-a-cursor", encode_cursor("x", 1)[:-3], "WzFd", "eyJhIjoxfQ"])
+def test_invalid_cursor(token):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(token)
@@ -0,0 +1,57 @@
+import cv2
+import numpy as np
+import pytest
+
+from app.utils.preprocess import Preprocessor, _binarize, skew_angle
+
+
+def card(angle=0.0):
+    """A 640x400 white card with eight printed text lines, rotated `angle` degrees."""
+    image = np.full((400, 640), 255, np.uint8)
+    for i in range(8):
+        cv2.putText(image, "ASHA RAO 1984 PAN ABCDE1234F", (20, 40 + i * 45),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, 0, 2)
+    if angle:
+        matrix = cv2.getRotationMatrix2D((320, 200), angle, 1.0)
+        image = cv2.warpAffine(image, matrix, (640, 400), borderValue=255)
+    return cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+
+
+@pytest.mark.parametrize("angle", [4, -6])
+def test_skewed_text_is_rotated_level(angle):
+    out, report = Preprocessor().run(card(angle))
+
+    assert report["deskew_degrees"] == pytest.approx(angle, abs=0.5)
+    assert abs(skew_angle(_binarize(out))) < 0.5
+    assert out.shape == (400, 640)
+
+
+def test_level_text_is_not_rotated():
+    out, report = Preprocessor().run(card())
+    assert "deskew_degrees" not in report
+    assert report["cropped"] is False
+
+
+def test_card_on_a_background_is_cropped():
+    photo = np.full((900, 1200, 3), 60, np.uint8)
+    photo[250:650, 300:940] = card()
+
+    out, report = Preprocessor().run(photo)
+
+    assert report["cropped"] is True
+    assert out.ndim == 2  # grayscale
+    # the card, give or take the edge dilation and the analysis downscale
+    assert out.shape[0] == pytest.approx(400, abs=10)
+    assert out.shape[1] == pytest.approx(640, abs=10)
+    assert out.mean() > 200  # mostly white card, not the dark background
+
+
+def test_large_text_is_scaled_down_to_the_target_height():
+    big = cv2.resize(card(), None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+
+    out, report = Preprocessor(target_char_height=16, min_width=640).run(big)
+
+    assert report["char_height"] == pytest.approx(36, abs=3)
+    # 1280 * 16 / 36 is under min_width, so clamped there
+    assert out.shape[1] == 640
+    assert report["scale"] == 0.5
@@ -0,0 +1,62 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from app.services.profiler import Profiler
+
+profiler = Profiler(enabled=True, interval=0.001)
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_trace_samples_the_calling_thread():
+    with profiler.trace() as trace:
+        busy(0.05)
+    assert trace.samples > 0
+    assert any("busy (" in stack for stack in trace.stacks)
+    assert profiler._active == {}
+
+
+def child_trace():
+    # a lock copied while held would never be released in this process
+    if not profiler._lock.acquire(timeout=2):
+        return None
+    profiler._lock.release()
+    inherited = dict(profiler._active)
+    with profiler.trace() as trace:
+        busy(0.05)
+    return inherited, trace.samples
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_forked_worker_traces_with_a_fresh_lock():
+    # the pool forks while a request is being traced and the lock is held
+    tracing = threading.Event()
+    done = threading.Event()
+
+    def request():
+        with profiler.trace():
+            tracing.set()
+            done.wait(10)
+
+    thread = threading.Thread(target=request)
+    thread.start()
+    tracing.wait(5)
+    try:
+        with profiler._lock, ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("fork")) as pool:
+            result = pool.submit(child_trace).result(timeout=10)
+    finally:
+        done.set()
+        thread.join()
+
+    assert result is not None, "the child inherited the parent's held lock"
+    inherited, samples = result
+    assert inherited == {}  # the parent's traced thread does not exist in the child
+    assert samples > 0
@@ -0,0 +1,62 @@
+import pytest
+
+from app.services.search_index import SearchIndex, edit_distance, fuzzy_keys, fuzzy_term
+
+
+def test_fuzzy_keys_fold_ocr_confusions():
+    assert fuzzy_keys("rahu1") == fuzzy_keys("rahul") == fuzzy_keys("rahui")
+    assert fuzzy_keys("rnohan") == fuzzy_keys("mohan")
+    assert "rahu" in fuzzy_keys("rahul")  # single deletions
+
+
+def test_fuzzy_keys_short_terms_have_no_deletions():
+    assert fuzzy_keys("ram") == {"ram"}
+
+
+def test_fuzzy_term_skips_numbers_and_short_terms():
+    assert fuzzy_term("rahul")
+    assert not fuzzy_term("ab")
+    assert not fuzzy_term("9876543210")
+    assert not fuzzy_term("x" * 25)
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("rahul", "rahul", 0),
+    ("rahul", "rahl", 1),
+    ("rahul", "rahull", 1),
+    ("rahul", "rahol", 1),
+    ("rahul", "rahlu", 1),  # adjacent transposition counts once
+    ("rahul", "ravi", 2),   # capped at limit + 1
+    ("rahul", "ra", 2),
+])
+def test_edit_distance(a, b, expected):
+    assert edit_distance(a, b, 1) == expected
+
+
+def test_search_finds_ocr_variants_exact_first(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.sqlite3"))
+    assert index.add([
+        ("u1", "PAN", "RAHU1 SHARMA", "Delhi", "income tax"),
+        ("u2", "PAN", "RAHUL SHARMA", "Delhi", "income tax"),
+        ("u3", "AADHAAR", "PRIYA NAIR", "Kerala", "government of india"),
+    ]) == 3
+    assert index.add([("u1", "PAN", "RAHU1 SHARMA", "Delhi", "")]) == 0
+
+    hits, expanded = index.search("rahul")
+    assert [(uuid, exact) for uuid, _, exact in hits] == [("u2", True), ("u1", False)]
+    assert expanded == {"rahul": ["rahu1"]}
+
+    hits, _ = index.search("rahul", fuzzy=False)
+    assert [uuid for uuid, _, _ in hits] == ["u2"]
+    hits, _ = index.search("pri", prefix=True, field="name")
+    assert [uuid for uuid, _, _ in hits] == ["u3"]
+    hits, _ = index.search("sharma", document_type="AADHAAR")
+    assert hits == []
+
+
+def test_search_rejects_bad_queries(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.sqlite3"))
+    with pytest.raises(ValueError):
+        index.search("   ")
+    with pytest.raises(ValueError):
+        index.search("rahul", field="email")
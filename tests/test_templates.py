@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from app.services.ocr_backends import OCRBackend
+from app.services.templates import TemplateMatcher, load_templates
+
+# a 1586x1000 card: the aspect ratio of the built-in templates
+WIDTH, HEIGHT = 1586, 1000
+
+
+class PrintedCard(OCRBackend):
+    """Reads back the lines printed inside each box, by pixel position on the full card."""
+
+    name = "printed"
+
+    def __init__(self, lines):
+        self.lines = lines  # (x0, y0, x1, y1) on the full card -> text
+
+    def read_regions(self, image_np, boxes):
+        scale = WIDTH / image_np.shape[1]  # the header is read off a thumbnail
+        regions = []
+        for x0, y0, x1, y1 in boxes:
+            text = " ".join(
+                line for (lx0, ly0, lx1, ly1), line in self.lines.items()
+                if x0 * scale <= lx0 and lx1 <= x1 * scale and y0 * scale <= ly0 and ly1 <= y1 * scale
+            )
+            regions.append(([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], text, 0.9 if text else 0.0))
+        return regions
+
+
+PAN_CARD = {
+    (300, 60, 1300, 140): "INCOME TAX DEPARTMENT   GOVT. OF INDIA",
+    (60, 240, 700, 320): "asha   rao",
+    (60, 360, 700, 440): "KRISHNA RAO",  # father's name, outside every field box
+    (60, 480, 700, 560): "DOB 01/02/1984",
+    (60, 680, 700, 780): "abcde 1234 f",
+}
+
+AADHAAR_CARD = {
+    (300, 40, 1300, 150): "GOVERNMENT OF INDIA",
+    (500, 280, 1400, 360): "ASHA RAO",
+    (500, 400, 1400, 480): "DOB: 01-02-1984",
+    (300, 740, 1300, 860): "1234 5678 9012",
+}
+
+
+@pytest.fixture
+def matcher():
+    return TemplateMatcher(load_templates())
+
+
+def card():
+    return np.full((HEIGHT, WIDTH, 3), 255, np.uint8)
+
+
+def test_pan_regions_map_to_fields(matcher):
+    text, confidence, regions, fields, document_type = matcher.read(card(), PrintedCard(PAN_CARD))
+
+    assert document_type == "PAN"
+    assert fields["name"] == "Asha Rao"
+    assert fields["dob"] == "01/02/1984"
+    assert fields["pan"] == "ABCDE1234F"
+    assert fields["aadhaar"] is None
+    assert "KRISHNA" not in text
+    assert len(regions) == 3
+    assert confidence == pytest.approx(0.9)
+
+
+def test_aadhaar_regions_map_to_fields(matcher):
+    *_, fields, document_type = matcher.read(card(), PrintedCard(AADHAAR_CARD))
+
+    assert document_type == "AADHAAR"
+    assert fields["name"] == "Asha Rao"
+    assert fields["dob"] == "01-02-1984"
+    assert fields["aadhaar"] == "123456789012"
+
+
+def test_unreadable_required_field_falls_back(matcher):
+    lines = {box: text for box, text in PAN_CARD.items() if text != "abcde 1234 f"}
+
+    assert matcher.read(card(), PrintedCard(lines)) is None
+    # the header also says "govt. of india": the Aadhaar layout is tried next
+    assert matcher.stats()["fallbacks"] == {"pan:required_field": 1, "aadhaar_front:required_field": 1}
+
+
+def test_map_fields_in_template_field_order():
+    pan = load_templates()["pan"]
+
+    assert [field.name for field in pan.fields] == ["name", "dob", "pan"]
+    fields = pan.map_fields(["  asha rao ", "born 01/02/1984", "abcde1234f"])
+    assert (fields["name"], fields["dob"], fields["pan"]) == ("Asha Rao", "01/02/1984", "ABCDE1234F")
+    assert pan.map_fields(["asha rao", "", "no pan here"]) is None
@@ -0,0 +1,73 @@
+import asyncio
+import io
+
+import pytest
+
+pytest.importorskip("httpx")  # FastAPI's TestClient
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.utils.upload import UploadTooLargeError, install_body_size_limit, read_upload
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    install_body_size_limit(app, max_bytes=4096, limits={"/big": 64 * 1024})
+
+    @app.post("/upload")
+    @app.post("/big")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await read_upload(file, 1024 * 1024))}
+
+    return TestClient(app)
+
+
+def test_body_within_limit(client):
+    response = client.post("/upload", files={"file": ("a.png", b"x" * 1000, "image/png")})
+    assert response.json() == {"size": 1000}
+
+
+def test_declared_length_over_limit_is_refused(client):
+    response = client.post("/upload", files={"file": ("a.png", b"x" * 10000, "image/png")})
+    assert response.status_code == 413
+    assert response.json()["message"] == "Request too large"
+    # the per-path limit applies instead
+    response = client.post("/big", files={"file": ("a.png", b"x" * 10000, "image/png")})
+    assert response.json() == {"size": 10000}
+
+
+def test_undeclared_length_is_counted_while_streaming(client):
+    def chunks():
+        yield b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.png\"\r\n\r\n"
+        for _ in range(10):
+            yield b"x" * 1000
+        yield b"\r\n--b--\r\n"
+
+    response = client.post("/upload", content=chunks(),
+                           headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+    assert response.json()["error"] == "Request body exceeds 4096 bytes"
+
+
+class FakeUpload:
+    def __init__(self, data, size):
+        self._file = io.BytesIO(data)
+        self.size = size
+
+    async def read(self, n):
+        return self._file.read(n)
+
+
+@pytest.mark.parametrize("declared", [None, 3000, 10])
+def test_read_upload_fills_one_buffer(declared, monkeypatch):
+    monkeypatch.setattr("app.utils.upload.CHUNK_SIZE", 1024)
+    data = bytes(range(256)) * 12
+    assert asyncio.run(read_upload(FakeUpload(data, declared), 10000)) == data
+
+
+def test_read_upload_cap():
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(read_upload(FakeUpload(b"x" * 100, 100), 50))
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(read_upload(FakeUpload(b"x" * 100, None), 50))
@@ -0,0 +1,140 @@
+import fcntl
+import json
+import os
+import sqlite3
+
+import pytest
+
+from app.database import ConnectionPool, SQLiteConnection
+from app.models.ocr_extraction import create_ocr_table, extraction_row, migrate_ocr_table
+from app.services import write_behind
+from app.services.write_behind import ExtractionWriter
+
+
+def row(uuid, filename="card.jpg"):
+    return extraction_row(uuid, filename, "PAN", {"name": "ASHA RAO"}, "text", 0.9, [["text", 0.9]])
+
+
+@pytest.fixture
+def pool(sqlite_path, monkeypatch):
+    monkeypatch.setattr(write_behind, "search_index", None)
+    pool = ConnectionPool(lambda: SQLiteConnection(sqlite_path), size=1, max_overflow=0,
+                          timeout=1, dialect="sqlite")
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        create_ocr_table(cursor, "sqlite")
+        migrate_ocr_table(cursor, "sqlite")
+        conn.commit()
+    yield pool
+    pool.close_all()
+
+
+def make_writer(pool, tmp_path, **kwargs):
+    return ExtractionWriter(pool, batch_size=200, flush_interval=0.01,
+                            spool_path=str(tmp_path / "spool.jsonl"),
+                            dead_letter_path=str(tmp_path / "dead.jsonl"), **kwargs)
+
+
+def stored_uuids(pool):
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT uuid FROM ocr_extractions ORDER BY id")
+        return [uuid for uuid, in cursor.fetchall()]
+
+
+def dead_letters(tmp_path):
+    path = tmp_path / "dead.jsonl"
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+def test_poison_row_is_dead_lettered_and_the_batch_written(pool, tmp_path):
+    writer = make_writer(pool, tmp_path)
+    writer.start()
+    # the duplicate uuid fails the insert of the whole batch
+    writer.submit_many([row(f"u{i}") for i in range(5)] + [row("u2")] + [row("u9")])
+    writer.close()
+
+    assert stored_uuids(pool) == ["u0", "u1", "u2", "u3", "u4", "u9"]
+    assert [entry["row"][0] for entry in dead_letters(tmp_path)] == ["u2"]
+    assert "UNIQUE" in dead_letters(tmp_path)[0]["error"]
+    assert not (tmp_path / "spool.jsonl").exists()
+    assert writer.stats()["dead_letter_rows"] == 1
+
+
+def test_spool_replay_skips_poison_row(pool, tmp_path):
+    with pool.connection() as conn:
+        conn.cursor().execute("INSERT INTO ocr_extractions (uuid) VALUES ('taken')")
+        conn.commit()
+    spooled = [row("a"), row("taken"), row("b")]
+    (tmp_path / "spool.jsonl").write_text("".join(json.dumps(r) + "\n" for r in spooled))
+
+    writer = make_writer(pool, tmp_path)
+    writer.start()
+    writer.close()
+
+    assert stored_uuids(pool) == ["taken", "a", "b"]
+    assert [entry["row"][0] for entry in dead_letters(tmp_path)] == ["taken"]
+    assert not (tmp_path / "spool.jsonl").exists()
+    assert writer.stats()["replayed_rows"] == 2
+
+
+def test_unavailable_database_spools_instead_of_dead_lettering(tmp_path, monkeypatch):
+    monkeypatch.setattr(write_behind, "search_index", None)
+
+    def refuse():
+        raise sqlite3.OperationalError("unable to open database file")
+
+    writer = make_writer(ConnectionPool(refuse, size=1, max_overflow=0, timeout=1, dialect="sqlite"), tmp_path)
+    writer.start()
+    writer.submit_many([row("x"), row("y")])
+    writer.close()
+
+    spooled = [json.loads(line)[0] for line in (tmp_path / "spool.jsonl").read_text().splitlines()]
+    assert spooled == ["x", "y"]
+    assert dead_letters(tmp_path) == []
+
+
+def test_long_values_are_cut_to_the_column_width():
+    values = row("u", filename="x" * 1000)
+    assert len(values[1]) == 255
+
+
+def test_orphaned_replay_file_is_replayed_at_start(pool, tmp_path):
+    # a process that crashed mid-replay leaves its claimed file behind
+    (tmp_path / "spool.jsonl.4242-0.replay").write_text(json.dumps(row("orphan")) + "\n")
+    (tmp_path / "spool.jsonl").write_text(json.dumps(row("spooled")) + "\n")
+
+    writer = make_writer(pool, tmp_path)
+    writer.start()
+    writer.close()
+
+    assert stored_uuids(pool) == ["orphan", "spooled"]
+    assert list(tmp_path.glob("*.replay")) == []
+    assert not (tmp_path / "spool.jsonl").exists()
+
+
+def test_replay_file_held_by_another_process_is_left_alone(pool, tmp_path):
+    busy = tmp_path / "spool.jsonl.4242-0.replay"
+    busy.write_text(json.dumps(row("busy")) + "\n")
+
+    with open(busy) as held:
+        fcntl.flock(held, fcntl.LOCK_EX)
+        writer = make_writer(pool, tmp_path)
+        writer.start()
+        writer.close()
+
+    assert stored_uuids(pool) == []
+    assert busy.exists()
+
+
+def test_replay_files_are_unique_per_claim(pool, tmp_path):
+    writer = make_writer(pool, tmp_path)
+    claimed = []
+    for uuid in ("a", "b"):
+        (tmp_path / "spool.jsonl").write_text(json.dumps(row(uuid)) + "\n")
+        claimed += writer._claim_replays()
+    paths = [path for path, _ in claimed]
+    assert len(set(paths)) == 2
+    assert all(path.endswith(".replay") and f".{os.getpid()}-" in path for path in paths)
+    for _, f in claimed:
+        f.close()